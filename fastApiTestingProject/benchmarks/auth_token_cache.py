@@ -0,0 +1,52 @@
+"""Compare cached and uncached access token verification throughput.
+
+Usage:
+    python -m benchmarks.auth_token_cache --tokens 100 --requests 200000
+"""
+import argparse
+import random
+import time
+
+import jwt
+
+from common.packages.src.conf.settings import settings
+from common.packages.src.services import auth
+from common.packages.src.services.token_cache import VerifiedTokenCache
+
+
+def run(tokens: list[str], requests: int) -> float:
+    """Verify randomly picked tokens, return verifications per second."""
+    secret_key = settings.notes_app.secret_key
+    picks = [random.choice(tokens) for _ in range(requests)]
+    started_at = time.perf_counter()
+    for token in picks:
+        auth.decode_user_jwt(token, secret_key)
+    return requests / (time.perf_counter() - started_at)
+
+
+def main() -> None:
+    """Run benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tokens", type=int, default=100, help="distinct tokens sent by clients")
+    parser.add_argument("--requests", type=int, default=200000, help="verifications per run")
+    args = parser.parse_args()
+
+    exp = int(time.time()) + 3600
+    tokens = [
+        jwt.encode({"user_uuid": f"user-{i}", "exp": exp}, settings.notes_app.secret_key, settings.auth.algorithm)
+        for i in range(args.tokens)
+    ]
+
+    auth.get_token_cache = lambda: None
+    uncached = run(tokens, args.requests)
+    token_cache = VerifiedTokenCache(max_size=settings.auth.token_cache_size, max_ttl=settings.auth.token_cache_ttl)
+    auth.get_token_cache = lambda: token_cache
+    cached = run(tokens, args.requests)
+
+    print(f"uncached: {uncached:,.0f} verifications/sec")
+    print(f"cached:   {cached:,.0f} verifications/sec ({cached / uncached:.1f}x)")
+    print(f"hit rate: {token_cache.stats.hit_rate:.2%}")
+
+
+if __name__ == "__main__":
+    main()
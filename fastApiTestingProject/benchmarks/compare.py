@@ -0,0 +1,43 @@
+"""Compare two benchmark result files.
+
+Usage:
+    python -m benchmarks.compare baseline.json candidate.json --metric p95_ms --threshold 10
+"""
+import argparse
+import json
+import sys
+
+
+def main() -> None:
+    """Print per operation change and exit with 1 when any regression exceeds threshold."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("baseline")
+    parser.add_argument("candidate")
+    parser.add_argument("--metric", default="p50_ms")
+    parser.add_argument("--threshold", type=float, default=10.0, help="allowed regression in percent")
+    args = parser.parse_args()
+
+    with open(args.baseline) as baseline_file, open(args.candidate) as candidate_file:
+        baseline = json.load(baseline_file)
+        candidate = json.load(candidate_file)
+
+    print(f"{baseline.get('revision')} -> {candidate.get('revision')} ({args.metric})")
+    regressions = []
+    for name, result in candidate["results"].items():
+        before = baseline["results"].get(name, {}).get(args.metric)
+        after = result.get(args.metric)
+        if before is None or after is None:
+            print(f"{name:<40} {'n/a':>10} -> {after}")
+            continue
+        change = (after - before) / before * 100 if before else 0.0
+        print(f"{name:<40} {before:10.2f} -> {after:10.2f} {change:+7.1f}%")
+        if change > args.threshold:
+            regressions.append(name)
+
+    if regressions:
+        print(f"Regressed above {args.threshold}%: {', '.join(regressions)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
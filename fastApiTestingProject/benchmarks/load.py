@@ -0,0 +1,351 @@
+"""End-to-end HTTP load test of `main.init_app` served by uvicorn.
+
+Usage:
+    python -m benchmarks.load --mix read-heavy --workers 1,2,4 --pool-size 5,10 --duration 20 --output load.json
+
+Every combination of --workers and --pool-size boots a fresh runner process
+against the same seeded database, drives it with `--concurrency` async clients
+for `--duration` seconds and records throughput, latency percentiles, error
+rate and the average number of SQL queries per endpoint, as reported by the
+X-DB-Query-Count response header.
+"""
+import argparse
+import asyncio
+import os
+import random
+import subprocess
+import sys
+import time
+import uuid
+from collections import defaultdict
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import Callable
+
+import httpx
+import jwt
+from sqlalchemy import select
+from sqlalchemy.engine import make_url
+
+from benchmarks.measure import summarize, write_results
+from benchmarks.postgres import _free_port, local_postgres
+from benchmarks.repository import seed
+from common.packages.src.conf.settings import settings
+from common.packages.src.db.engine import engines
+from common.packages.src.db.models import Note, User
+
+NOTES_URL = "/api/v1/notes"
+HEALTH_CHECK_URL = "/api/v1/health-check/ready"
+PAGE_SIZE = 50
+BATCH_SIZE = 20
+SAMPLE_SIZE = 5000
+
+
+@dataclass
+class Fixtures:
+    """Seeded rows used to build requests."""
+
+    user_ids: list[str]
+    notes: list[tuple[str, str]]
+    tokens: dict[str, str] = field(default_factory=dict)
+    notes_by_user: dict[str, list[str]] = field(init=False)
+
+    def __post_init__(self) -> None:
+        """Group notes by owner."""
+        self.notes_by_user = defaultdict(list)
+        for user_id, note_id in self.notes:
+            self.notes_by_user[user_id].append(note_id)
+
+    def token(self, user_id: str) -> str:
+        """Get signed token of user, tokens are reused so that token cache is exercised."""
+        if user_id not in self.tokens:
+            self.tokens[user_id] = issue_token(user_id)
+        return self.tokens[user_id]
+
+
+@dataclass
+class Call:
+    """Single HTTP request of a mix."""
+
+    endpoint: str
+    method: str
+    url: str
+    user_id: str
+    json: dict | list | None = None
+    params: dict | None = None
+    fresh_token: bool = False
+
+
+def issue_token(user_id: str, ttl: timedelta = timedelta(hours=1)) -> str:
+    """Sign access token with configured secret and algorithm."""
+    payload = {"user_uuid": user_id, "exp": datetime.now(timezone.utc) + ttl, "jti": uuid.uuid4().hex}
+    return jwt.encode(payload, settings.notes_app.secret_key, algorithm=settings.auth.algorithm)
+
+
+def retrieve(fixtures: Fixtures) -> Call:
+    """Get note of its owner."""
+    user_id, note_id = random.choice(fixtures.notes)
+    return Call("GET /notes/{uuid}", "GET", f"{NOTES_URL}/{note_id}", user_id)
+
+
+def list_offset(fixtures: Fixtures) -> Call:
+    """List notes page by offset."""
+    params = {"limit": PAGE_SIZE, "offset": random.randrange(0, 20) * PAGE_SIZE}
+    return Call("GET /notes", "GET", NOTES_URL, random.choice(fixtures.user_ids), params=params)
+
+
+def list_cursor(fixtures: Fixtures) -> Call:
+    """List first notes page by cursor."""
+    params = {"limit": PAGE_SIZE}
+    return Call("GET /notes/cursor", "GET", f"{NOTES_URL}/cursor", random.choice(fixtures.user_ids), params=params)
+
+
+def batch_get(fixtures: Fixtures) -> Call:
+    """Get batch of notes of one owner."""
+    user_id, _ = random.choice(fixtures.notes)
+    owned = fixtures.notes_by_user[user_id]
+    note_ids = random.sample(owned, min(BATCH_SIZE, len(owned)))
+    return Call("POST /notes:batchGet", "POST", f"{NOTES_URL}:batchGet", user_id, json={"uuids": note_ids})
+
+
+def create(fixtures: Fixtures) -> Call:
+    """Create note."""
+    body = {"title": "load", "description": "load test note"}
+    return Call("POST /notes", "POST", NOTES_URL, random.choice(fixtures.user_ids), json=body)
+
+
+def batch_create(fixtures: Fixtures) -> Call:
+    """Create batch of notes."""
+    body = {"notes": [{"title": "load", "description": "load test note"} for _ in range(BATCH_SIZE)]}
+    user_id = random.choice(fixtures.user_ids)
+    return Call("POST /notes:batchCreate", "POST", f"{NOTES_URL}:batchCreate", user_id, json=body)
+
+
+def partial_update(fixtures: Fixtures) -> Call:
+    """Update note title."""
+    user_id, note_id = random.choice(fixtures.notes)
+    return Call("PATCH /notes/{uuid}", "PATCH", f"{NOTES_URL}/{note_id}", user_id, json={"title": "updated"})
+
+
+def retrieve_with_fresh_token(fixtures: Fixtures) -> Call:
+    """Get note with newly signed token, so every request pays for jwt verification."""
+    call = retrieve(fixtures)
+    call.fresh_token = True
+    return call
+
+
+MIXES: dict[str, list[tuple[Callable[[Fixtures], Call], int]]] = {
+    "read-heavy": [(retrieve, 70), (list_offset, 10), (list_cursor, 10), (batch_get, 5), (partial_update, 5)],
+    "write-heavy": [(create, 40), (batch_create, 10), (partial_update, 40), (retrieve, 10)],
+    "list": [(list_offset, 50), (list_cursor, 50)],
+    "auth-heavy": [(retrieve_with_fresh_token, 80), (retrieve, 20)],
+}
+
+
+@dataclass
+class Recorder:
+    """Collected responses of one run."""
+
+    latencies: list[float] = field(default_factory=list)
+    errors: int = 0
+    endpoint_latencies: dict[str, list[float]] = field(default_factory=lambda: defaultdict(list))
+    endpoint_errors: dict[str, int] = field(default_factory=lambda: defaultdict(int))
+    endpoint_queries: dict[str, list[int]] = field(default_factory=lambda: defaultdict(list))
+    statuses: dict[int, int] = field(default_factory=lambda: defaultdict(int))
+
+    def record(self, call: Call, elapsed: float, response: httpx.Response | None) -> None:
+        """Store result of one request, transport failures are recorded with status 0."""
+        self.latencies.append(elapsed)
+        self.endpoint_latencies[call.endpoint].append(elapsed)
+        status = response.status_code if response is not None else 0
+        self.statuses[status] += 1
+        if status == 0 or status >= 400:
+            self.errors += 1
+            self.endpoint_errors[call.endpoint] += 1
+        if response is not None and "x-db-query-count" in response.headers:
+            self.endpoint_queries[call.endpoint].append(int(response.headers["x-db-query-count"]))
+
+    def report(self, duration: float) -> dict:
+        """Summarize run."""
+        endpoints = {}
+        for endpoint, latencies in self.endpoint_latencies.items():
+            queries = self.endpoint_queries.get(endpoint, [])
+            endpoints[endpoint] = {
+                **summarize(latencies),
+                "error_rate": self.endpoint_errors.get(endpoint, 0) / len(latencies),
+                "queries_per_request": sum(queries) / len(queries) if queries else None,
+            }
+        return {
+            **summarize(self.latencies),
+            "requests": len(self.latencies),
+            "throughput_rps": len(self.latencies) / duration if duration else 0.0,
+            "error_rate": self.errors / len(self.latencies) if self.latencies else 0.0,
+            "statuses": {str(status): count for status, count in sorted(self.statuses.items())},
+            "endpoints": endpoints,
+        }
+
+
+async def prepare(dsn: str, rows: int, skip_seed: bool) -> Fixtures:
+    """Seed database and read sample of seeded users and notes."""
+    try:
+        if not skip_seed:
+            await seed(dsn, rows)
+        async with engines.get_session_factory(dsn)() as session:
+            user_ids = (await session.execute(select(User.uuid).limit(SAMPLE_SIZE))).scalars().all()
+            notes = (await session.execute(select(Note.user_id, Note.uuid).limit(SAMPLE_SIZE))).all()
+    finally:
+        await engines.dispose()
+    return Fixtures(
+        user_ids=[str(user_id) for user_id in user_ids],
+        notes=[(str(user_id), str(note_id)) for user_id, note_id in notes],
+    )
+
+
+def server_env(dsn: str, pool_size: int) -> dict[str, str]:
+    """Build environment of uvicorn process pointing to benchmark database."""
+    url = make_url(dsn)
+    env = {
+        **os.environ,
+        "POSTGRES_DRIVER": url.drivername,
+        "POSTGRES_USER": url.username or "postgres",
+        "POSTGRES_PASSWORD": url.password or "",
+        "POSTGRES_HOST": f"{url.host}:{url.port or 5432}",
+        "POSTGRES_DB": url.database or "postgres",
+        "POSTGRES_POOL_SIZE": str(pool_size),
+        "NOTES_APP_SECRET_KEY": settings.notes_app.secret_key,
+    }
+    for name in ("HOST", "PORT", "NAME", "VERSION", "DESCRIPTION"):
+        env.setdefault(f"NOTES_APP_{name}", "")
+    return env
+
+
+def start_server(dsn: str, port: int, workers: int, pool_size: int) -> subprocess.Popen:
+    """Start production runner with `workers` processes serving `main:init_app`."""
+    command = [
+        sys.executable, "-m", "notes.src.runner",
+        "--host", "127.0.0.1", "--port", str(port), "--workers", str(workers), "--log-level", "warning",
+    ]
+    return subprocess.Popen(command, env=server_env(dsn, pool_size))
+
+
+def stop_server(process: subprocess.Popen) -> None:
+    """Stop uvicorn and wait for workers to exit."""
+    process.terminate()
+    try:
+        process.wait(timeout=30)
+    except subprocess.TimeoutExpired:
+        process.kill()
+        process.wait()
+
+
+async def wait_ready(client: httpx.AsyncClient, process: subprocess.Popen, timeout: float = 30.0) -> None:
+    """Poll readiness check until server is warmed up."""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"uvicorn exited with code {process.returncode}")
+        try:
+            if (await client.get(HEALTH_CHECK_URL)).status_code == 200:
+                return
+        except httpx.TransportError:
+            pass
+        await asyncio.sleep(0.2)
+    raise RuntimeError(f"server is not ready after {timeout}s")
+
+
+async def drive(
+    client: httpx.AsyncClient, fixtures: Fixtures, mix: str, concurrency: int, duration: float, warmup: float
+) -> dict:
+    """Run closed loop load with `concurrency` clients, warmup requests are not recorded."""
+    factories, weights = zip(*MIXES[mix])
+    recorder = Recorder()
+    started_at = time.perf_counter()
+    measure_from = started_at + warmup
+    stop_at = measure_from + duration
+
+    async def worker() -> None:
+        while (now := time.perf_counter()) < stop_at:
+            call = random.choices(factories, weights)[0](fixtures)
+            token = issue_token(call.user_id) if call.fresh_token else fixtures.token(call.user_id)
+            response = None
+            request_started_at = time.perf_counter()
+            try:
+                response = await client.request(
+                    call.method,
+                    call.url,
+                    params=call.params,
+                    json=call.json,
+                    headers={"Authorization": f"Bearer {token}"},
+                )
+            except httpx.HTTPError:
+                pass
+            elapsed = time.perf_counter() - request_started_at
+            if now >= measure_from:
+                recorder.record(call, elapsed, response)
+
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return recorder.report(duration)
+
+
+async def run_one(dsn: str, fixtures: Fixtures, args: argparse.Namespace, workers: int, pool_size: int) -> dict:
+    """Boot server with given workers and pool size and measure it."""
+    port = _free_port()
+    process = start_server(dsn, port, workers, pool_size)
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+    try:
+        async with httpx.AsyncClient(base_url=f"http://127.0.0.1:{port}", limits=limits, timeout=30.0) as client:
+            await wait_ready(client, process)
+            return await drive(client, fixtures, args.mix, args.concurrency, args.duration, args.warmup)
+    finally:
+        stop_server(process)
+
+
+def print_result(name: str, result: dict) -> None:
+    """Print one run and its endpoints."""
+    print(
+        f"{name:<28} {result['throughput_rps']:9.1f} rps  p50 {result['p50_ms']:7.2f}ms  "
+        f"p95 {result['p95_ms']:7.2f}ms  p99 {result['p99_ms']:7.2f}ms  errors {result['error_rate']:6.2%}"
+    )
+    for endpoint, stats in sorted(result["endpoints"].items()):
+        queries = stats["queries_per_request"]
+        print(
+            f"    {endpoint:<24} {stats['samples']:7} req  p95 {stats['p95_ms']:7.2f}ms  "
+            f"errors {stats['error_rate']:6.2%}  queries {'n/a' if queries is None else f'{queries:.2f}'}"
+        )
+
+
+def parse_counts(value: str) -> list[int]:
+    """Parse comma separated list of positive integers."""
+    return [int(item) for item in value.split(",") if item]
+
+
+def main() -> None:
+    """Run load test sweep."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--mix", choices=sorted(MIXES), default="read-heavy")
+    parser.add_argument("--workers", type=parse_counts, default=[1], help="comma separated uvicorn worker counts")
+    parser.add_argument("--pool-size", type=parse_counts, default=[settings.postgres.pool_size],
+                        help="comma separated POSTGRES_POOL_SIZE values")
+    parser.add_argument("--concurrency", type=int, default=32, help="concurrent clients")
+    parser.add_argument("--duration", type=float, default=20.0, help="measured seconds per run")
+    parser.add_argument("--warmup", type=float, default=3.0, help="unmeasured seconds per run")
+    parser.add_argument("--rows", type=int, default=10000, help="notes to seed, users are rows / 100")
+    parser.add_argument("--skip-seed", action="store_true", help="reuse data seeded by a previous run")
+    parser.add_argument("--output", default="bench-load.json", help="results json path")
+    args = parser.parse_args()
+
+    with local_postgres() as dsn:
+        fixtures = asyncio.run(prepare(dsn, args.rows, args.skip_seed))
+        results = {}
+        for workers in args.workers:
+            for pool_size in args.pool_size:
+                name = f"{args.mix}[workers={workers},pool={pool_size}]"
+                results[name] = asyncio.run(run_one(dsn, fixtures, args, workers, pool_size))
+                print_result(name, results[name])
+
+    params = {key: value for key, value in vars(args).items() if key != "output"}
+    write_results(args.output, "load", params, results)
+
+
+if __name__ == "__main__":
+    main()
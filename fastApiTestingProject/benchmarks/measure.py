@@ -0,0 +1,81 @@
+"""Shared measurement helpers for benchmarks."""
+import json
+import platform
+import statistics
+import subprocess
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from typing import Any, Awaitable, Callable
+
+from common.packages.src.metrics.context import RequestStats, request_stats_var
+
+
+def percentile(values: list[float], fraction: float) -> float:
+    """Get percentile with linear interpolation."""
+    ordered = sorted(values)
+    if not ordered:
+        return 0.0
+    position = (len(ordered) - 1) * fraction
+    lower = int(position)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower)
+
+
+def summarize(latencies: list[float]) -> dict[str, float]:
+    """Get latency percentiles in milliseconds."""
+    return {
+        "samples": len(latencies),
+        "mean_ms": statistics.fmean(latencies) * 1000 if latencies else 0.0,
+        "p50_ms": percentile(latencies, 0.50) * 1000,
+        "p95_ms": percentile(latencies, 0.95) * 1000,
+        "p99_ms": percentile(latencies, 0.99) * 1000,
+    }
+
+
+async def measure(operation: Callable[[], Awaitable[Any]], samples: int, warmup: int = 3) -> dict[str, float]:
+    """Run operation `samples` times, report latency percentiles, queries and peak memory of one run."""
+    for _ in range(warmup):
+        await operation()
+
+    latencies = []
+    for _ in range(samples):
+        started_at = time.perf_counter()
+        await operation()
+        latencies.append(time.perf_counter() - started_at)
+
+    stats = RequestStats()
+    token = request_stats_var.set(stats)
+    tracemalloc.start()
+    try:
+        await operation()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+        request_stats_var.reset(token)
+
+    return {**summarize(latencies), "queries": stats.queries, "peak_memory_kb": peak / 1024}
+
+
+def git_revision() -> str | None:
+    """Get current commit hash."""
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def write_results(path: str, benchmark: str, params: dict, results: dict) -> None:
+    """Write results as json, one file per run so that runs of two commits can be diffed."""
+    document = {
+        "benchmark": benchmark,
+        "revision": git_revision(),
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "params": params,
+        "results": results,
+    }
+    with open(path, "w") as output:
+        json.dump(document, output, indent=2, sort_keys=True)
@@ -0,0 +1,65 @@
+"""Disposable local Postgres server for benchmarks."""
+import os
+import shutil
+import socket
+import subprocess
+import tempfile
+from contextlib import contextmanager
+from typing import Iterator
+
+DSN_ENV = "BENCH_POSTGRES_DSN"
+BIN_ENV = "BENCH_POSTGRES_BIN"
+
+
+def _free_port() -> int:
+    """Get free local tcp port."""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _binary(name: str) -> str:
+    """Find postgres binary in BENCH_POSTGRES_BIN or PATH."""
+    bin_dir = os.getenv(BIN_ENV)
+    path = os.path.join(bin_dir, name) if bin_dir else shutil.which(name)
+    if not path or not os.path.exists(path):
+        raise RuntimeError(f"{name} not found, add postgres binaries to PATH, set {BIN_ENV} or {DSN_ENV}")
+    return path
+
+
+@contextmanager
+def local_postgres(database: str = "bench") -> Iterator[str]:
+    """Yield asyncpg dsn of a running Postgres.
+
+    `BENCH_POSTGRES_DSN` points to an existing server, otherwise a throwaway
+    cluster is created with initdb in a temporary directory and removed on exit.
+    """
+    dsn = os.getenv(DSN_ENV)
+    if dsn:
+        yield dsn
+        return
+
+    port = _free_port()
+    with tempfile.TemporaryDirectory(prefix="notes-bench-") as workdir:
+        data_dir = os.path.join(workdir, "data")
+        subprocess.run(
+            [_binary("initdb"), "-D", data_dir, "-U", "postgres", "--auth=trust", "--no-sync"],
+            check=True,
+            stdout=subprocess.DEVNULL,
+        )
+        options = f"-p {port} -k {workdir} -c listen_addresses=127.0.0.1 -c fsync=off"
+        subprocess.run(
+            [_binary("pg_ctl"), "-D", data_dir, "-o", options, "-l", os.path.join(workdir, "postgres.log"), "-w", "start"],
+            check=True,
+            stdout=subprocess.DEVNULL,
+        )
+        try:
+            subprocess.run(
+                [_binary("createdb"), "-h", "127.0.0.1", "-p", str(port), "-U", "postgres", database],
+                check=True,
+            )
+            yield f"postgresql+asyncpg://postgres@127.0.0.1:{port}/{database}"
+        finally:
+            subprocess.run(
+                [_binary("pg_ctl"), "-D", data_dir, "-m", "fast", "-w", "stop"], check=False, stdout=subprocess.DEVNULL
+            )
@@ -0,0 +1,159 @@
+"""Benchmark BaseRepository operations on a seeded database.
+
+Usage:
+    python -m benchmarks.repository --rows 100000 --samples 200 --output repository.json
+
+A throwaway Postgres is started with initdb unless BENCH_POSTGRES_DSN is set,
+see `benchmarks.postgres`. Compare two result files with `benchmarks.compare`.
+"""
+import argparse
+import asyncio
+import random
+import uuid
+from datetime import datetime, timedelta
+from typing import Any, AsyncIterator, Awaitable, Callable
+
+from sqlalchemy import func, select
+
+from benchmarks.measure import measure, write_results
+from benchmarks.postgres import local_postgres
+from common.packages.src.db import Base, dao_models  # noqa
+from common.packages.src.db.engine import engines
+from common.packages.src.db.models import Note, User
+from common.packages.src.repositories.pagination import Cursor
+from common.packages.src.schemas.base import SoftDeleteSchema
+from common.packages.src.schemas.notes import CreateNoteSchema, UpdateNoteSchema
+from notes.src.repositories.notes.core import NoteRepository
+from notes.src.repositories.users.core import UserRepository
+
+PAGE_SIZE = 50
+BATCH_SIZE = 100
+SEED_CHUNK_SIZE = 10000
+
+
+async def iter_users(count: int) -> AsyncIterator[dict]:
+    """Generate user rows."""
+    for i in range(count):
+        yield {"uuid": uuid.uuid4(), "email": f"user{i}@example.com", "password": "password"}
+
+
+async def iter_notes(count: int, user_ids: list[uuid.UUID]) -> AsyncIterator[dict]:
+    """Generate note rows with distinct creation timestamps."""
+    started_at = datetime(2024, 1, 1)
+    for i in range(count):
+        yield {
+            "title": f"note {i}",
+            "description": "benchmark note " * 4,
+            "user_id": user_ids[i % len(user_ids)],
+            "created_at": started_at + timedelta(milliseconds=i),
+            "updated_at": started_at + timedelta(milliseconds=i),
+            "is_deleted": False,
+        }
+
+
+async def seed(dsn: str, rows: int) -> None:
+    """Recreate schema and fill user and store_item tables."""
+    engine = engines.get_engine(dsn)
+    async with engine.begin() as connection:
+        await connection.run_sync(Base.metadata.drop_all)
+        await connection.exec_driver_sql("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+        await connection.run_sync(Base.metadata.create_all)
+
+    async with engines.get_session_factory(dsn)() as session:
+        users = UserRepository(session)
+        await users.bulk_ingest(iter_users(max(rows // 100, 1)), chunk_size=SEED_CHUNK_SIZE, use_copy=True)
+        user_ids = list((await session.execute(select(User.uuid))).scalars().all())
+        notes = NoteRepository(session)
+        await notes.bulk_ingest(iter_notes(rows, user_ids), chunk_size=SEED_CHUNK_SIZE, use_copy=True)
+        await session.commit()
+    async with engine.connect() as connection:
+        await connection.exec_driver_sql("ANALYZE")
+
+
+def operation(dsn: str, body: Callable[[NoteRepository], Awaitable[Any]]) -> Callable[[], Awaitable[None]]:
+    """Wrap repository call into its own session, changes are rolled back to keep table size stable."""
+    session_factory = engines.get_session_factory(dsn)
+
+    async def run() -> None:
+        async with session_factory() as session:
+            await body(NoteRepository(session))
+            await session.rollback()
+
+    return run
+
+
+async def run_benchmark(dsn: str, rows: int, samples: int) -> dict[str, dict]:
+    """Measure repository operations."""
+    async with engines.get_session_factory(dsn)() as session:
+        pks = list((await session.execute(select(Note.uuid).order_by(func.random()).limit(10000))).scalars().all())
+        user_id = (await session.execute(select(User.uuid).limit(1))).scalar_one()
+        depths = sorted({0, rows // 100, rows // 2, max(rows - PAGE_SIZE, 0)})
+        cursors = {}
+        for depth in depths:
+            row = (
+                await session.execute(select(Note).order_by(Note.created_at, Note.uuid).offset(depth).limit(1))
+            ).scalar_one()
+            cursors[depth] = Cursor("created_at", row.created_at, str(row.uuid)).encode() if depth else None
+
+    def pk() -> uuid.UUID:
+        return random.choice(pks)
+
+    operations = {
+        "create": lambda repo: repo.create(CreateNoteSchema(title="bench", description="bench")),
+        "bulk_create": lambda repo: repo.bulk_create(
+            [CreateNoteSchema(title="bench", description="bench") for _ in range(BATCH_SIZE)]
+        ),
+        "retrieve": lambda repo: repo.retrieve(pk()),
+        "bulk_retrieve": lambda repo: repo.bulk_retrieve(random.sample(pks, BATCH_SIZE)),
+        "update": lambda repo: repo.update(pk(), UpdateNoteSchema(title="updated"), partial=True),
+        "bulk_update": lambda repo: repo.bulk_update(
+            random.sample(pks, BATCH_SIZE), UpdateNoteSchema(title="updated"), partial=True
+        ),
+        "soft_delete": lambda repo: repo.soft_delete(
+            pk(), SoftDeleteSchema(deleted_by=user_id, deleted_at=datetime.utcnow())
+        ),
+    }
+    for depth in depths:
+        operations[f"get_paginated[offset={depth}]"] = (
+            lambda repo, depth=depth: repo.get_paginated(limit=PAGE_SIZE, offset=depth, order_by_field="created_at")
+        )
+        operations[f"get_paginated_by_cursor[depth={depth}]"] = (
+            lambda repo, depth=depth: repo.get_paginated_by_cursor(limit=PAGE_SIZE, cursor=cursors[depth])
+        )
+
+    results = {}
+    for name, body in operations.items():
+        results[name] = await measure(operation(dsn, body), samples)
+        print(
+            f"{name:<40} p50 {results[name]['p50_ms']:8.2f}ms  p99 {results[name]['p99_ms']:8.2f}ms  "
+            f"queries {results[name]['queries']:3}  peak {results[name]['peak_memory_kb']:9.1f}KiB"
+        )
+    return results
+
+
+async def main_async(args: argparse.Namespace, dsn: str) -> None:
+    """Seed database and run benchmark."""
+    try:
+        if not args.skip_seed:
+            await seed(dsn, args.rows)
+        results = await run_benchmark(dsn, args.rows, args.samples)
+    finally:
+        await engines.dispose()
+    write_results(args.output, "repository", {"rows": args.rows, "samples": args.samples}, results)
+
+
+def main() -> None:
+    """Run benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=10000, help="notes to seed, users are rows / 100")
+    parser.add_argument("--samples", type=int, default=200, help="measured runs per operation")
+    parser.add_argument("--output", default="bench-repository.json", help="results json path")
+    parser.add_argument("--skip-seed", action="store_true", help="reuse data seeded by a previous run")
+    args = parser.parse_args()
+
+    with local_postgres() as dsn:
+        asyncio.run(main_async(args, dsn))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,150 @@
+"""Benchmark serialization cost of list responses.
+
+Usage:
+    python -m benchmarks.serialization --items 1000 --samples 100 --output serialization.json
+
+Compares the previous response path (ORM objects validated into NoteSchema,
+validated again through `response_model` and rendered with the stdlib json
+encoder) with the fast path (plain rows of NoteSchema columns projected to
+dicts and rendered with orjson). Every variant is measured with and without
+the database fetch, `per_item_us` is the p50 latency divided by page size.
+"""
+import argparse
+import asyncio
+from typing import Any, Awaitable, Callable
+
+import httpx
+from fastapi import FastAPI
+from fastapi.responses import JSONResponse
+from sqlalchemy import inspect
+
+from benchmarks.measure import measure, write_results
+from benchmarks.postgres import local_postgres
+from benchmarks.repository import seed
+from common.packages.src.core.serialization import ORJSONResponse
+from common.packages.src.db.engine import engines
+from common.packages.src.schemas.notes import NoteSchema, NotesPageSchema, note_projection
+from notes.src.repositories.notes.core import NoteRepository
+
+
+def legacy_as_dict(obj: Any) -> dict:
+    """Previous BaseModel.as_dict implementation inspecting mapper on every call."""
+    return {c.key: getattr(obj, c.key) for c in inspect(obj).mapper.column_attrs if not c.deferred}
+
+
+def build_app(dsn: str, items: int, prefetched: dict[str, list]) -> FastAPI:
+    """Create app exposing previous and fast response paths of the same page."""
+    app = FastAPI()
+    session_factory = engines.get_session_factory(dsn)
+
+    async def fetch(columns: tuple[str, ...] | None = None) -> list:
+        async with session_factory() as session:
+            return list(
+                await NoteRepository(session).get_paginated(
+                    limit=items, offset=0, order_by_field="created_at", columns=columns
+                )
+            )
+
+    def validated_page(notes: list) -> NotesPageSchema:
+        return NotesPageSchema(items=[NoteSchema.model_validate(note) for note in notes], limit=items, offset=0)
+
+    def projected_page(rows: list) -> ORJSONResponse:
+        return ORJSONResponse({"items": note_projection.many(rows), "limit": items, "offset": 0})
+
+    @app.get("/response-model", response_model=NotesPageSchema, response_class=JSONResponse)
+    async def response_model() -> NotesPageSchema:
+        return validated_page(await fetch())
+
+    @app.get("/fast-path", response_model=NotesPageSchema)
+    async def fast_path() -> ORJSONResponse:
+        return projected_page(await fetch(note_projection.fields))
+
+    @app.get("/response-model/serialize", response_model=NotesPageSchema, response_class=JSONResponse)
+    async def response_model_serialize() -> NotesPageSchema:
+        return validated_page(prefetched["objects"])
+
+    @app.get("/fast-path/serialize", response_model=NotesPageSchema)
+    async def fast_path_serialize() -> ORJSONResponse:
+        return projected_page(prefetched["rows"])
+
+    return app
+
+
+def request(client: httpx.AsyncClient, path: str) -> Callable[[], Awaitable[None]]:
+    """Wrap GET request checking its status."""
+
+    async def run() -> None:
+        response = await client.get(path)
+        response.raise_for_status()
+
+    return run
+
+
+def call(function: Callable[[], Any]) -> Callable[[], Awaitable[None]]:
+    """Wrap sync function into measurable coroutine."""
+
+    async def run() -> None:
+        function()
+
+    return run
+
+
+async def run_benchmark(dsn: str, items: int, samples: int) -> dict[str, dict]:
+    """Measure previous and fast serialization paths."""
+    async with engines.get_session_factory(dsn)() as session:
+        repository = NoteRepository(session)
+        prefetched = {
+            "objects": list(await repository.get_paginated(limit=items, offset=0, order_by_field="created_at")),
+            "rows": list(
+                await repository.get_paginated(
+                    limit=items, offset=0, order_by_field="created_at", columns=note_projection.fields
+                )
+            ),
+        }
+    objects = prefetched["objects"]
+
+    app = build_app(dsn, items, prefetched)
+    results = {}
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench") as client:
+        operations = {
+            "as_dict[legacy]": call(lambda: [legacy_as_dict(obj) for obj in objects]),
+            "as_dict[projection]": call(lambda: [obj.as_dict() for obj in objects]),
+            "list[response_model]": request(client, "/response-model"),
+            "list[fast_path]": request(client, "/fast-path"),
+            "list[response_model,serialize_only]": request(client, "/response-model/serialize"),
+            "list[fast_path,serialize_only]": request(client, "/fast-path/serialize"),
+        }
+        for name, operation in operations.items():
+            result = await measure(operation, samples)
+            result["per_item_us"] = result["p50_ms"] * 1000 / items
+            results[name] = result
+            print(f"{name:<40} p50 {result['p50_ms']:8.2f}ms  per item {result['per_item_us']:7.2f}us")
+    return results
+
+
+async def main_async(args: argparse.Namespace, dsn: str) -> None:
+    """Seed database and run benchmark."""
+    try:
+        if not args.skip_seed:
+            await seed(dsn, args.items)
+        results = await run_benchmark(dsn, args.items, args.samples)
+    finally:
+        await engines.dispose()
+    write_results(args.output, "serialization", {"items": args.items, "samples": args.samples}, results)
+
+
+def main() -> None:
+    """Run benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--items", type=int, default=1000, help="notes per list response")
+    parser.add_argument("--samples", type=int, default=100, help="measured runs per variant")
+    parser.add_argument("--output", default="bench-serialization.json", help="results json path")
+    parser.add_argument("--skip-seed", action="store_true", help="reuse data seeded by a previous run")
+    args = parser.parse_args()
+
+    with local_postgres() as dsn:
+        asyncio.run(main_async(args, dsn))
+
+
+if __name__ == "__main__":
+    main()
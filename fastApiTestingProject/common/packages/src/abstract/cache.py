@@ -0,0 +1,27 @@
+"""Module with cache interface."""
+from abc import ABC, abstractmethod
+from typing import Any, Awaitable, Callable
+
+
+class ICache(ABC):
+    """Cache interface class."""
+
+    @abstractmethod
+    async def get(self, key: str) -> Any:
+        """Get cached value, None if key is missing."""
+        raise NotImplementedError("Implement get method")
+
+    @abstractmethod
+    async def set(self, key: str, value: Any, ttl: float | None = None) -> None:
+        """Store value under key for ttl seconds."""
+        raise NotImplementedError("Implement set method")
+
+    @abstractmethod
+    async def delete(self, *keys: str) -> None:
+        """Invalidate keys."""
+        raise NotImplementedError("Implement delete method")
+
+    @abstractmethod
+    async def get_or_load(self, key: str, loader: Callable[[], Awaitable[Any]], ttl: float | None = None) -> Any:
+        """Get cached value or load and store it."""
+        raise NotImplementedError("Implement get_or_load method")
@@ -0,0 +1,9 @@
+from common.packages.src.cache.base import (
+    BaseCache,
+    CacheStats,
+    defer_invalidation,
+    is_invalidation_pending,
+    run_pending_invalidations,
+)
+from common.packages.src.cache.key_value import FakeKeyValueClient, KeyValueCache
+from common.packages.src.cache.memory import InMemoryCache, LRUCache
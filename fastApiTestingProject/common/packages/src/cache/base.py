@@ -0,0 +1,83 @@
+"""Module with base cache realization."""
+import asyncio
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, MutableMapping
+
+from loguru import logger
+
+from common.packages.src.abstract.cache import ICache
+
+PENDING_INVALIDATIONS = "pending_invalidations"
+
+
+@dataclass
+class CacheStats:
+    """Cache counters."""
+
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    invalidations: int = 0
+    coalesced: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        """Return share of lookups served from cache."""
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+class BaseCache(ICache):
+    """ICache partial realization with counters and single-flight loading."""
+
+    def __init__(self) -> None:
+        """Initialize counters and in-flight loads registry."""
+        self.stats = CacheStats()
+        self._inflight: dict[str, asyncio.Task] = {}
+
+    async def get_or_load(self, key: str, loader: Callable[[], Awaitable[Any]], ttl: float | None = None) -> Any:
+        """Get cached value or load it, concurrent misses on the same key share one load."""
+        value = await self.get(key)
+        if value is not None:
+            return value
+
+        task = self._inflight.get(key)
+        if task is not None:
+            self.stats.coalesced += 1
+            return await asyncio.shield(task)
+
+        task = self._inflight[key] = asyncio.ensure_future(loader())
+        try:
+            value = await asyncio.shield(task)
+        finally:
+            is_current = self._inflight.get(key) is task
+            if is_current:
+                del self._inflight[key]
+        # do not store value of a key invalidated while it was loading
+        if is_current and value is not None:
+            await self.set(key, value, ttl)
+        return value
+
+    def _forget_inflight(self, keys: tuple[str, ...]) -> None:
+        """Prevent in-flight loads of invalidated keys from being stored."""
+        for key in keys:
+            self._inflight.pop(key, None)
+
+
+def defer_invalidation(info: MutableMapping, cache: ICache, *keys: str) -> None:
+    """Invalidate keys once the transaction owning session `info` commits."""
+    info.setdefault(PENDING_INVALIDATIONS, {}).setdefault(cache, set()).update(keys)
+
+
+def is_invalidation_pending(info: MutableMapping, cache: ICache, key: str) -> bool:
+    """Check if key was written by the uncommitted transaction owning session `info`."""
+    return key in info.get(PENDING_INVALIDATIONS, {}).get(cache, ())
+
+
+async def run_pending_invalidations(info: MutableMapping) -> None:
+    """Invalidate keys written by committed transaction, failures are only logged as data is already committed."""
+    for cache, keys in info.pop(PENDING_INVALIDATIONS, {}).items():
+        try:
+            await cache.delete(*keys)
+        except Exception:
+            logger.exception(f"Invalidation of {len(keys)} committed cache keys failed")
@@ -0,0 +1,75 @@
+"""Module with cache backend over a redis-like key value client."""
+import pickle
+import time
+from typing import Any, Protocol
+
+from common.packages.src.cache.base import BaseCache
+
+
+class KeyValueClient(Protocol):
+    """Subset of redis asyncio client api used by the cache."""
+
+    async def get(self, name: str) -> bytes | None: ...
+
+    async def set(self, name: str, value: bytes, ex: int | None = None) -> Any: ...
+
+    async def delete(self, *names: str) -> int: ...
+
+
+class KeyValueCache(BaseCache):
+    """Cache backend storing pickled values in an external key value store."""
+
+    def __init__(self, client: KeyValueClient, prefix: str = "cache:", ttl: float | None = 60.0) -> None:
+        """Initialize backend."""
+        super().__init__()
+        self._client = client
+        self._prefix = prefix
+        self._ttl = ttl
+
+    async def get(self, key: str) -> Any:
+        """Get cached value."""
+        raw = await self._client.get(self._prefix + key)
+        if raw is None:
+            self.stats.misses += 1
+            return None
+        self.stats.hits += 1
+        return pickle.loads(raw)
+
+    async def set(self, key: str, value: Any, ttl: float | None = None) -> None:
+        """Store value."""
+        ttl = ttl if ttl is not None else self._ttl
+        await self._client.set(self._prefix + key, pickle.dumps(value), ex=max(int(ttl), 1) if ttl else None)
+
+    async def delete(self, *keys: str) -> None:
+        """Invalidate keys."""
+        self._forget_inflight(keys)
+        if keys:
+            self.stats.invalidations += await self._client.delete(*(self._prefix + key for key in keys))
+
+
+class FakeKeyValueClient:
+    """Local in-memory stand-in for a redis client."""
+
+    def __init__(self) -> None:
+        """Initialize storage."""
+        self._data: dict[str, tuple[bytes, float | None]] = {}
+
+    async def get(self, name: str) -> bytes | None:
+        """Get raw value."""
+        entry = self._data.get(name)
+        if entry is None:
+            return None
+        value, expires_at = entry
+        if expires_at is not None and expires_at <= time.monotonic():
+            del self._data[name]
+            return None
+        return value
+
+    async def set(self, name: str, value: bytes, ex: int | None = None) -> bool:
+        """Store raw value."""
+        self._data[name] = (value, time.monotonic() + ex if ex else None)
+        return True
+
+    async def delete(self, *names: str) -> int:
+        """Remove keys, return number of removed ones."""
+        return sum(self._data.pop(name, None) is not None for name in names)
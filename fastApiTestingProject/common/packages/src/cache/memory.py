@@ -0,0 +1,78 @@
+"""Module with in-process cache backend."""
+import time
+from collections import OrderedDict
+from typing import Any, Hashable
+
+from common.packages.src.cache.base import BaseCache, CacheStats
+
+
+class LRUCache:
+    """Size bounded LRU mapping with per entry expiration."""
+
+    def __init__(self, max_size: int, ttl: float | None = None, stats: CacheStats | None = None) -> None:
+        """Initialize storage."""
+        if max_size < 1:
+            raise ValueError("Cache max size must be positive")
+        self.max_size = max_size
+        self.ttl = ttl
+        self.stats = stats or CacheStats()
+        self._data: OrderedDict[Hashable, tuple[Any, float | None]] = OrderedDict()
+
+    def __len__(self) -> int:
+        """Return number of stored entries, expired ones included."""
+        return len(self._data)
+
+    def get(self, key: Hashable) -> Any:
+        """Get value and mark it as recently used, None if missing or expired."""
+        entry = self._data.get(key)
+        if entry is not None:
+            value, expires_at = entry
+            if expires_at is None or expires_at > time.monotonic():
+                self._data.move_to_end(key)
+                self.stats.hits += 1
+                return value
+            del self._data[key]
+            self.stats.evictions += 1
+        self.stats.misses += 1
+        return None
+
+    def set(self, key: Hashable, value: Any, ttl: float | None = None) -> None:
+        """Store value, evict least recently used entries above max size."""
+        ttl = ttl if ttl is not None else self.ttl
+        self._data[key] = (value, time.monotonic() + ttl if ttl is not None else None)
+        self._data.move_to_end(key)
+        while len(self._data) > self.max_size:
+            self._data.popitem(last=False)
+            self.stats.evictions += 1
+
+    def delete(self, *keys: Hashable) -> None:
+        """Remove keys."""
+        for key in keys:
+            if self._data.pop(key, None) is not None:
+                self.stats.invalidations += 1
+
+    def clear(self) -> None:
+        """Remove all entries."""
+        self._data.clear()
+
+
+class InMemoryCache(BaseCache):
+    """In-process LRU/TTL cache backend."""
+
+    def __init__(self, max_size: int = 10000, ttl: float | None = 60.0) -> None:
+        """Initialize backend."""
+        super().__init__()
+        self._storage = LRUCache(max_size=max_size, ttl=ttl, stats=self.stats)
+
+    async def get(self, key: str) -> Any:
+        """Get cached value."""
+        return self._storage.get(key)
+
+    async def set(self, key: str, value: Any, ttl: float | None = None) -> None:
+        """Store value."""
+        self._storage.set(key, value, ttl)
+
+    async def delete(self, *keys: str) -> None:
+        """Invalidate keys."""
+        self._forget_inflight(keys)
+        self._storage.delete(*keys)
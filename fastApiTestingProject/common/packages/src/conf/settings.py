@@ -1,4 +1,12 @@
-"""Common settings module."""
+"""Common settings module.
+
+Settings are read from environment and `.env` on first access of `settings`,
+not on import, so importing modules stays cheap.
+"""
+import functools
+from typing import Any
+
+from pydantic import Field
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
@@ -11,6 +19,21 @@ class PostgresSettings(BaseSettings):
     db: str = "postgres"
     host: str = "0.0.0.0"
     echo: bool = False
+    pool_size: int = 10
+    max_overflow: int = 10
+    pool_timeout: float = 30.0
+    pool_recycle: int = 3600
+    pool_pre_ping: bool = True
+    pool_use_lifo: bool = True
+    slow_query_threshold_ms: float = 200.0
+    query_cache_size: int = 500
+    prepared_statement_cache_size: int = 100
+    warmup_connections: int | None = None
+    max_connections: int = 0
+    replica_uris: list[str] = []
+    replica_sticky_window: float = 5.0
+    replica_check_interval: float = 5.0
+    replica_check_timeout: float = 2.0
 
     @property
     def db_uri(self) -> str:
@@ -29,13 +52,122 @@ class NotesService(BaseSettings):
     name: str
     version: str
     description: str
+    profile_imports: bool = False
 
     model_config = SettingsConfigDict(extra='allow', env_prefix="NOTES_APP_", env_file=[".env"])
 
 
+class AuthSettings(BaseSettings):
+    """Auth settings."""
+
+    algorithm: str = "HS256"
+    russpass_api_key: str = ""
+    polylog_api_key: str = ""
+    token_cache_enabled: bool = True
+    token_cache_size: int = 10000
+    token_cache_ttl: float = 300.0
+
+    model_config = SettingsConfigDict(extra='allow', env_prefix="AUTH_", env_file=[".env"])
+
+
+class CacheSettings(BaseSettings):
+    """Entity cache settings.
+
+    The cache lives in process memory and writes invalidate it only in the
+    worker which made them, so by default (`enabled` unset) it is used only
+    when the server runs a single worker.
+    """
+
+    enabled: bool | None = None
+    max_size: int = 10000
+    ttl: float = 60.0
+
+    model_config = SettingsConfigDict(extra='allow', env_prefix="CACHE_", env_file=[".env"])
+
+
+class PurgeSettings(BaseSettings):
+    """Soft deleted rows purge worker settings."""
+
+    enabled: bool = False
+    retention_days: int = 30
+    archive: bool = True
+    batch_size: int = 500
+    max_rows_per_second: float = 2000.0
+    max_replication_lag: float = 10.0
+    interval: float = 3600.0
+
+    model_config = SettingsConfigDict(extra='allow', env_prefix="PURGE_", env_file=[".env"])
+
+
+class ServerSettings(BaseSettings):
+    """Production server settings, `workers` defaults to CPU count."""
+
+    workers: int | None = None
+    loop: str = "auto"
+    http: str = "auto"
+    backlog: int = 2048
+    graceful_timeout: float = 30.0
+    drain_delay: float = 0.0
+
+    model_config = SettingsConfigDict(extra='allow', env_prefix="SERVER_", env_file=[".env"])
+
+
+class MetricsSettings(BaseSettings):
+    """Metrics settings.
+
+    With `multiproc_dir` every worker snapshots its metrics into the
+    directory every `snapshot_interval` seconds, so a scrape served by any of
+    them reports all workers. The runner sets it up for multiple workers.
+    """
+
+    multiproc_dir: str | None = None
+    snapshot_interval: float = 5.0
+
+    model_config = SettingsConfigDict(extra='allow', env_prefix="METRICS_", env_file=[".env"])
+
+
+class WriteBehindSettings(BaseSettings):
+    """Write-behind queue of note writes settings, requests opt in with `Prefer: respond-async`.
+
+    `directory` has to be on a persistent volume, writes left there by a
+    crashed process are flushed by the next one started.
+    """
+
+    enabled: bool = False
+    directory: str = "write-behind"
+    batch_size: int = 500
+    flush_interval: float = 1.0
+    max_pending: int = 10000
+    enqueue_timeout: float = 1.0
+    retry_interval: float = 5.0
+    fsync: bool = True
+
+    model_config = SettingsConfigDict(extra='allow', env_prefix="WRITE_BEHIND_", env_file=[".env"])
+
+
 class Settings(BaseSettings):
-    notes_app: NotesService = NotesService()
-    postgres: PostgresSettings = PostgresSettings()
+    notes_app: NotesService = Field(default_factory=NotesService)
+    postgres: PostgresSettings = Field(default_factory=PostgresSettings)
+    auth: AuthSettings = Field(default_factory=AuthSettings)
+    cache: CacheSettings = Field(default_factory=CacheSettings)
+    purge: PurgeSettings = Field(default_factory=PurgeSettings)
+    server: ServerSettings = Field(default_factory=ServerSettings)
+    metrics: MetricsSettings = Field(default_factory=MetricsSettings)
+    write_behind: WriteBehindSettings = Field(default_factory=WriteBehindSettings)
+
+
+@functools.cache
+def get_settings() -> Settings:
+    """Build settings once, on first use."""
+    return Settings()
+
+
+class LazySettings:
+    """Proxy of settings which are built on first attribute access."""
+
+    def __getattr__(self, name: str) -> Any:
+        """Get attribute of settings."""
+        return getattr(get_settings(), name)
 
 
-settings = Settings()
+settings: Settings = LazySettings()  # type: ignore
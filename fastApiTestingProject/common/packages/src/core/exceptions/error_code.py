@@ -7,6 +7,10 @@ class DomainErrorCodeEnum(enum.StrEnum):
     TOKEN_INVALID_OR_EXPIRED = "token_invalid_or_expired"
     WRONG_PASSWORD_PROVIDED = "wrong_password_provided"
     AUTHORIZATION_FAILED = "authorization_failed"
+    INVALID_CURSOR = "invalid_cursor"
+    INVALID_ORDER_FIELD = "invalid_order_field"
+    INVALID_PRECONDITION = "invalid_precondition"
+    WRITE_QUEUE_UNAVAILABLE = "write_queue_unavailable"
 
 
 class AuthorizationErrorCodeEnum(enum.StrEnum):
@@ -19,3 +23,4 @@ class DBErrorCodeEnum(enum.StrEnum):
     USER_DOES_NOT_EXISTS = "user_does_not_exists"
     OBJECT_NOT_FOUND = "object_not_found"
     DB_FIELD_NOT_FOUND = "database_field_not_found"
+    VERSION_CONFLICT = "version_conflict"
@@ -0,0 +1,26 @@
+"""Exception handlers mapping application exceptions to json responses."""
+from fastapi import Request
+from fastapi.responses import JSONResponse
+
+from common.packages.src.core.exceptions.api_exception import ApiException
+from common.packages.src.core.exceptions.base import BaseAppException
+from common.packages.src.core.schemas.exception_schema import ExceptionSchema
+
+
+async def app_exception_handler(request: Request, exc: BaseAppException) -> JSONResponse:
+    """Render domain and infrastructure exceptions."""
+    content = ExceptionSchema(detail=exc.detail, error_code=str(exc.error_code))
+    return JSONResponse(content=content.model_dump(), status_code=exc.status_code)
+
+
+async def api_exception_handler(request: Request, exc: ApiException) -> JSONResponse:
+    """Render api exceptions, their message is kept in `name`."""
+    detail = exc.name if isinstance(exc.name, str) else str(exc.name)
+    content = ExceptionSchema(detail=detail, error_code="api_exception")
+    return JSONResponse(content=content.model_dump(), status_code=int(exc.status_code))
+
+
+exception_handlers = {
+    BaseAppException: app_exception_handler,
+    ApiException: api_exception_handler,
+}
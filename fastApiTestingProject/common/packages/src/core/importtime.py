@@ -0,0 +1,117 @@
+"""Import time profiling of the service entry point.
+
+Usage:
+    python -m common.packages.src.core.importtime main --top 25
+    python -m common.packages.src.core.importtime main --budget-ms 1500
+
+The module is imported by a fresh interpreter run with `-X importtime`, so
+the breakdown shows the cold start cost of a new worker process. With
+`--budget-ms` the command fails when the import takes longer, which makes
+it usable as a CI check. Only standard library is imported here.
+"""
+import argparse
+import subprocess
+import sys
+from dataclasses import dataclass
+from typing import Iterable
+
+IMPORT_TIME_PREFIX = "import time:"
+
+
+@dataclass(frozen=True)
+class ImportTiming:
+    """Import cost of one module in microseconds."""
+
+    module: str
+    self_us: int
+    cumulative_us: int
+    depth: int
+
+    @property
+    def package(self) -> str:
+        """Get top level package of module."""
+        return self.module.split(".", 1)[0]
+
+
+def parse(lines: Iterable[str]) -> list[ImportTiming]:
+    """Parse `-X importtime` report lines, the header and unrelated output are skipped."""
+    timings = []
+    for line in lines:
+        if not line.startswith(IMPORT_TIME_PREFIX):
+            continue
+        self_us, cumulative_us, name = line[len(IMPORT_TIME_PREFIX):].split("|")
+        if not self_us.strip().isdigit():
+            continue
+        module = name.rstrip()
+        depth = (len(module) - len(module.lstrip())) // 2
+        timings.append(ImportTiming(module.strip(), int(self_us), int(cumulative_us), depth))
+    return timings
+
+
+def subtree(timings: list[ImportTiming], target: str) -> list[ImportTiming]:
+    """Get timings of `target` and of modules first imported by it, interpreter startup imports are dropped."""
+    for index in range(len(timings) - 1, -1, -1):
+        if timings[index].module == target:
+            break
+    else:
+        raise ValueError(f"Module {target} was not imported")
+    root = timings[index]
+    start = index
+    while start > 0 and timings[start - 1].depth > root.depth:
+        start -= 1
+    return timings[start:index + 1]
+
+
+def profile(target: str = "main", python: str = sys.executable) -> list[ImportTiming]:
+    """Import `target` in a fresh interpreter and get import cost of every module it loaded, `target` is the last."""
+    result = subprocess.run(
+        [python, "-X", "importtime", "-c", f"import {target}"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return subtree(parse(result.stderr.splitlines()), target)
+
+
+def summarize(timings: list[ImportTiming], top: int = 20) -> str:
+    """Render slowest modules by cumulative and by self cost, and self cost per top level package.
+
+    `timings` are the ones of `profile`, the last of them is the profiled module.
+    """
+    packages: dict[str, int] = {}
+    for timing in timings:
+        packages[timing.package] = packages.get(timing.package, 0) + timing.self_us
+
+    root = timings[-1]
+    lines = [f"Import of {root.module} took {root.cumulative_us / 1000:.1f}ms, {len(timings)} modules"]
+    lines.append(f"Top {top} by cumulative cost:")
+    for timing in sorted(timings, key=lambda item: item.cumulative_us, reverse=True)[:top]:
+        lines.append(f"  {timing.cumulative_us / 1000:8.1f}ms  {timing.module}")
+    lines.append(f"Top {top} by self cost:")
+    for timing in sorted(timings, key=lambda item: item.self_us, reverse=True)[:top]:
+        lines.append(f"  {timing.self_us / 1000:8.1f}ms  {timing.module}")
+    lines.append(f"Top {top} packages by self cost:")
+    for package, self_us in sorted(packages.items(), key=lambda item: item[1], reverse=True)[:top]:
+        lines.append(f"  {self_us / 1000:8.1f}ms  {package}")
+    return "\n".join(lines)
+
+
+def main() -> None:
+    """Print import breakdown, exit with error when over budget."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("target", nargs="?", default="main", help="module to import")
+    parser.add_argument("--top", type=int, default=20, help="modules listed per section")
+    parser.add_argument("--budget-ms", type=float, help="fail when import takes longer")
+    parser.add_argument("--runs", type=int, default=3, help="imports measured, the fastest one is reported")
+    args = parser.parse_args()
+
+    timings = min((profile(args.target) for _ in range(args.runs)), key=lambda item: item[-1].cumulative_us)
+    print(summarize(timings, args.top))
+    elapsed_ms = timings[-1].cumulative_us / 1000
+    if args.budget_ms is not None and elapsed_ms > args.budget_ms:
+        print(f"Import of {args.target} is over budget of {args.budget_ms:.1f}ms", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
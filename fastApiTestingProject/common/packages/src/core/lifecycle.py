@@ -0,0 +1,5 @@
+"""Module with process lifecycle state shared by server and app."""
+import threading
+
+draining = threading.Event()
+"""Set when the process got SIGTERM and is about to stop, readiness fails from then on."""
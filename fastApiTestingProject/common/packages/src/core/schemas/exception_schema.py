@@ -0,0 +1,7 @@
+"""Error response schemas."""
+from pydantic import BaseModel
+
+
+class ExceptionSchema(BaseModel):
+    detail: str
+    error_code: str
@@ -0,0 +1,64 @@
+"""Serialization helpers for response fast path."""
+from operator import attrgetter
+from typing import Any, Iterable, Sequence
+from uuid import UUID
+
+import orjson
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+from sqlalchemy import Row
+
+
+def _default(obj: Any) -> Any:
+    """Serialize types orjson does not know natively."""
+    if isinstance(obj, UUID):
+        return str(obj)
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+
+def dumps(content: Any) -> bytes:
+    """Serialize content with orjson as pydantic would, asyncpg returns its own UUID subclass which needs the fallback.
+
+    UTC datetimes are rendered with `Z` suffix, as pydantic renders them.
+    """
+    return orjson.dumps(content, default=_default, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_UTC_Z)
+
+
+class ORJSONResponse(JSONResponse):
+    """JSON response rendered with orjson."""
+
+    def render(self, content: Any) -> bytes:
+        """Render content."""
+        return dumps(content)
+
+
+class Projection:
+    """Precomputed accessor copying named attributes of ORM objects or result rows into dicts."""
+
+    __slots__ = ("fields", "_getter")
+
+    def __init__(self, fields: Iterable[str]) -> None:
+        """Build attribute getter once, repeated first name keeps its result a tuple for a single field."""
+        self.fields = tuple(fields)
+        self._getter = attrgetter(*self.fields, self.fields[0])
+
+    @classmethod
+    def of_schema(cls, schema: type[BaseModel]) -> "Projection":
+        """Project fields exposed by response schema."""
+        return cls(schema.model_fields)
+
+    def __call__(self, obj: Any) -> dict:
+        """Get dict of projected fields."""
+        return dict(zip(self.fields, self._getter(obj)))
+
+    def many(self, objs: Sequence[Any]) -> list[dict]:
+        """Get dicts of projected fields.
+
+        Rows selected with projected columns first are zipped positionally,
+        which is several times cheaper than attribute access on Row.
+        """
+        fields = self.fields
+        if objs and isinstance(objs[0], Row) and objs[0]._fields[:len(fields)] == fields:
+            return [dict(zip(fields, row)) for row in objs]
+        getter = self._getter
+        return [dict(zip(fields, getter(obj))) for obj in objs]
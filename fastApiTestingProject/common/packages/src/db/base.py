@@ -4,6 +4,8 @@ from typing import Any
 from sqlalchemy import JSON, inspect
 from sqlalchemy.orm import DeclarativeBase
 
+from common.packages.src.core.serialization import Projection
+
 
 class Base(DeclarativeBase):
     """Inherit from Declarative base."""
@@ -18,6 +20,15 @@ class BaseModel(Base):
 
     __abstract__ = True
 
+    @classmethod
+    def columns_projection(cls) -> Projection:
+        """Get accessor of mapped columns except deferred ones, mapper is inspected once per model."""
+        projection = cls.__dict__.get("_columns_projection")
+        if projection is None:
+            projection = Projection(attr.key for attr in inspect(cls).mapper.column_attrs if not attr.deferred)
+            cls._columns_projection = projection
+        return projection
+
     def as_dict(self) -> dict:
         """Serialize any model to python dictionary."""
-        return {c.key: getattr(self, c.key) for c in inspect(self).mapper.column_attrs}
+        return self.columns_projection()(self)
@@ -0,0 +1,77 @@
+"""Module with read-your-writes marker carried by client between requests."""
+import math
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass
+from http.cookies import SimpleCookie
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from common.packages.src.conf.settings import settings
+
+LAST_WRITE_COOKIE = "last_write"
+
+
+@dataclass
+class WriteMarker:
+    """Time of last write of client and whether current request wrote."""
+
+    last_write: float | None = None
+    wrote: bool = False
+
+    def is_sticky(self, window: float) -> bool:
+        """Check if client wrote within window, its reads must stay on primary."""
+        return self.last_write is not None and time.time() - self.last_write < window
+
+
+write_marker_var: ContextVar[WriteMarker | None] = ContextVar("write_marker", default=None)
+
+
+def _parse_last_write(value: str | None) -> float | None:
+    """Get write time from cookie, values from the future or garbage are ignored."""
+    try:
+        last_write = float(value) if value else None
+    except ValueError:
+        return None
+    if last_write is None or not math.isfinite(last_write) or last_write > time.time():
+        return None
+    return last_write
+
+
+class ReadYourWritesMiddleware:
+    """Keep reads of clients which wrote recently on primary, in any worker.
+
+    Time of the last write travels with the client in a cookie, so no worker
+    has to remember it.
+    """
+
+    def __init__(self, app: ASGIApp, window: float | None = None) -> None:
+        """Wrap ASGI app, window defaults to postgres settings."""
+        self.app = app
+        self.window = settings.postgres.replica_sticky_window if window is None else window
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """Handle request."""
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        cookies = SimpleCookie(Headers(scope=scope).get("cookie", ""))
+        cookie = cookies.get(LAST_WRITE_COOKIE)
+        marker = WriteMarker(last_write=_parse_last_write(cookie.value if cookie else None))
+        token = write_marker_var.set(marker)
+
+        async def send_with_marker(message: Message) -> None:
+            if message["type"] == "http.response.start" and marker.wrote:
+                MutableHeaders(scope=message).append(
+                    "set-cookie",
+                    f"{LAST_WRITE_COOKIE}={time.time():.3f}; Max-Age={math.ceil(self.window)}; Path=/; HttpOnly; "
+                    "SameSite=Lax",
+                )
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_marker)
+        finally:
+            write_marker_var.reset(token)
@@ -1,14 +1,129 @@
 """Module with database engine setup function."""
-from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+from typing import Sequence
 
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
 
-def get_engine(db_uri: str, echo: bool = False) -> AsyncEngine:
-    """Create database engine."""
-    return create_async_engine(
+from common.packages.src.conf.settings import PostgresSettings, settings
+from common.packages.src.db.routing import ReplicaSet, RoutingSession
+from common.packages.src.metrics.db import instrument_engine
+
+
+def pool_limits(config: PostgresSettings | None = None, workers: int | None = None) -> tuple[int, int]:
+    """Get pool size and max overflow of one worker process.
+
+    With `max_connections` set, the budget is divided between server workers,
+    so all of them together never open more connections to a database.
+    """
+    config = config or settings.postgres
+    workers = workers or settings.server.workers or 1
+    if not config.max_connections:
+        return config.pool_size, config.max_overflow
+    per_worker = config.max_connections // workers
+    if per_worker < 1:
+        raise ValueError(f"Connection budget of {config.max_connections} is too small for {workers} workers")
+    pool_size = min(config.pool_size, per_worker)
+    return pool_size, min(config.max_overflow, per_worker - pool_size)
+
+
+def create_engine(db_uri: str, echo: bool = False, config: PostgresSettings | None = None) -> AsyncEngine:
+    """Create database engine with pool and statement caches configured from postgres settings.
+
+    Pool is limited to the worker share of the connection budget, see `pool_limits`.
+
+    `query_cache_size` bounds compiled SQL kept per engine, `prepared_statement_cache_size`
+    bounds asyncpg prepared statements kept per connection, zero disables them (e.g. behind pgbouncer).
+    """
+    config = config or settings.postgres
+    pool_size, max_overflow = pool_limits(config)
+    connect_args = {}
+    if make_url(db_uri).get_driver_name() == "asyncpg":
+        connect_args["prepared_statement_cache_size"] = config.prepared_statement_cache_size
+    engine = create_async_engine(
         db_uri,
-        pool_use_lifo=True,
-        pool_pre_ping=True,
-        pool_recycle=3600,
-        pool_size=10,
+        pool_use_lifo=config.pool_use_lifo,
+        pool_pre_ping=config.pool_pre_ping,
+        pool_recycle=config.pool_recycle,
+        pool_size=pool_size,
+        max_overflow=max_overflow,
+        pool_timeout=config.pool_timeout,
+        query_cache_size=config.query_cache_size,
+        connect_args=connect_args,
         echo=echo,
-    )
\ No newline at end of file
+    )
+    instrument_engine(engine, slow_query_threshold=config.slow_query_threshold_ms / 1000)
+    return engine
+
+
+class EngineRegistry:
+    """Process-wide registry which keeps exactly one engine per database uri."""
+
+    def __init__(self) -> None:
+        """Initialize empty registry."""
+        self._engines: dict[str, AsyncEngine] = {}
+        self._session_factories: dict[str, async_sessionmaker[AsyncSession]] = {}
+        self._replica_sets: dict[tuple[str, ...], ReplicaSet] = {}
+        self._routing_session_factories: dict[tuple[str, ...], async_sessionmaker[AsyncSession]] = {}
+
+    def get_engine(self, db_uri: str, echo: bool = False) -> AsyncEngine:
+        """Return engine for database uri, create it on first access."""
+        engine = self._engines.get(db_uri)
+        if engine is None:
+            engine = self._engines[db_uri] = create_engine(db_uri, echo)
+        return engine
+
+    def get_session_factory(self, db_uri: str, echo: bool = False) -> async_sessionmaker[AsyncSession]:
+        """Return session factory bound to the shared engine of database uri."""
+        session_factory = self._session_factories.get(db_uri)
+        if session_factory is None:
+            session_factory = self._session_factories[db_uri] = async_sessionmaker(
+                bind=self.get_engine(db_uri, echo), expire_on_commit=False
+            )
+        return session_factory
+
+    def get_replica_set(self, replica_uris: Sequence[str], echo: bool = False) -> ReplicaSet:
+        """Return replica set of database uris, create it on first access."""
+        key = tuple(replica_uris)
+        replica_set = self._replica_sets.get(key)
+        if replica_set is None:
+            replica_set = self._replica_sets[key] = ReplicaSet(
+                [self.get_engine(uri, echo) for uri in key],
+                check_interval=settings.postgres.replica_check_interval,
+                check_timeout=settings.postgres.replica_check_timeout,
+            )
+        return replica_set
+
+    def get_routing_session_factory(
+            self, db_uri: str, replica_uris: Sequence[str], echo: bool = False
+    ) -> async_sessionmaker[AsyncSession]:
+        """Return factory of sessions writing to primary and reading from replicas where allowed."""
+        key = (db_uri, *replica_uris)
+        session_factory = self._routing_session_factories.get(key)
+        if session_factory is None:
+            session_factory = self._routing_session_factories[key] = async_sessionmaker(
+                sync_session_class=RoutingSession,
+                primary=self.get_engine(db_uri, echo),
+                replicas=self.get_replica_set(replica_uris, echo),
+                expire_on_commit=False,
+            )
+        return session_factory
+
+    async def dispose(self) -> None:
+        """Stop replica health checks, close all pooled connections and forget registered engines."""
+        for replica_set in self._replica_sets.values():
+            await replica_set.stop()
+        engines = list(self._engines.values())
+        self._engines.clear()
+        self._session_factories.clear()
+        self._replica_sets.clear()
+        self._routing_session_factories.clear()
+        for engine in engines:
+            await engine.dispose()
+
+
+engines = EngineRegistry()
+
+
+def get_engine(db_uri: str, echo: bool = False) -> AsyncEngine:
+    """Get shared database engine."""
+    return engines.get_engine(db_uri, echo)
@@ -0,0 +1,74 @@
+"""Module with Postgres advisory lock electing one process to run a background job."""
+import zlib
+
+from loguru import logger
+from sqlalchemy import text
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine
+
+TRY_LOCK_QUERY = text("SELECT pg_try_advisory_lock(:key)")
+UNLOCK_QUERY = text("SELECT pg_advisory_unlock(:key)")
+PING_QUERY = text("SELECT 1")
+
+
+class AdvisoryLock:
+    """Session level advisory lock held on a dedicated connection, the process holding it is the leader.
+
+    The connection is in autocommit mode, so it is never idle in a
+    transaction. Postgres releases the lock when the connection closes, so
+    another process takes over once a crashed leader's connection is gone.
+    """
+
+    def __init__(self, engine: AsyncEngine, name: str) -> None:
+        """Initialize lock of `name`, it is taken on `acquire`."""
+        self._engine = engine
+        self.name = name
+        self.key = zlib.crc32(name.encode())
+        self._connection: AsyncConnection | None = None
+
+    @property
+    def held(self) -> bool:
+        """Check if this process holds the lock."""
+        return self._connection is not None
+
+    async def _discard(self) -> None:
+        """Drop connection of a lock which was lost."""
+        connection, self._connection = self._connection, None
+        await connection.invalidate()
+        await connection.close()
+
+    async def acquire(self) -> bool:
+        """Take the lock or make sure it is still held, without waiting for another holder."""
+        if self._connection is not None:
+            try:
+                await self._connection.execute(PING_QUERY)
+            except DBAPIError as exc:
+                logger.warning(f"Lost advisory lock {self.name}: {exc!r}")
+                await self._discard()
+            else:
+                return True
+        connection = await self._engine.connect()
+        try:
+            connection = await connection.execution_options(isolation_level="AUTOCOMMIT")
+            acquired = (await connection.execute(TRY_LOCK_QUERY, {"key": self.key})).scalar()
+        except BaseException:
+            await connection.close()
+            raise
+        if not acquired:
+            await connection.close()
+            return False
+        self._connection = connection
+        logger.info(f"Acquired advisory lock {self.name}")
+        return True
+
+    async def release(self) -> None:
+        """Release the lock if it is held."""
+        if self._connection is None:
+            return
+        connection, self._connection = self._connection, None
+        try:
+            await connection.execute(UNLOCK_QUERY, {"key": self.key})
+        except DBAPIError:
+            await connection.invalidate()
+        finally:
+            await connection.close()
@@ -1,4 +1,5 @@
 """Module with mixins fields for database models."""
+import uuid as _uuid
 from datetime import datetime
 from typing import Optional
 
@@ -7,16 +8,27 @@ from sqlalchemy.orm import Mapped, mapped_column
 
 
 class UUIDMixin:
-    """Identifier uuid mixin."""
+    """Identifier uuid mixin.
 
-    uuid: Mapped[str] = mapped_column(UUID, primary_key=True, server_default=text("gen_random_uuid()"))
+    Uuids are generated client side and the column is an insert sentinel, so
+    executemany INSERT ... RETURNING stays batched when rows are returned in
+    parameter order. Server default covers raw SQL inserts.
+    """
+
+    uuid: Mapped[str] = mapped_column(
+        UUID,
+        primary_key=True,
+        default=_uuid.uuid4,
+        server_default=text("gen_random_uuid()"),
+        insert_sentinel=True,
+    )
 
 
 class TimestampMixin:
     """Timestamp mixin."""
 
     created_at: Mapped[datetime] = mapped_column(server_default=func.now())
-    updated_at: Mapped[datetime] = mapped_column(server_default=func.now())
+    updated_at: Mapped[datetime] = mapped_column(server_default=func.now(), onupdate=func.now())
 
 
 class UpdateMixin:
@@ -25,6 +37,12 @@ class UpdateMixin:
     updated_by: Mapped[Optional[str]] = mapped_column(ForeignKey("user.uuid"))
 
 
+class VersionMixin:
+    """Optimistic concurrency version counter mixin, repositories increment it on every update."""
+
+    version: Mapped[int] = mapped_column(default=1, server_default=text("1"))
+
+
 class DeletableMixin:
     """Deletable Mixin."""
 
@@ -1,7 +1,9 @@
 from common.packages.src.db.models.user import User
 from common.packages.src.db.models.note import Note
+from common.packages.src.db.models.note_archive import NoteArchive
 
 dao_models = (
     Note,
+    NoteArchive,
     User
 )
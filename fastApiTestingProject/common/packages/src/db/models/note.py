@@ -1,21 +1,45 @@
 from typing import TYPE_CHECKING
 
-from sqlalchemy import UUID, ForeignKey, String, Text
+from sqlalchemy import UUID, Computed, ForeignKey, Index, String, Text, text
+from sqlalchemy.dialects.postgresql import TSVECTOR
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from common.packages.src.db.base import BaseModel
-from common.packages.src.db.mixins import TimestampMixin, UUIDMixin, DeletableMixin
+from common.packages.src.db.mixins import TimestampMixin, UUIDMixin, DeletableMixin, VersionMixin
 
 if TYPE_CHECKING:
     from common.packages.src.db.models import User
 
+SEARCH_CONFIG = "simple"
+SEARCH_VECTOR_EXPRESSION = (
+    f"setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(title, '')), 'A') || "
+    f"setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(description, '')), 'B')"
+)
+LIVE_ROWS = text("is_deleted = false")
+DELETED_ROWS = text("is_deleted = true")
+LIVE_SORT_FIELDS = ("created_at", "updated_at", "title")
 
-class Note(BaseModel, UUIDMixin, TimestampMixin, DeletableMixin):
+
+class Note(BaseModel, UUIDMixin, TimestampMixin, DeletableMixin, VersionMixin):
     """Model definition."""
 
     __tablename__ = "store_item"
+    __table_args__ = (
+        Index("ix_store_item_search_vector", "search_vector", postgresql_using="gin"),
+        Index(
+            "ix_store_item_title_trgm", "title", postgresql_using="gin", postgresql_ops={"title": "gin_trgm_ops"}
+        ),
+        *(
+            Index(f"ix_store_item_live_user_id_{field}", "user_id", field, "uuid", postgresql_where=LIVE_ROWS)
+            for field in LIVE_SORT_FIELDS
+        ),
+        Index("ix_store_item_deleted_at", "deleted_at", "uuid", postgresql_where=DELETED_ROWS),
+    )
 
     title: Mapped[str] = mapped_column(String(100))
     description: Mapped[str] = mapped_column(Text)
     user_id: Mapped[str | None] = mapped_column(UUID, ForeignKey("user.uuid"))
-    user: Mapped["User"] = relationship(foreign_keys="Note.user_id", lazy="selectin")
+    user: Mapped["User"] = relationship(foreign_keys="Note.user_id", lazy="raise")
+    search_vector: Mapped[str] = mapped_column(
+        TSVECTOR, Computed(SEARCH_VECTOR_EXPRESSION, persisted=True), deferred=True
+    )
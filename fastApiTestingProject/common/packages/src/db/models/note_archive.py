@@ -0,0 +1,23 @@
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import UUID, String, Text, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from common.packages.src.db.base import BaseModel
+
+
+class NoteArchive(BaseModel):
+    """Model definition of notes purged from store_item."""
+
+    __tablename__ = "store_item_archive"
+
+    uuid: Mapped[str] = mapped_column(UUID, primary_key=True)
+    title: Mapped[str] = mapped_column(String(100))
+    description: Mapped[str] = mapped_column(Text)
+    user_id: Mapped[str | None] = mapped_column(UUID, index=True)
+    created_at: Mapped[datetime]
+    updated_at: Mapped[datetime]
+    deleted_at: Mapped[Optional[datetime]]
+    deleted_by: Mapped[Optional[str]] = mapped_column(UUID)
+    archived_at: Mapped[datetime] = mapped_column(server_default=func.now())
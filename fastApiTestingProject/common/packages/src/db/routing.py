@@ -0,0 +1,163 @@
+"""Module with read replica routing of session statements."""
+import asyncio
+import functools
+import itertools
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Awaitable, Callable, Iterator, Sequence, TypeVar
+
+from loguru import logger
+from sqlalchemy import Select, event, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.orm import Session
+
+from common.packages.src.metrics.registry import registry
+
+WROTE = "wrote"
+PRIMARY_ONLY = "primary_only"
+
+replica_reads_var: ContextVar[bool] = ContextVar("replica_reads", default=False)
+routed_statements_total = registry.counter("db_routed_statements_total", "Statements routed by target pool.")
+
+ReturnType = TypeVar("ReturnType")
+
+
+@contextmanager
+def replica_reads() -> Iterator[None]:
+    """Allow plain SELECTs issued inside the block to be served by a replica."""
+    token = replica_reads_var.set(True)
+    try:
+        yield
+    finally:
+        replica_reads_var.reset(token)
+
+
+def read_only(method: Callable[..., Awaitable[ReturnType]]) -> Callable[..., Awaitable[ReturnType]]:
+    """Mark service method which tolerates replica lag, its reads may go to a replica."""
+
+    @functools.wraps(method)
+    async def wrapper(*args: Any, **kwargs: Any) -> ReturnType:
+        with replica_reads():
+            return await method(*args, **kwargs)
+
+    return wrapper
+
+
+class ReplicaSet:
+    """Replica engines picked round robin, unhealthy replicas are out of rotation until next check passes."""
+
+    def __init__(self, engines: Sequence[AsyncEngine], check_interval: float = 5.0, check_timeout: float = 2.0):
+        """Initialize replica set, replicas are trusted until first check."""
+        self.engines = tuple(engines)
+        self.check_interval = check_interval
+        self.check_timeout = check_timeout
+        self._healthy: dict[AsyncEngine, bool] = {engine: True for engine in self.engines}
+        self._rotation = itertools.cycle(self.engines)
+        self._stopping = asyncio.Event()
+        self._task: asyncio.Task | None = None
+        for engine in self.engines:
+            event.listen(engine.sync_engine, "handle_error", functools.partial(self._on_error, engine))
+            registry.gauge(
+                "db_replica_healthy",
+                "Replica is in rotation.",
+                lambda e=engine: float(self._healthy[e]),
+                replica=self.name(engine),
+            )
+
+    @staticmethod
+    def name(engine: AsyncEngine) -> str:
+        """Get replica label without credentials."""
+        return f"{engine.url.host}:{engine.url.port or 5432}/{engine.url.database}"
+
+    def _on_error(self, engine: AsyncEngine, context: Any) -> None:
+        """Take replica out of rotation as soon as a connection to it is lost."""
+        if context.is_disconnect:
+            self.mark(engine, False)
+
+    def mark(self, engine: AsyncEngine, healthy: bool) -> None:
+        """Set replica health, log transitions."""
+        if self._healthy[engine] != healthy:
+            self._healthy[engine] = healthy
+            state = "back in rotation" if healthy else "removed from rotation"
+            log = logger.info if healthy else logger.warning
+            log(f"Replica {self.name(engine)} {state}")
+
+    def choose(self) -> AsyncEngine | None:
+        """Get next healthy replica, None when all are down."""
+        for _ in range(len(self.engines)):
+            engine = next(self._rotation)
+            if self._healthy[engine]:
+                return engine
+        return None
+
+    async def _check(self, engine: AsyncEngine) -> None:
+        """Probe replica with a trivial query."""
+        try:
+            async with engine.connect() as connection:
+                await asyncio.wait_for(connection.execute(text("SELECT 1")), timeout=self.check_timeout)
+        except Exception as exc:
+            if self._healthy[engine]:
+                logger.warning(f"Replica {self.name(engine)} health check failed: {exc!r}")
+            self.mark(engine, False)
+        else:
+            self.mark(engine, True)
+
+    async def check(self) -> None:
+        """Probe all replicas concurrently."""
+        await asyncio.gather(*(self._check(engine) for engine in self.engines))
+
+    async def run(self) -> None:
+        """Probe replicas every `check_interval` seconds until stopped."""
+        while not self._stopping.is_set():
+            await self.check()
+            try:
+                await asyncio.wait_for(self._stopping.wait(), timeout=self.check_interval)
+            except asyncio.TimeoutError:
+                pass
+
+    def start(self) -> asyncio.Task:
+        """Run health checks in background task."""
+        if self._task is None:
+            self._stopping.clear()
+            self._task = asyncio.create_task(self.run())
+        return self._task
+
+    async def stop(self) -> None:
+        """Stop health checks."""
+        self._stopping.set()
+        if self._task is not None:
+            await self._task
+            self._task = None
+
+
+class RoutingSession(Session):
+    """Session sending plain SELECTs of read only blocks to replicas and everything else to primary.
+
+    After the first write the session sticks to primary, so a request reads its own writes.
+    """
+
+    def __init__(self, primary: AsyncEngine, replicas: ReplicaSet, bind: Any = None, **kwargs: Any) -> None:
+        """Initialize session bound to primary, `bind` passed by AsyncSession is ignored."""
+        super().__init__(bind=primary.sync_engine, **kwargs)
+        self.primary = primary
+        self.replicas = replicas
+
+    def get_bind(self, mapper: Any = None, clause: Any = None, **kwargs: Any) -> Engine:
+        """Choose engine of statement."""
+        if (
+                replica_reads_var.get()
+                and not self._flushing
+                and not self.info.get(WROTE)
+                and not self.info.get(PRIMARY_ONLY)
+                and isinstance(clause, Select)
+                and clause._for_update_arg is None
+        ):
+            replica = self.replicas.choose()
+            if replica is not None:
+                routed_statements_total.inc(target="replica")
+                return replica.sync_engine
+        if self._flushing or (clause is not None and not isinstance(clause, Select)):
+            self.info[WROTE] = True
+        routed_statements_total.inc(target="primary")
+        return self.primary.sync_engine
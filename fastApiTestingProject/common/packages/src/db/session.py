@@ -1,26 +1,42 @@
 """Module with session setup and its context manager."""
 from contextlib import asynccontextmanager
-from typing import AsyncGenerator
+from typing import AsyncGenerator, Sequence
 
-from sqlalchemy.ext.asyncio import async_sessionmaker
+from sqlalchemy.ext.asyncio import AsyncSession
 
+from common.packages.src.cache.base import run_pending_invalidations
 from common.packages.src.conf.settings import settings
-from common.packages.src.db.engine import get_engine
+from common.packages.src.db.consistency import write_marker_var
+from common.packages.src.db.engine import engines
+from common.packages.src.db.routing import PRIMARY_ONLY, WROTE
 
 
 @asynccontextmanager
 async def get_async_session(
-        db_connection_string: str = settings.postgres.db_uri,
-        echo: bool = settings.postgres.echo
+        db_connection_string: str | None = None,
+        echo: bool | None = None,
+        replica_uris: Sequence[str] | None = None,
 ) -> AsyncGenerator:
-    """Session context manager, catches all errors."""
+    """Session context manager, catches all errors.
+
+    Cache keys written in the session are invalidated once it commits.
+    Arguments default to postgres settings. With `replica_uris` the session
+    reads from replicas inside read only service methods.
+    """
+    if db_connection_string is None:
+        db_connection_string = settings.postgres.db_uri
+    if echo is None:
+        echo = settings.postgres.echo
+    if replica_uris is None:
+        replica_uris = settings.postgres.replica_uris
     if not db_connection_string:
         raise TypeError("DBSession: No connection string set")
 
-    async_sql_session = async_sessionmaker(
-        bind=get_engine(db_connection_string, echo), expire_on_commit=False
-    )
-    async_db_session = async_sql_session()
+    if replica_uris:
+        session_factory = engines.get_routing_session_factory(db_connection_string, replica_uris, echo)
+    else:
+        session_factory = engines.get_session_factory(db_connection_string, echo)
+    async_db_session = session_factory()
 
     try:
         yield async_db_session
@@ -28,5 +44,26 @@ async def get_async_session(
     except Exception:
         await async_db_session.rollback()
         raise
+    else:
+        await run_pending_invalidations(async_db_session.info)
     finally:
-        await async_db_session.close()
\ No newline at end of file
+        await async_db_session.close()
+
+
+async def get_session() -> AsyncGenerator[AsyncSession, None]:
+    """Session dependency which reuses the shared engine pool.
+
+    Clients which wrote within the sticky window read from primary, so they
+    see their own writes even if replicas lag. The write marker is carried
+    by `ReadYourWritesMiddleware`.
+
+    Just use:
+    session: Annotated[AsyncSession, Depends(get_session)]
+    """
+    marker = write_marker_var.get()
+    async with get_async_session() as session:
+        if marker is not None and marker.is_sticky(settings.postgres.replica_sticky_window):
+            session.info[PRIMARY_ONLY] = True
+        yield session
+    if marker is not None and session.info.get(WROTE):
+        marker.wrote = True
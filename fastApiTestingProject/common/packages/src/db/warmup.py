@@ -0,0 +1,45 @@
+"""Module with database warm up run before the app takes traffic."""
+import asyncio
+from typing import Awaitable, Callable
+
+from loguru import logger
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker
+from sqlalchemy.orm import configure_mappers
+
+from common.packages.src.conf.settings import PostgresSettings
+from common.packages.src.db.engine import pool_limits
+from common.packages.src.db.models import dao_models
+
+
+def configure_models() -> None:
+    """Configure mappers of all models up front instead of on the first query."""
+    configure_mappers()
+    logger.info(f"Configured mappers of {len(dao_models)} models")
+
+
+async def warm_up_connections(
+        session_factory: async_sessionmaker[AsyncSession],
+        connections: int,
+        prime: Callable[[AsyncSession], Awaitable[None]],
+) -> None:
+    """Open `connections` pooled connections at once and run `prime` on each, so its statements are prepared there.
+
+    Connections are held concurrently, so each session gets its own one. Changes are rolled back.
+    """
+
+    async def warm_up_connection() -> None:
+        async with session_factory() as session:
+            await session.connection()
+            await prime(session)
+            await session.rollback()
+
+    await asyncio.gather(*(warm_up_connection() for _ in range(connections)))
+    logger.info(f"Warmed up {connections} database connections")
+
+
+def pool_exhausted(engine: AsyncEngine, config: PostgresSettings | None = None) -> bool:
+    """Check if every connection the pool may open is checked out, so new requests would wait for one."""
+    pool = engine.sync_engine.pool
+    if not hasattr(pool, "checkedout"):
+        return False
+    return pool.checkedout() >= sum(pool_limits(config))
@@ -0,0 +1,113 @@
+"""Module with conditional request dependencies and validators."""
+import hashlib
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Iterable
+from uuid import UUID
+
+from fastapi import Header, Response, status
+
+from common.packages.src.core.exceptions.base import DomainException
+from common.packages.src.core.exceptions.error_code import DomainErrorCodeEnum
+
+VERSION_FIELDS = ("uuid", "updated_at")
+
+
+def _as_utc(value: datetime) -> datetime:
+    """Treat naive database timestamps as UTC."""
+    return value.replace(tzinfo=timezone.utc) if value.tzinfo is None else value.astimezone(timezone.utc)
+
+
+def _parse_http_date(value: str | None) -> datetime | None:
+    """Parse HTTP date, invalid dates are ignored as RFC 9110 requires."""
+    if not value:
+        return None
+    try:
+        return _as_utc(parsedate_to_datetime(value))
+    except (TypeError, ValueError):
+        return None
+
+
+def http_date(value: datetime) -> str:
+    """Format datetime as HTTP date."""
+    return format_datetime(_as_utc(value), usegmt=True)
+
+
+def entity_etag(version: int) -> str:
+    """Get strong ETag of entity version counter, If-Match is mapped back to it by `Preconditions`."""
+    return f'"{version}"'
+
+
+def collection_etag(versions: Iterable[tuple[UUID | str, datetime]], *parts: str | None) -> str:
+    """Get strong ETag of a page from uuid and modification time of its items and extra page `parts`."""
+    hasher = hashlib.blake2b(digest_size=12)
+    for uuid, updated_at in versions:
+        hasher.update(f"{uuid}:{updated_at.isoformat()};".encode())
+    for part in parts:
+        hasher.update(f"|{part or ''}".encode())
+    return f'"{hasher.hexdigest()}"'
+
+
+def validators(etag: str, last_modified: datetime | None = None) -> dict[str, str]:
+    """Get validator headers of a representation, clients have to revalidate user scoped data."""
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if last_modified is not None:
+        headers["Last-Modified"] = http_date(last_modified)
+    return headers
+
+
+def not_modified(headers: dict[str, str]) -> Response:
+    """Get empty 304 response carrying validators."""
+    return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+
+class Preconditions:
+    """Conditional request headers which may be used as a dependency.
+
+    Just use:
+    preconditions: Annotated[Preconditions, Depends(Preconditions)]
+    """
+
+    def __init__(
+            self,
+            if_none_match: str | None = Header(None),
+            if_modified_since: str | None = Header(None),
+            if_match: str | None = Header(None),
+    ):
+        """Initialize conditional headers."""
+        self.if_none_match = if_none_match
+        self.if_modified_since = _parse_http_date(if_modified_since)
+        self.if_match = if_match
+
+    @property
+    def expected_version(self) -> int | None:
+        """Get entity version required by If-Match, None when any version is accepted.
+
+        Only a single strong ETag made by `entity_etag` is understood, anything
+        else fails the precondition as it can not match a current version.
+        """
+        if self.if_match is None or self.if_match.strip() == "*":
+            return None
+        tag = self.if_match.strip()
+        if len(tag) > 2 and tag[0] == tag[-1] == '"' and tag[1:-1].isdigit():
+            return int(tag[1:-1])
+        raise DomainException(
+            status_code=status.HTTP_412_PRECONDITION_FAILED,
+            detail="If-Match has to be a single ETag of the resource",
+            error_code=DomainErrorCodeEnum.INVALID_PRECONDITION.value,
+        )
+
+    @property
+    def is_conditional(self) -> bool:
+        """Check if any precondition is sent."""
+        return self.if_none_match is not None or self.if_modified_since is not None
+
+    def not_modified(self, etag: str, last_modified: datetime | None = None) -> bool:
+        """Evaluate preconditions, If-Modified-Since is ignored when If-None-Match is sent."""
+        if self.if_none_match is not None:
+            if self.if_none_match.strip() == "*":
+                return True
+            return etag in {tag.strip().removeprefix("W/") for tag in self.if_none_match.split(",")}
+        if self.if_modified_since is not None and last_modified is not None:
+            return _as_utc(last_modified).replace(microsecond=0) <= self.if_modified_since
+        return False
@@ -0,0 +1,30 @@
+"""Module with Prefer request header dependency."""
+from fastapi import Header
+
+RESPOND_ASYNC = "respond-async"
+
+
+class Preferences:
+    """Preferences of Prefer request header (RFC 7240) which may be used as a dependency.
+
+    Just use:
+    preferences: Annotated[Preferences, Depends(Preferences)]
+    """
+
+    def __init__(self, prefer: str | None = Header(None)):
+        """Parse preference names and values, parameters of preferences are ignored."""
+        self.preferences: dict[str, str] = {}
+        for preference in (prefer or "").split(","):
+            name, _, value = preference.split(";", 1)[0].partition("=")
+            if name.strip():
+                self.preferences.setdefault(name.strip().lower(), value.strip().strip('"'))
+
+    @property
+    def respond_async(self) -> bool:
+        """Check if client accepts 202 for a request processed in background."""
+        return RESPOND_ASYNC in self.preferences
+
+    @staticmethod
+    def applied(*names: str) -> dict[str, str]:
+        """Get headers of honoured preferences."""
+        return {"Preference-Applied": ", ".join(names)}
@@ -1,4 +1,10 @@
 """Module with common query dependencies."""
+from fastapi import Query
+
+from common.packages.src.repositories.mixins.search_mixin import SearchMode
+
+MAX_PAGE_SIZE = 1000
+MAX_SEARCH_PAGE_SIZE = 100
 
 
 class CommonQueryParams:
@@ -20,9 +26,46 @@ class Pagination:
 
     Just use:
     pages: Annotated[Pagination, Depends(Pagination)]
+
+    Offset pagination uses `offset`, keyset pagination uses `cursor`
+    returned by the previous page (first page is requested without it).
     """
 
-    def __init__(self, offset: int = 0, limit: int = 50):
+    def __init__(
+            self,
+            offset: int = Query(0, ge=0),
+            limit: int = Query(50, ge=1, le=MAX_PAGE_SIZE),
+            cursor: str | None = None,
+            order_by: str = "created_at",
+            descending: bool = False,
+    ):
         """Initialize common params."""
         self.offset = offset
         self.limit = limit
+        self.cursor = cursor
+        self.order_by = order_by
+        self.descending = descending
+
+
+class SearchParams:
+    """Search query param class which may be used as a dependency.
+
+    Just use:
+    search: Annotated[SearchParams, Depends(SearchParams)]
+
+    Results are ranked by relevance and paged by `cursor`
+    returned with the previous page.
+    """
+
+    def __init__(
+            self,
+            q: str = Query(..., min_length=1, max_length=200),
+            mode: SearchMode = SearchMode.FULL_TEXT,
+            limit: int = Query(20, ge=1, le=MAX_SEARCH_PAGE_SIZE),
+            cursor: str | None = None,
+    ):
+        """Initialize search params."""
+        self.q = q.strip()
+        self.mode = mode
+        self.limit = limit
+        self.cursor = cursor
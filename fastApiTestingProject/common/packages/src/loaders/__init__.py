@@ -0,0 +1,2 @@
+from common.packages.src.loaders.dataloader import DataLoader
+from common.packages.src.loaders.repository import repository_loader
@@ -0,0 +1,84 @@
+"""Module with request scoped batching loader."""
+import asyncio
+from typing import Any, Awaitable, Callable, Generic, Hashable, Iterable, Mapping, TypeVar
+
+KeyType = TypeVar("KeyType", bound=Hashable)
+ValueType = TypeVar("ValueType")
+
+
+class DataLoader(Generic[KeyType, ValueType]):
+    """Coalesce loads requested during one event loop iteration into a single batch call.
+
+    Every key is loaded at most once per loader instance, so a loader
+    must live no longer than one request.
+    """
+
+    def __init__(
+            self,
+            batch_load: Callable[[list[KeyType]], Awaitable[Mapping[KeyType, ValueType]]],
+            max_batch_size: int = 1000,
+            lock: asyncio.Lock | None = None,
+    ) -> None:
+        """Initialize loader.
+
+        `lock` serializes batch calls of loaders sharing one database session.
+        """
+        self._batch_load = batch_load
+        self._max_batch_size = max_batch_size
+        self._lock = lock or asyncio.Lock()
+        self._futures: dict[KeyType, asyncio.Future] = {}
+        self._queue: list[KeyType] = []
+        self._tasks: set[asyncio.Task] = set()
+        self.batches = 0
+
+    def load(self, key: KeyType) -> Awaitable[ValueType | None]:
+        """Schedule key loading, result is None if batch returned nothing for key."""
+        future = self._futures.get(key)
+        if future is None:
+            loop = asyncio.get_running_loop()
+            future = self._futures[key] = loop.create_future()
+            self._queue.append(key)
+            if len(self._queue) == 1:
+                loop.call_soon(self._dispatch)
+        return future
+
+    async def load_many(self, keys: Iterable[KeyType]) -> list[ValueType | None]:
+        """Load several keys within one batch."""
+        return list(await asyncio.gather(*(self.load(key) for key in keys)))
+
+    def prime(self, key: KeyType, value: ValueType) -> None:
+        """Put already known value into loader memo."""
+        if key not in self._futures:
+            future = self._futures[key] = asyncio.get_running_loop().create_future()
+            future.set_result(value)
+
+    def clear(self, key: KeyType) -> None:
+        """Forget memoized value, e.g. after the object was updated."""
+        future = self._futures.get(key)
+        if future is not None and future.done():
+            del self._futures[key]
+
+    def _dispatch(self) -> None:
+        """Start batch calls for queued keys."""
+        keys, self._queue = self._queue, []
+        for start in range(0, len(keys), self._max_batch_size):
+            task = asyncio.ensure_future(self._load_batch(keys[start:start + self._max_batch_size]))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _load_batch(self, keys: list[KeyType]) -> None:
+        """Resolve futures of keys with one batch call."""
+        try:
+            async with self._lock:
+                self.batches += 1
+                values: Mapping[Any, ValueType] = await self._batch_load(keys)
+        except Exception as exc:
+            for key in keys:
+                future = self._futures.pop(key, None)
+                if future is not None and not future.done():
+                    future.set_exception(exc)
+            return
+        for key in keys:
+            future = self._futures.get(key)
+            if future is not None and not future.done():
+                future.set_result(values.get(key))
@@ -0,0 +1,22 @@
+"""Module with repository backed loaders."""
+import asyncio
+import uuid
+from typing import Any, Mapping
+
+from common.packages.src.loaders.dataloader import DataLoader
+from common.packages.src.repositories.base import BaseRepository
+from common.packages.src.repositories.loading import LoadStrategy
+
+
+def repository_loader(
+        repository: BaseRepository,
+        load: Mapping[str, LoadStrategy | str] | None = None,
+        lock: asyncio.Lock | None = None,
+) -> DataLoader[uuid.UUID, Any]:
+    """Create loader resolving objects by uuid with one `IN (...)` query per batch."""
+
+    async def batch_load(pks: list[uuid.UUID]) -> dict[uuid.UUID, Any]:
+        objs = await repository.bulk_retrieve(pks, load=load)
+        return {obj.uuid: obj for obj in objs}
+
+    return DataLoader(batch_load, lock=lock)
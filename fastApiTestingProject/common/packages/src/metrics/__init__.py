@@ -0,0 +1,2 @@
+from common.packages.src.metrics.context import RequestStats, request_id_var, request_stats_var
+from common.packages.src.metrics.registry import Counter, Gauge, Histogram, MetricsRegistry, registry
@@ -0,0 +1,13 @@
+"""Module exposing cache counters as metrics."""
+from common.packages.src.cache.base import CacheStats
+from common.packages.src.metrics.registry import registry
+
+CACHE_COUNTERS = ("hits", "misses", "evictions", "invalidations", "coalesced")
+
+
+def register_cache_metrics(cache_name: str, stats: CacheStats) -> None:
+    """Expose cache stats counters, read on every scrape."""
+    for counter in CACHE_COUNTERS:
+        registry.gauge(
+            f"cache_{counter}", f"Cache {counter} since process start.", lambda c=counter: getattr(stats, c), cache=cache_name
+        )
@@ -0,0 +1,15 @@
+"""Module with request scoped metrics context."""
+from contextvars import ContextVar
+from dataclasses import dataclass
+
+
+@dataclass
+class RequestStats:
+    """Database usage of a single request."""
+
+    queries: int = 0
+    db_time: float = 0.0
+
+
+request_id_var: ContextVar[str | None] = ContextVar("request_id", default=None)
+request_stats_var: ContextVar[RequestStats | None] = ContextVar("request_stats", default=None)
@@ -0,0 +1,72 @@
+"""Module with SQLAlchemy engine instrumentation."""
+import re
+import time
+from functools import lru_cache
+from typing import Any
+
+from loguru import logger
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from common.packages.src.metrics.context import request_id_var, request_stats_var
+from common.packages.src.metrics.registry import registry
+
+query_duration = registry.histogram("db_query_duration_seconds", "Database statement latency by normalized SQL.")
+queries_total = registry.counter("db_queries_total", "Executed database statements.")
+slow_queries_total = registry.counter("db_slow_queries_total", "Statements slower than the configured threshold.")
+compiled_cache_total = registry.counter("db_compiled_cache_total", "Statements by compiled query cache outcome.")
+
+_WHITESPACE = re.compile(r"\s+")
+_LITERALS = re.compile(r"'(?:[^']|'')*'|\$\d+|%\(\w+\)s|\b\d+(?:\.\d+)?\b")
+# placeholder optionally cast the way asyncpg renders parameters, e.g. ?::UUID or ?::TIMESTAMP WITHOUT TIME ZONE
+_PARAMETER = r"\?(?:::\w+(?: \w+)*(?:\([^()]*\))?(?:\[\])?)?"
+_VALUE_LISTS = re.compile(rf"\((?:\s*{_PARAMETER}\s*,)+\s*{_PARAMETER}\s*\)")
+_REPEATED_ROWS = re.compile(r"\(\.\.\.\)(?:\s*,\s*\(\.\.\.\))+")
+
+
+@lru_cache(maxsize=4096)
+def normalize_sql(statement: str) -> str:
+    """Replace parameters and literals with placeholders and collapse IN/VALUES lists."""
+    statement = _WHITESPACE.sub(" ", statement).strip()
+    statement = _LITERALS.sub("?", statement)
+    statement = _VALUE_LISTS.sub("(...)", statement)
+    return _REPEATED_ROWS.sub("(...)", statement)
+
+
+def instrument_engine(engine: AsyncEngine, slow_query_threshold: float) -> None:
+    """Record latency of every statement, count it for current request and log slow ones.
+
+    `slow_query_threshold` is in seconds, zero or negative disables the slow query log.
+    """
+
+    @event.listens_for(engine.sync_engine, "before_cursor_execute")
+    def before_cursor_execute(conn: Any, cursor: Any, statement: str, *args: Any) -> None:
+        conn.info.setdefault("query_started_at", []).append(time.perf_counter())
+
+    @event.listens_for(engine.sync_engine, "handle_error")
+    def handle_error(context: Any) -> None:
+        started_at = context.connection.info.get("query_started_at") if context.connection is not None else None
+        if started_at:
+            started_at.pop()
+
+    @event.listens_for(engine.sync_engine, "after_cursor_execute")
+    def after_cursor_execute(
+            conn: Any, cursor: Any, statement: str, parameters: Any, context: Any, *args: Any
+    ) -> None:
+        duration = time.perf_counter() - conn.info["query_started_at"].pop()
+        normalized = normalize_sql(statement)
+        query_duration.observe(duration, statement=normalized)
+        queries_total.inc()
+        if context is not None:
+            compiled_cache_total.inc(result=context.cache_hit.name.lower())
+
+        stats = request_stats_var.get()
+        if stats is not None:
+            stats.queries += 1
+            stats.db_time += duration
+
+        if 0 < slow_query_threshold <= duration:
+            slow_queries_total.inc()
+            logger.warning(
+                f"Slow query {duration * 1000:.1f}ms request_id={request_id_var.get()}: {normalized}"
+            )
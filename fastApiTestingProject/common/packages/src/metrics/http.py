@@ -0,0 +1,66 @@
+"""Module with HTTP request metrics middleware."""
+import re
+import time
+import uuid
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from common.packages.src.metrics.context import RequestStats, request_id_var, request_stats_var
+from common.packages.src.metrics.registry import registry
+
+REQUEST_ID_HEADER = "X-Request-ID"
+QUERY_COUNT_HEADER = "X-DB-Query-Count"
+REQUEST_ID_PATTERN = re.compile(r"[A-Za-z0-9._:-]{1,128}")
+
+request_duration = registry.histogram("http_request_duration_seconds", "HTTP request latency by route.")
+request_queries = registry.histogram(
+    "http_request_db_queries", "Database statements per HTTP request by route.", buckets=(0, 1, 2, 3, 5, 10, 20, 50, 100)
+)
+requests_total = registry.counter("http_requests_total", "Handled HTTP requests.")
+
+
+class RequestMetricsMiddleware:
+    """Assign request id and count database statements issued while handling request.
+
+    Request id sent by client is kept only if it is a short token, it ends up in logs and response headers.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        """Wrap ASGI app."""
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """Handle request."""
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request_id = Headers(scope=scope).get(REQUEST_ID_HEADER)
+        if request_id is None or not REQUEST_ID_PATTERN.fullmatch(request_id):
+            request_id = uuid.uuid4().hex
+        stats = RequestStats()
+        request_id_token = request_id_var.set(request_id)
+        stats_token = request_stats_var.set(stats)
+        status_code = 500
+
+        async def send_with_headers(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                response_headers = MutableHeaders(scope=message)
+                response_headers.append(REQUEST_ID_HEADER, request_id)
+                response_headers.append(QUERY_COUNT_HEADER, str(stats.queries))
+            await send(message)
+
+        started_at = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_headers)
+        finally:
+            route = scope.get("route")
+            labels = {"method": scope["method"], "route": getattr(route, "path", "unmatched")}
+            request_duration.observe(time.perf_counter() - started_at, **labels)
+            request_queries.observe(stats.queries, **labels)
+            requests_total.inc(status=str(status_code), **labels)
+            request_id_var.reset(request_id_token)
+            request_stats_var.reset(stats_token)
@@ -0,0 +1,73 @@
+"""Module with metrics of worker processes merged into one scrape.
+
+Workers sharing a listening socket do not share memory, a scrape is served
+by whichever of them accepts it. Every worker writes a snapshot of its
+registry into a file of its own in the metrics directory, a scrape served by
+any worker merges snapshots of all of them. Counters and histograms are
+summed, also the ones of workers which are gone, gauges get a `pid` label
+and are reported for live workers only.
+"""
+import asyncio
+import os
+from pathlib import Path
+
+import orjson
+from loguru import logger
+
+from common.packages.src.metrics.registry import MetricsRegistry
+
+SNAPSHOT_SUFFIX = ".json"
+
+
+def _is_alive(pid: int) -> bool:
+    """Check if process is running."""
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def clear_snapshots(directory: str | Path) -> None:
+    """Create metrics directory or remove snapshots of a previous run from it."""
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    for path in directory.glob(f"*{SNAPSHOT_SUFFIX}"):
+        path.unlink(missing_ok=True)
+
+
+def write_snapshot(directory: str | Path, registry: MetricsRegistry) -> None:
+    """Replace snapshot of this process with current values of registry."""
+    path = Path(directory) / f"{os.getpid()}{SNAPSHOT_SUFFIX}"
+    staging = path.with_suffix(".tmp")
+    staging.write_bytes(orjson.dumps(registry.snapshot()))
+    staging.replace(path)
+
+
+def render_merged(directory: str | Path, registry: MetricsRegistry) -> str:
+    """Render metrics of all workers, values of this process are current, others are as of their last snapshot."""
+    write_snapshot(directory, registry)
+    merged = MetricsRegistry()
+    for path in sorted(Path(directory).glob(f"*{SNAPSHOT_SUFFIX}")):
+        try:
+            pid = int(path.stem)
+            snapshot = orjson.loads(path.read_bytes())
+        except (OSError, ValueError) as exc:
+            logger.warning(f"Skipped unreadable metrics snapshot {path}: {exc!r}")
+            continue
+        if not _is_alive(pid):
+            snapshot = {name: data for name, data in snapshot.items() if data["type"] != "gauge"}
+        merged.merge(snapshot, pid=str(pid))
+    return merged.render()
+
+
+async def run_snapshots(directory: str | Path, registry: MetricsRegistry, interval: float) -> None:
+    """Write snapshot every `interval` seconds until cancelled, and once more then."""
+    try:
+        while True:
+            await asyncio.sleep(interval)
+            await asyncio.to_thread(write_snapshot, directory, registry)
+    finally:
+        write_snapshot(directory, registry)
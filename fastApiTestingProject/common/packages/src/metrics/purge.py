@@ -0,0 +1,9 @@
+"""Module with purge worker metrics."""
+from common.packages.src.metrics.registry import registry
+
+purged_rows_total = registry.counter("purge_rows_total", "Soft deleted rows removed from hot tables.")
+purge_batches_total = registry.counter("purge_batches_total", "Committed purge batches.")
+purge_batch_duration = registry.histogram("purge_batch_duration_seconds", "Purge batch statement latency.")
+purge_throttled_seconds_total = registry.counter(
+    "purge_throttled_seconds_total", "Time purge worker paused for rate limit or replication lag."
+)
@@ -0,0 +1,211 @@
+"""Module with minimal Prometheus compatible metrics registry."""
+import math
+from typing import Any, Callable, Iterable
+
+LabelValues = tuple[tuple[str, str], ...]
+Samples = list[list[Any]]
+
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def _format_labels(labels: LabelValues, extra: str = "") -> str:
+    """Render label set in exposition format."""
+    pairs = [f'{name}="{value}"' for name, value in labels]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _escape(value: str) -> str:
+    """Escape label value."""
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(labels: dict[str, str]) -> LabelValues:
+    """Normalize labels to hashable sorted tuple."""
+    return tuple(sorted((name, _escape(str(value))) for name, value in labels.items()))
+
+
+def _loaded_labels(labels: Iterable[Iterable[str]], **extra: str) -> LabelValues:
+    """Get label set of snapshot sample, `extra` labels are added to it."""
+    return tuple(sorted((*(tuple(pair) for pair in labels), *_labels(extra))))
+
+
+class Counter:
+    """Monotonic counter."""
+
+    type = "counter"
+
+    def __init__(self, name: str, documentation: str) -> None:
+        """Initialize counter."""
+        self.name = name
+        self.documentation = documentation
+        self._values: dict[LabelValues, float] = {}
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        """Increase counter."""
+        key = _labels(labels)
+        self._values[key] = self._values.get(key, 0.0) + amount
+
+    def snapshot(self) -> Samples:
+        """Get values by label set."""
+        return [[labels, value] for labels, value in self._values.items()]
+
+    def merge(self, samples: Samples) -> None:
+        """Add values of snapshot."""
+        for labels, value in samples:
+            key = _loaded_labels(labels)
+            self._values[key] = self._values.get(key, 0.0) + value
+
+    def samples(self) -> Iterable[str]:
+        """Render samples."""
+        for labels, value in self._values.items():
+            yield f"{self.name}{_format_labels(labels)} {value}"
+
+
+class Gauge:
+    """Gauge which reads its value from callback on every scrape."""
+
+    type = "gauge"
+
+    def __init__(
+            self, name: str, documentation: str, callback: Callable[[], float] | None = None, **labels: str
+    ) -> None:
+        """Initialize gauge, without callback it has no series yet."""
+        self.name = name
+        self.documentation = documentation
+        self._callbacks: dict[LabelValues, Callable[[], float]] = {}
+        if callback is not None:
+            self.add(callback, **labels)
+
+    def add(self, callback: Callable[[], float], **labels: str) -> None:
+        """Add labeled series."""
+        self._callbacks[_labels(labels)] = callback
+
+    def snapshot(self) -> Samples:
+        """Get current values by label set."""
+        return [[labels, callback()] for labels, callback in self._callbacks.items()]
+
+    def merge(self, samples: Samples, **labels: str) -> None:
+        """Add series of snapshot, values of different processes are not summed, `labels` tell them apart."""
+        for sample_labels, value in samples:
+            self._callbacks[_loaded_labels(sample_labels, **labels)] = lambda value=value: value
+
+    def samples(self) -> Iterable[str]:
+        """Render samples."""
+        for labels, callback in self._callbacks.items():
+            yield f"{self.name}{_format_labels(labels)} {callback()}"
+
+
+class Histogram:
+    """Cumulative histogram with fixed buckets."""
+
+    type = "histogram"
+
+    def __init__(self, name: str, documentation: str, buckets: tuple[float, ...] = DEFAULT_BUCKETS) -> None:
+        """Initialize histogram."""
+        self.name = name
+        self.documentation = documentation
+        self.buckets = tuple(sorted(buckets)) + (math.inf,)
+        self._series: dict[LabelValues, list] = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        """Record observation."""
+        key = _labels(labels)
+        series = self._series.get(key)
+        if series is None:
+            series = self._series[key] = [[0] * len(self.buckets), 0.0, 0]
+        for index, bound in enumerate(self.buckets):
+            if value <= bound:
+                series[0][index] += 1
+                break
+        series[1] += value
+        series[2] += 1
+
+    def snapshot(self) -> Samples:
+        """Get bucket counts, sum and count by label set."""
+        return [[labels, counts, total, count] for labels, (counts, total, count) in self._series.items()]
+
+    def merge(self, samples: Samples) -> None:
+        """Add observations of snapshot."""
+        for labels, counts, total, count in samples:
+            series = self._series.setdefault(_loaded_labels(labels), [[0] * len(self.buckets), 0.0, 0])
+            series[0] = [current + added for current, added in zip(series[0], counts)]
+            series[1] += total
+            series[2] += count
+
+    def samples(self) -> Iterable[str]:
+        """Render samples."""
+        for labels, (counts, total, count) in self._series.items():
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets, counts):
+                cumulative += bucket_count
+                le = "+Inf" if bound == math.inf else repr(bound)
+                bucket_labels = _format_labels(labels, f'le="{le}"')
+                yield f"{self.name}_bucket{bucket_labels} {cumulative}"
+            yield f"{self.name}_sum{_format_labels(labels)} {total}"
+            yield f"{self.name}_count{_format_labels(labels)} {count}"
+
+
+class MetricsRegistry:
+    """Collection of metrics rendered together."""
+
+    def __init__(self) -> None:
+        """Initialize registry."""
+        self._metrics: dict[str, Counter | Gauge | Histogram] = {}
+
+    def register(self, metric: Counter | Gauge | Histogram) -> Counter | Gauge | Histogram:
+        """Register metric, return already registered one with the same name."""
+        return self._metrics.setdefault(metric.name, metric)
+
+    def counter(self, name: str, documentation: str) -> Counter:
+        """Get or create counter."""
+        return self.register(Counter(name, documentation))
+
+    def histogram(self, name: str, documentation: str, buckets: tuple[float, ...] = DEFAULT_BUCKETS) -> Histogram:
+        """Get or create histogram."""
+        return self.register(Histogram(name, documentation, buckets))
+
+    def gauge(self, name: str, documentation: str, callback: Callable[[], float], **labels: str) -> Gauge:
+        """Get or create gauge and add labeled series to it."""
+        gauge = self._metrics.get(name)
+        if gauge is None:
+            return self.register(Gauge(name, documentation, callback, **labels))
+        gauge.add(callback, **labels)
+        return gauge
+
+    def snapshot(self) -> dict[str, dict]:
+        """Get current values of all metrics, a registry of another process can `merge` them."""
+        snapshot = {}
+        for metric in self._metrics.values():
+            snapshot[metric.name] = {
+                "type": metric.type,
+                "documentation": metric.documentation,
+                "samples": metric.snapshot(),
+            }
+            if isinstance(metric, Histogram):
+                snapshot[metric.name]["buckets"] = metric.buckets[:-1]
+        return snapshot
+
+    def merge(self, snapshot: dict[str, dict], **labels: str) -> None:
+        """Add metrics of registry snapshot, counters and histograms are summed, gauges get `labels`."""
+        for name, data in snapshot.items():
+            if data["type"] == Counter.type:
+                self.counter(name, data["documentation"]).merge(data["samples"])
+            elif data["type"] == Histogram.type:
+                self.histogram(name, data["documentation"], tuple(data["buckets"])).merge(data["samples"])
+            else:
+                gauge = self._metrics.get(name) or self.register(Gauge(name, data["documentation"]))
+                gauge.merge(data["samples"], **labels)
+
+    def render(self) -> str:
+        """Render all metrics in Prometheus text exposition format."""
+        lines = []
+        for metric in self._metrics.values():
+            lines.append(f"# HELP {metric.name} {metric.documentation}")
+            lines.append(f"# TYPE {metric.name} {metric.type}")
+            lines.extend(metric.samples())
+        return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry()
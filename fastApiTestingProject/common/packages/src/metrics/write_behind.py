@@ -0,0 +1,21 @@
+"""Module with write-behind queue metrics."""
+from common.packages.src.metrics.registry import registry
+
+write_behind_enqueued_total = registry.counter("write_behind_enqueued_total", "Writes acknowledged after logging.")
+write_behind_coalesced_total = registry.counter(
+    "write_behind_coalesced_total", "Writes merged into a pending write of the same entity."
+)
+write_behind_backpressure_total = registry.counter(
+    "write_behind_backpressure_total", "Writes which found the queue full, by outcome."
+)
+write_behind_flushed_total = registry.counter("write_behind_flushed_total", "Pending writes written to database.")
+write_behind_skipped_total = registry.counter(
+    "write_behind_skipped_total", "Pending writes of entities which were gone or not writable at flush."
+)
+write_behind_dropped_total = registry.counter("write_behind_dropped_total", "Pending writes rejected by database.")
+write_behind_flush_duration = registry.histogram(
+    "write_behind_flush_duration_seconds", "Write-behind batch transaction latency."
+)
+write_behind_log_sync_duration = registry.histogram(
+    "write_behind_log_sync_duration_seconds", "Write-behind log append and fsync latency."
+)
@@ -1,19 +1,66 @@
 """Module with base repository realization."""
 
+import functools
 import uuid
-from typing import Any, List, Sequence, TypeVar, Union
+from contextlib import suppress
+from datetime import date, datetime
+from typing import (
+    Any,
+    AsyncIterable,
+    AsyncIterator,
+    Callable,
+    Hashable,
+    Iterable,
+    List,
+    Mapping,
+    NoReturn,
+    Sequence,
+    TypeVar,
+    Union,
+)
 
-from sqlalchemy import Row, RowMapping, delete, desc, func, select, update
+from loguru import logger
+from sqlalchemy import (
+    Row,
+    RowMapping,
+    and_,
+    bindparam,
+    column,
+    delete,
+    desc,
+    false,
+    func,
+    insert,
+    select,
+    true,
+    tuple_,
+    update,
+    values,
+)
+from sqlalchemy.dialects import postgresql
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from common.packages.src.abstract.repository import IRepository
+from common.packages.src.cache.memory import LRUCache
+from common.packages.src.conf.settings import settings
 from common.packages.src.core.exceptions.base import DBException
 from common.packages.src.core.exceptions.error_code import DBErrorCodeEnum
 from common.packages.src.db.base import Base, BaseModel
+from common.packages.src.db.mixins import DeletableMixin, VersionMixin
+from common.packages.src.repositories.ingest import IngestStats, as_ingest_row, iter_chunks
+from common.packages.src.repositories.loading import LoadStrategy, loader_options
+from common.packages.src.repositories.pagination import Cursor, CursorDirection, CursorPage
 
 TableType = TypeVar("TableType", bound=Base)
 CreateBaseSchema = TypeVar("CreateBaseSchema", bound=BaseModel)
 UpdateBaseSchema = TypeVar("UpdateBaseSchema", bound=BaseModel)
+LoadMapping = Mapping[str, LoadStrategy | str]
+
+
+@functools.cache
+def _statement_cache() -> LRUCache:
+    """Build cache of statements shared by repositories, bounded as the engine cache of their compiled forms."""
+    return LRUCache(max_size=settings.postgres.query_cache_size)
 
 
 class BaseRepository(IRepository):
@@ -22,25 +69,141 @@ class BaseRepository(IRepository):
     model: TableType = None  # type: ignore
     create_scheme: CreateBaseSchema = None  # type: ignore
     update_scheme: UpdateBaseSchema = None  # type: ignore
+    ingest_chunk_size: int = 1000
 
     def __init__(self, session: AsyncSession) -> None:
         """Initialize base repository with async session."""
         self._session = session
 
-    async def create(self, input_data: create_scheme) -> model:
-        """Create model."""
-        obj = self.model(**input_data.model_dump())
-        self._session.add(obj)
-        await self._session.flush()
-        await self._session.refresh(obj)
+    @property
+    def session(self) -> AsyncSession:
+        """Get session repository works in."""
+        return self._session
+
+    async def create(self, input_data: create_scheme, refresh: bool = False) -> model:
+        """Create model in a single INSERT ... RETURNING round trip."""
+        res = await self._session.execute(
+            insert(self.model).values(**input_data.model_dump()).returning(self.model)
+        )
+        obj = res.scalars().one()
+        if refresh:
+            await self._session.refresh(obj)
         return obj
 
     async def bulk_create(self, instances_schema: List[create_scheme]) -> list[model]:
-        """Bulk crate model."""
-        instances = [self.model(**instance.model_dump()) for instance in instances_schema]
-        self._session.add_all(instances)
-        await self._session.flush()
-        return instances
+        """Bulk crate model with a single executemany INSERT ... RETURNING, objects are in order of schemas."""
+        if not instances_schema:
+            return []
+        res = await self._session.execute(
+            insert(self.model).returning(self.model, sort_by_parameter_order=True),
+            [instance.model_dump() for instance in instances_schema],
+        )
+        return list(res.scalars().all())
+
+    async def bulk_ingest(
+            self,
+            rows: Iterable[create_scheme | dict] | AsyncIterable[create_scheme | dict],
+            chunk_size: int | None = None,
+            use_copy: bool = False,
+    ) -> IngestStats:
+        """Write rows in chunks bypassing the unit of work, nothing is returned.
+
+        Rows are inserted with core executemany INSERT, or with asyncpg COPY
+        when `use_copy` is set. All rows of a chunk must have the same keys.
+        """
+        table = self.model.__table__
+        stats = IngestStats()
+        async for chunk in iter_chunks(rows, chunk_size or self.ingest_chunk_size):
+            params = [as_ingest_row(row) for row in chunk]
+            if use_copy:
+                await self._copy_records(table, params)
+            else:
+                await self._session.execute(insert(table), params)
+            stats.add_chunk(len(params))
+        logger.info(
+            f"Ingested {stats.rows} rows into {table.name} in {stats.chunks} chunks, "
+            f"{stats.rows_per_second:.0f} rows/sec"
+        )
+        return stats
+
+    async def bulk_ingest_returning(
+            self,
+            rows: Iterable[create_scheme | dict] | AsyncIterable[create_scheme | dict],
+            chunk_size: int | None = None,
+    ) -> AsyncIterator[Sequence[RowMapping]]:
+        """Write rows in chunks with executemany INSERT ... RETURNING, yield inserted rows per chunk."""
+        table = self.model.__table__
+        stmt = insert(table).returning(*table.columns)
+        stats = IngestStats()
+        async for chunk in iter_chunks(rows, chunk_size or self.ingest_chunk_size):
+            res = await self._session.execute(stmt, [as_ingest_row(row) for row in chunk])
+            inserted = res.mappings().all()
+            stats.add_chunk(len(inserted))
+            yield inserted
+        logger.info(
+            f"Ingested {stats.rows} rows into {table.name} in {stats.chunks} chunks, "
+            f"{stats.rows_per_second:.0f} rows/sec"
+        )
+
+    async def bulk_upsert(self, rows: Sequence[dict], match: Sequence[str] = ()) -> int:
+        """Insert rows, rows already present are updated instead with INSERT ... ON CONFLICT (uuid) DO UPDATE.
+
+        Present row is updated only if its `match` columns equal the ones of
+        inserted row and it is not soft deleted. Rows with the same set of
+        columns share one statement. Nothing is returned, get number of rows.
+        """
+        table = self.model.__table__
+        groups: dict[tuple, list[dict]] = {}
+        for row in rows:
+            groups.setdefault(tuple(sorted(row)), []).append(row)
+        for keys, group in groups.items():
+            stmt = postgresql.insert(table)
+            set_ = {key: stmt.excluded[key] for key in keys if key != "uuid"}
+            for col in table.columns:
+                if col.onupdate is not None and col.onupdate.is_clause_element and col.name not in set_:
+                    set_[col.name] = col.onupdate.arg
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[table.c.uuid],
+                set_=self._versioned(set_),
+                where=and_(true(), *(table.c[key] == stmt.excluded[key] for key in match), *self._scoped()),
+            )
+            await self._session.execute(stmt, group)
+        return len(rows)
+
+    async def bulk_insert_missing(self, rows: Sequence[dict]) -> int:
+        """Insert rows with INSERT ... ON CONFLICT (uuid) DO NOTHING, present rows are left as they are.
+
+        Rows with the same set of columns share one statement, get number of
+        inserted rows.
+        """
+        table = self.model.__table__
+        groups: dict[tuple, list[dict]] = {}
+        for row in rows:
+            groups.setdefault(tuple(sorted(row)), []).append(row)
+        inserted = 0
+        for group in groups.values():
+            res = await self._session.execute(
+                postgresql.insert(table).on_conflict_do_nothing(index_elements=[table.c.uuid]).returning(table.c.uuid),
+                group,
+            )
+            inserted += len(res.all())
+        return inserted
+
+    async def _copy_records(self, table: Any, params: list[dict]) -> None:
+        """Write rows with asyncpg COPY inside the current session transaction."""
+        connection = await self._session.connection()
+        raw_connection = await connection.get_raw_connection()
+        driver_connection = raw_connection.driver_connection
+        if not hasattr(driver_connection, "copy_records_to_table"):
+            await self._session.execute(insert(table), params)
+            return
+        columns = list(params[0])
+        await driver_connection.copy_records_to_table(
+            table.name,
+            records=[tuple(row[column] for column in columns) for row in params],
+            columns=columns,
+            schema_name=table.schema,
+        )
 
     @staticmethod
     def check_object(obj: model) -> Union[bool, DBException]:
@@ -53,88 +216,483 @@ class BaseRepository(IRepository):
             )
         return True
 
-    async def list(self, filters: Union[tuple, None] = None) -> Sequence[Row | RowMapping | Any]:
-        """Get list of filtered objects."""
-        query = select(self.model).order_by(self.model.created_at)
-        if filters is not None:
-            query.filter(*filters)
-        objects = await self._session.execute(query)
-        return objects.scalars().all()
+    def _scoped(self, filters: Union[tuple, None] = None, include_deleted: bool = False) -> tuple:
+        """Get filters of a read, soft deleted rows of `DeletableMixin` models are hidden unless `include_deleted`.
 
-    async def get_paginated(
-            self, limit: int, offset: int, order_by_field: str, filters: Union[tuple, None] = None
-    ) -> Sequence[Row | RowMapping | Any]:
-        """Get paginated result."""
+        Live rows are matched with `is_deleted = false`, the predicate of partial
+        indexes, `IS false` would not let the planner use them.
+        """
+        filters = tuple(filters or ())
+        if include_deleted or not issubclass(self.model, DeletableMixin):
+            return filters
+        return (*filters, self.model.is_deleted == false())
 
-        if filters is not None:
-            query = (
-                select(self.model)
-                .limit(limit)
-                .offset(offset)
-                .order_by(getattr(self.model, order_by_field, "created_at"))
-                .filter(*filters)
+    def _versioned(self, values: dict) -> dict:
+        """Add version increment to update values of `VersionMixin` models."""
+        if issubclass(self.model, VersionMixin):
+            return {**values, "version": self.model.version + 1}
+        return values
+
+    def _version_filters(self, filters: Union[tuple, None] = None, expected_version: int | None = None) -> tuple:
+        """Get filters of a conditional update, `expected_version` has to match current version of row."""
+        filters = tuple(filters or ())
+        if expected_version is None:
+            return filters
+        if not issubclass(self.model, VersionMixin):
+            raise DBException(
+                "Model has no version field.",
+                status_code=500,
+                error_code=DBErrorCodeEnum.DB_FIELD_NOT_FOUND,
             )
+        return (*filters, self.model.version == expected_version)
+
+    def _statement(self, name: str, build: Callable[[], Any], *shape: Hashable) -> Any:
+        """Get statement built once per repository class and shape, values are passed to it as bound parameters.
+
+        The same statement object keeps its memoized cache key, so repeated
+        calls skip both construction and cache key generation and always find
+        its compiled form in the engine query cache. Least recently used
+        statements are dropped once there are more than `query_cache_size`.
+        """
+        statements = _statement_cache()
+        key = (type(self), name, *shape)
+        stmt = statements.get(key)
+        if stmt is None:
+            stmt = build()
+            statements.set(key, stmt)
+        return stmt
+
+    @staticmethod
+    def _load_key(load: LoadMapping | None = None) -> frozenset | None:
+        """Get hashable shape of loading strategies."""
+        return frozenset(load.items()) if load else None
+
+    def _build_update_by_pk(self, keys: tuple[str, ...], conditional: bool) -> Any:
+        """Build UPDATE ... RETURNING of one row, primary key, `keys` values and expected version are parameters."""
+        table = self.model.__table__
+        new_values = {key: bindparam(f"value_{key}", type_=table.c[key].type) for key in keys}
+        return (
+            update(self.model)
+            .where(
+                self.model.uuid == bindparam("pk"),
+                *self._version_filters(expected_version=bindparam("expected_version") if conditional else None),
+            )
+            .values(self._versioned(new_values))
+            .returning(self.model)
+        )
+
+    async def _update_by_pk(
+            self,
+            pk: uuid.UUID,
+            new_values: dict,
+            filters: Union[tuple, None] = None,
+            expected_version: int | None = None,
+    ) -> Union[model, None]:
+        """Update row by primary key with the cached statement of its column set, None when no row matched.
+
+        Returned row is loaded through `from_statement`, so an object already in
+        the session is overwritten with it and is left untouched when no row matched.
+        """
+        keys = tuple(sorted(new_values))
+        conditional = expected_version is not None
+        stmt = self._statement("update_by_pk", lambda: self._build_update_by_pk(keys, conditional), keys, conditional)
+        if filters:
+            stmt = select(self.model).from_statement(stmt.where(*filters))
         else:
-            query = (
-                select(self.model)
-                .limit(limit)
-                .offset(offset)
-                .order_by(getattr(self.model, order_by_field, "created_at"))
+            stmt = self._statement(
+                "load_update_by_pk", lambda: select(self.model).from_statement(stmt), keys, conditional
+            )
+        params = {"pk": pk, **{f"value_{key}": new_values[key] for key in keys}}
+        if conditional:
+            params["expected_version"] = expected_version
+        res = await self._session.execute(stmt, params, execution_options={"populate_existing": True})
+        return res.scalars().first()
+
+    async def _warm_up_update(self, keys: Iterable[str], filters: Union[tuple, None] = None) -> None:
+        """Run update by primary key of `keys` against a missing row, unconditional and versioned."""
+        versions = (None, 1) if issubclass(self.model, VersionMixin) else (None,)
+        for expected_version in versions:
+            await self._update_by_pk(uuid.uuid4(), dict.fromkeys(keys), filters, expected_version)
+
+    async def warm_up(
+            self,
+            sort_fields: Sequence[str] = ("created_at",),
+            filters: Union[tuple, None] = None,
+            columns: Sequence[str] | None = None,
+            write_filters: Union[tuple, None] = None,
+    ) -> None:
+        """Run hot statements against a missing row, so they get compiled and prepared on the session connection.
+
+        `filters`, `write_filters` of updates (`filters` by default) and
+        `columns` should be shaped like the ones of real requests, their
+        statements are cached by shape. Nothing matches, but the caller
+        still rolls the session back.
+        """
+        with suppress(DBException):
+            await self.retrieve(uuid.uuid4())
+        for field in sort_fields:
+            await self.get_paginated(1, 0, field, filters=filters, columns=columns)
+        if self.update_scheme is not None:
+            table = self.model.__table__
+            fields = self.update_scheme.model_fields
+            keys = [name for name, field in fields.items() if not field.exclude and name in table.c]
+            await self._warm_up_update(keys, filters if write_filters is None else write_filters)
+
+    async def _raise_not_updated(
+            self, pk: uuid.UUID, filters: Union[tuple, None] = None, expected_version: int | None = None
+    ) -> NoReturn:
+        """Report update which matched no row as version conflict when the row still exists, otherwise not found."""
+        if expected_version is not None:
+            res = await self._session.execute(
+                select(self.model.version).where(self.model.uuid == pk, *(filters or ()))
             )
+            version = res.scalars().first()
+            if version is not None:
+                raise DBException(
+                    f"Object was modified, expected version {expected_version}, current version {version}",
+                    status_code=412,
+                    error_code=DBErrorCodeEnum.VERSION_CONFLICT.value,
+                )
+        raise DBException(
+            "Object Not Found",
+            status_code=404,
+            error_code=DBErrorCodeEnum.OBJECT_NOT_FOUND.value,
+        )
+
+    def _select(self, load: LoadMapping | None = None, columns: Sequence[str] | None = None) -> Any:
+        """Select model objects, or plain rows of `columns` which bypass the identity map."""
+        if columns:
+            table = self.model.__table__
+            return select(*(table.c[name] for name in columns))
+        return select(self.model).options(*loader_options(self.model, load))
+
+    @staticmethod
+    def _fetch_all(result: Any, columns: Sequence[str] | None = None) -> Sequence[Row | Any]:
+        """Get objects or rows of result."""
+        return result.all() if columns else result.scalars().all()
+
+    async def list(
+            self,
+            filters: Union[tuple, None] = None,
+            load: LoadMapping | None = None,
+            columns: Sequence[str] | None = None,
+            include_deleted: bool = False,
+    ) -> Sequence[Row | RowMapping | Any]:
+        """Get list of filtered objects, or rows of `columns`."""
+        query = self._select(load, columns).order_by(self.model.created_at)
+        filters = self._scoped(filters, include_deleted)
+        if filters:
+            query = query.filter(*filters)
         objects = await self._session.execute(query)
-        return objects.scalars().all()
+        return self._fetch_all(objects, columns)
+
+    async def stream(
+            self,
+            filters: Union[tuple, None] = None,
+            batch_size: int = 500,
+            load: LoadMapping | None = None,
+            columns: Sequence[str] | None = None,
+            include_deleted: bool = False,
+    ) -> AsyncIterator[Sequence[model]]:
+        """Stream filtered objects, or rows of `columns`, in batches through a server-side cursor."""
+        query = (
+            self._select(load, columns)
+            .order_by(self.model.created_at)
+            .execution_options(yield_per=batch_size)
+        )
+        filters = self._scoped(filters, include_deleted)
+        if filters:
+            query = query.filter(*filters)
+        objects = await self._session.stream(query)
+        if not columns:
+            objects = objects.scalars()
+        async for batch in objects.partitions():
+            yield batch
 
-    async def retrieve(self, pk: uuid.UUID) -> Union[model, DBException]:
-        """Get object by primary key."""
-        res = await self._session.execute(select(self.model).where(self.model.uuid == pk))
+    async def get_paginated(
+            self,
+            limit: int,
+            offset: int,
+            order_by_field: str,
+            filters: Union[tuple, None] = None,
+            load: LoadMapping | None = None,
+            columns: Sequence[str] | None = None,
+            include_deleted: bool = False,
+    ) -> Sequence[Row | RowMapping | Any]:
+        """Get paginated result, `columns` selects plain rows instead of objects."""
+        if not hasattr(self.model, order_by_field):
+            order_by_field = "created_at"
+        query = self._statement(
+            "paginated",
+            lambda: (
+                self._select(load, columns)
+                .where(*self._scoped(include_deleted=include_deleted))
+                .order_by(getattr(self.model, order_by_field))
+                .limit(bindparam("limit"))
+                .offset(bindparam("offset"))
+            ),
+            order_by_field,
+            include_deleted,
+            self._load_key(load),
+            tuple(columns or ()),
+        )
+        if filters:
+            query = query.where(*filters)
+        objects = await self._session.execute(query, {"limit": limit, "offset": offset})
+        return self._fetch_all(objects, columns)
+
+    async def get_paginated_by_cursor(
+            self,
+            limit: int,
+            order_by_field: str = "created_at",
+            cursor: str | None = None,
+            filters: Union[tuple, None] = None,
+            descending: bool = False,
+            load: LoadMapping | None = None,
+            columns: Sequence[str] | None = None,
+            include_deleted: bool = False,
+    ) -> CursorPage:
+        """Get keyset paginated result seeking on (order_by_field, uuid).
+
+        `columns` selects plain rows instead of objects, the order field
+        and uuid are added to them because cursors are built from these.
+        """
+        order_column = getattr(self.model, order_by_field, self.model.created_at)
+        position = Cursor.decode(cursor, order_column.key) if cursor else None
+        backwards = position is not None and position.direction == CursorDirection.PREVIOUS
+        if columns:
+            columns = tuple(dict.fromkeys((*columns, order_column.key, "uuid")))
+
+        query = self._select(load, columns)
+        filters = self._scoped(filters, include_deleted)
+        if filters:
+            query = query.filter(*filters)
+        if position is not None:
+            key = tuple_(order_column, self.model.uuid)
+            boundary = position.boundary(lambda value: self._coerce_cursor_value(order_column, value))
+            query = query.where(key > boundary if descending == backwards else key < boundary)
+        if descending != backwards:
+            query = query.order_by(order_column.desc(), self.model.uuid.desc())
+        else:
+            query = query.order_by(order_column.asc(), self.model.uuid.asc())
+
+        objects = await self._session.execute(query.limit(limit + 1))
+        items = list(self._fetch_all(objects, columns))
+        has_more = len(items) > limit
+        items = items[:limit]
+        if backwards:
+            items.reverse()
+        if not items:
+            return CursorPage(items=items)
+
+        def make_cursor(obj: Any, direction: CursorDirection) -> str:
+            return Cursor(order_column.key, getattr(obj, order_column.key), str(obj.uuid), direction).encode()
+
+        has_next = backwards or has_more
+        has_previous = has_more if backwards else position is not None
+        return CursorPage(
+            items=items,
+            next_cursor=make_cursor(items[-1], CursorDirection.NEXT) if has_next else None,
+            previous_cursor=make_cursor(items[0], CursorDirection.PREVIOUS) if has_previous else None,
+        )
+
+    @staticmethod
+    def _coerce_cursor_value(column: Any, value: Any) -> Any:
+        """Convert cursor value decoded from json back to the column python type.
+
+        Raises ValueError or TypeError for a value `Cursor.encode` could not
+        produce for the column.
+        """
+        try:
+            python_type = column.type.python_type
+        except NotImplementedError:
+            return value
+        if value is None or isinstance(value, python_type) and not isinstance(value, bool):
+            return value
+        if python_type is datetime:
+            parsed = datetime.fromisoformat(value)
+            if (parsed.tzinfo is not None) != bool(getattr(column.type, "timezone", False)):
+                raise ValueError(f"Cursor value of {column.key} does not match column time zone")
+            return parsed
+        if python_type is date:
+            return date.fromisoformat(value)
+        if python_type in (str, bool) or isinstance(value, (bool, list, dict)):
+            raise TypeError(f"Cursor value of {column.key} has to be {python_type.__name__}")
+        return python_type(value)
+
+    async def retrieve(
+            self,
+            pk: uuid.UUID,
+            refresh: bool = False,
+            load: LoadMapping | None = None,
+            include_deleted: bool = False,
+    ) -> Union[model, DBException]:
+        """Get object by primary key.
+
+        `refresh` overwrites an object already present in the session
+        with the selected row instead of issuing a second SELECT.
+        `load` maps relationship names to loading strategy of this call.
+        """
+        query = self._statement(
+            "retrieve",
+            lambda: (
+                select(self.model)
+                .where(self.model.uuid == bindparam("pk"), *self._scoped(include_deleted=include_deleted))
+                .options(*loader_options(self.model, load))
+            ),
+            include_deleted,
+            self._load_key(load),
+        )
+        res = await self._session.execute(
+            query, {"pk": pk}, execution_options={"populate_existing": True} if refresh else {}
+        )
         obj = res.scalars().first()
         self.check_object(obj)
-        await self._session.refresh(obj)
         return obj
 
-    async def bulk_retrieve(self, pks: List[uuid.UUID]) -> List[model] or DBException:
-        """Get object by primary key."""
-        query = select(self.model).where(self.model.uuid.in_(pks))
+    async def get_version(
+            self, pk: uuid.UUID, filters: Union[tuple, None] = None, include_deleted: bool = False
+    ) -> Row:
+        """Get version and modification time of object without loading it, used to validate representations."""
+        res = await self._session.execute(
+            select(self.model.version, self.model.updated_at).where(
+                self.model.uuid == pk, *self._scoped(filters, include_deleted)
+            )
+        )
+        row = res.first()
+        if row is None:
+            raise DBException(
+                status_code=404,
+                detail="Object not found",
+                error_code=DBErrorCodeEnum.OBJECT_NOT_FOUND.value,
+            )
+        return row
+
+    async def bulk_retrieve(
+            self,
+            pks: List[uuid.UUID],
+            refresh: bool = False,
+            load: LoadMapping | None = None,
+            filters: Union[tuple, None] = None,
+            columns: Sequence[str] | None = None,
+            include_deleted: bool = False,
+    ) -> List[model] or DBException:
+        """Get objects, or rows of `columns`, by primary keys with a single SELECT."""
+        query = self._select(load, columns).where(self.model.uuid.in_(pks))
+        filters = self._scoped(filters, include_deleted)
+        if filters:
+            query = query.filter(*filters)
+        if refresh:
+            query = query.execution_options(populate_existing=True)
         res = await self._session.execute(query)
-        objs = res.scalars().all()
+        objs = self._fetch_all(res, columns)
         [self.check_object(obj) for obj in objs]
-        [await self._session.refresh(obj) for obj in objs]
         return objs
 
     async def update(
-            self, pk: uuid.UUID, input_data: update_scheme, partial: bool = False
+            self,
+            pk: uuid.UUID,
+            input_data: update_scheme,
+            partial: bool = False,
+            refresh: bool = False,
+            filters: Union[tuple, None] = None,
+            expected_version: int | None = None,
     ) -> Union[model, DBException]:
-        """Update object by specified primary key."""
+        """Update object by specified primary key, rows not matching `filters` are reported as not found.
+
+        With `expected_version` the row is updated by a single conditional
+        UPDATE only if nobody changed it meanwhile, otherwise version conflict
+        is raised. Writers never wait for row locks held across requests.
+        """
         values_dump_data = input_data.model_dump(exclude_unset=partial)
+        conditions = self._version_filters(filters, expected_version)
         if values_dump_data:
-            updated_obj = await self._session.execute(
-                update(self.model)
-                .where(self.model.uuid == pk)
-                .values(**values_dump_data)
-                .returning(self.model)
-            )
-            await self._session.flush()
-            res = updated_obj.scalars().first()
+            res = await self._update_by_pk(pk, values_dump_data, filters, expected_version)
             if res is None:
-                raise DBException(
-                    "Object Not Found",
-                    status_code=404,
-                    error_code=DBErrorCodeEnum.OBJECT_NOT_FOUND.value,
-                )
-            await self._session.refresh(res)
+                await self._raise_not_updated(pk, filters, expected_version)
+            if refresh:
+                await self._session.refresh(res)
             return res
+        elif conditions:
+            res = await self._session.execute(select(self.model).where(self.model.uuid == pk, *conditions))
+            obj = res.scalars().first()
+            if obj is None:
+                await self._raise_not_updated(pk, filters, expected_version)
+            return obj
         else:
             return await self._session.get(self.model, pk)
 
     async def bulk_update(
-            self, pks: List[uuid.UUID], input_data: update_scheme, partial: bool = False
+            self,
+            pks: List[uuid.UUID],
+            input_data: update_scheme,
+            partial: bool = False,
+            filters: Union[tuple, None] = None,
     ) -> List[model] or DBException:
-        """Update object by specified primary key."""
-        retrieved_objs = await self.bulk_retrieve(pks)
-        await self._session.execute(
-            update(self.model).where(self.model.uuid.in_(pks)).values(**input_data.dict(exclude_unset=partial))
+        """Apply the same values to objects with a single UPDATE ... RETURNING."""
+        values_dump_data = input_data.model_dump(exclude_unset=partial)
+        if not pks:
+            return []
+        if not values_dump_data:
+            return list(await self.bulk_retrieve(pks, filters=filters))
+        res = await self._session.execute(
+            update(self.model)
+            .where(self.model.uuid.in_(pks), *(filters or ()))
+            .values(**self._versioned(values_dump_data))
+            .returning(self.model)
         )
-        return retrieved_objs
+        return list(res.scalars().all())
+
+    async def bulk_update_values(
+            self,
+            input_data: Mapping[uuid.UUID, update_scheme | dict],
+            partial: bool = True,
+            filters: Union[tuple, None] = None,
+            match: Sequence[str] = (),
+    ) -> List[model]:
+        """Apply different values to every object with UPDATE ... FROM (VALUES ...) RETURNING.
+
+        Rows updating the same set of columns share one statement,
+        so a homogeneous batch costs one round trip. Values of `match`
+        columns are not written, objects are updated only if they are equal.
+        """
+        groups: dict[tuple, list[tuple]] = {}
+        for pk, data in input_data.items():
+            values_dump_data = data.model_dump(exclude_unset=partial) if hasattr(data, "model_dump") else dict(data)
+            keys = tuple(sorted(key for key in values_dump_data if key not in match))
+            if keys:
+                row = (pk, *(values_dump_data[key] for key in match), *(values_dump_data[key] for key in keys))
+                groups.setdefault(keys, []).append(row)
+
+        table = self.model.__table__
+        updated = []
+        for keys, rows in groups.items():
+            data_values = values(
+                column("uuid", table.c.uuid.type),
+                *(column(key, table.c[key].type) for key in (*match, *keys)),
+                name="update_data",
+            ).data(rows)
+            self._expire_loaded(row[0] for row in rows)
+            res = await self._session.execute(
+                update(self.model)
+                .where(
+                    self.model.uuid == data_values.c.uuid,
+                    *(table.c[key] == data_values.c[key] for key in match),
+                    *(filters or ()),
+                )
+                .values(self._versioned({key: data_values.c[key] for key in keys}))
+                .returning(self.model),
+                execution_options={"synchronize_session": False},
+            )
+            updated.extend(res.scalars().all())
+        return updated
+
+    def _expire_loaded(self, pks: Iterable[uuid.UUID]) -> None:
+        """Expire objects already present in session so RETURNING rows repopulate them."""
+        for pk in pks:
+            obj = self._session.identity_map.get(self._session.identity_key(self.model, pk))
+            if obj is not None:
+                self._session.expire(obj)
 
     async def delete(self, pk: uuid.UUID) -> dict:
         """Delete object by specified primary key."""
@@ -148,15 +706,20 @@ class BaseRepository(IRepository):
         res = await self._session.execute(delete(self.model))
         return {"affected_rows": res.rowcount}
 
-    async def get_first_by_filter(self, filters: dict) -> model:
+    async def get_first_by_filter(self, filters: dict, include_deleted: bool = False) -> model:
         """Get first appropriate object which meets filters."""
-        query = select(self.model).filter_by(**filters)
+        query = select(self.model).filter_by(**filters).where(*self._scoped(include_deleted=include_deleted))
         res = await self._session.execute(query)
         return res.scalars().first()
 
-    async def get_last_by_filter(self, filters: dict) -> model:
+    async def get_last_by_filter(self, filters: dict, include_deleted: bool = False) -> model:
         """Get last appropriate object which meets filters."""
-        res = await self._session.execute(select(self.model).filter_by(**filters).order_by(desc("created_at")))
+        res = await self._session.execute(
+            select(self.model)
+            .filter_by(**filters)
+            .where(*self._scoped(include_deleted=include_deleted))
+            .order_by(desc("created_at"))
+        )
         return res.scalars().first()
 
     async def get_or_create(self, input_data: create_scheme) -> model:
@@ -166,19 +729,16 @@ class BaseRepository(IRepository):
             return res
         return await self.create(input_data)
 
-    async def get_by_uuids(self, uuids: [int]) -> Sequence[Row | RowMapping | Any]:
-        """Get by uuids."""
-        query = select(
-            [self.model],
-            self.model.uuid.in_(uuids),
-        )
-        res = await self._session.execute(query)
-        return res.scalars().all()
+    async def get_by_uuids(self, uuids: List[uuid.UUID]) -> List[model]:
+        """Get by uuids, soft deleted objects included, see `bulk_retrieve`."""
+        return await self.bulk_retrieve(uuids, include_deleted=True)
 
     async def update_with_dict(self, pk: uuid.UUID, input_data: dict) -> Union[model, DBException]:
         """Update object by specified primary key."""
-        retrieved_obj = await self.retrieve(pk)
-        await self._session.execute(update(self.model).where(self.model.uuid == pk).values(**input_data))
-        await self._session.flush()
-        return retrieved_obj
+        res = await self._session.execute(
+            update(self.model).where(self.model.uuid == pk).values(**self._versioned(input_data)).returning(self.model)
+        )
+        obj = res.scalars().first()
+        self.check_object(obj)
+        return obj
 
@@ -0,0 +1,57 @@
+"""Module with bulk ingest helpers."""
+import time
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterable, AsyncIterator, Iterable, TypeVar
+
+RowType = TypeVar("RowType")
+
+
+@dataclass
+class IngestStats:
+    """Bulk ingest progress report."""
+
+    rows: int = 0
+    chunks: int = 0
+    started_at: float = field(default_factory=time.perf_counter)
+    elapsed: float = 0.0
+
+    def add_chunk(self, rows: int) -> None:
+        """Account written chunk."""
+        self.rows += rows
+        self.chunks += 1
+        self.elapsed = time.perf_counter() - self.started_at
+
+    @property
+    def rows_per_second(self) -> float:
+        """Return ingest throughput."""
+        return self.rows / self.elapsed if self.elapsed else 0.0
+
+
+async def iter_chunks(
+        rows: Iterable[RowType] | AsyncIterable[RowType], size: int
+) -> AsyncIterator[list[RowType]]:
+    """Split sync or async iterable into lists of at most `size` items, only one chunk is kept in memory."""
+    if size < 1:
+        raise ValueError("Chunk size must be positive")
+    chunk: list[RowType] = []
+    if isinstance(rows, AsyncIterable):
+        async for row in rows:
+            chunk.append(row)
+            if len(chunk) == size:
+                yield chunk
+                chunk = []
+    else:
+        for row in rows:
+            chunk.append(row)
+            if len(chunk) == size:
+                yield chunk
+                chunk = []
+    if chunk:
+        yield chunk
+
+
+def as_ingest_row(row: Any) -> dict:
+    """Convert pydantic schema or mapping to insert parameters."""
+    if hasattr(row, "model_dump"):
+        return row.model_dump()
+    return dict(row)
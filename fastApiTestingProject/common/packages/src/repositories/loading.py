@@ -0,0 +1,27 @@
+"""Module with relationship loading strategies."""
+import enum
+from typing import Any, Mapping
+
+from sqlalchemy.orm import joinedload, noload, raiseload, selectinload
+
+
+class LoadStrategy(enum.StrEnum):
+    NOLOAD = "noload"
+    SELECTIN = "selectin"
+    JOINED = "joined"
+    RAISE = "raise"
+
+
+LOADERS = {
+    LoadStrategy.NOLOAD: noload,
+    LoadStrategy.SELECTIN: selectinload,
+    LoadStrategy.JOINED: joinedload,
+    LoadStrategy.RAISE: raiseload,
+}
+
+
+def loader_options(model: Any, load: Mapping[str, LoadStrategy | str] | None) -> list:
+    """Build loader options from {relationship name: strategy} mapping."""
+    if not load:
+        return []
+    return [LOADERS[LoadStrategy(strategy)](getattr(model, name)) for name, strategy in load.items()]
@@ -1,4 +1,5 @@
 """Soft Delete Mixin."""
+from typing import Sequence, Union
 from uuid import UUID
 
 from sqlalchemy import delete, update
@@ -24,8 +25,8 @@ class DeleteMixin:
 
         return {"affected_rows": res.rowcount}
 
-    async def soft_delete(self, uuid: UUID, input_data: soft_delete_schema):
-        """Soft delete method."""
+    def _check_soft_delete_fields(self) -> None:
+        """Check model has soft delete columns."""
         if any(
                 (
                         not hasattr(self.model, "deleted_at"),
@@ -39,16 +40,49 @@ class DeleteMixin:
                 error_code=DBErrorCodeEnum.DB_FIELD_NOT_FOUND,
             )
 
-        stmt = update(self.model).where(self.model.uuid == uuid).values(**input_data.model_dump()).returning(self.model)
+    async def warm_up(
+            self,
+            sort_fields: Sequence[str] = ("created_at",),
+            filters: Union[tuple, None] = None,
+            columns: Sequence[str] | None = None,
+            write_filters: Union[tuple, None] = None,
+    ) -> None:
+        """Run hot statements of repository and soft delete against a missing row."""
+        await super().warm_up(sort_fields, filters=filters, columns=columns, write_filters=write_filters)
+        await self._warm_up_update(
+            self.soft_delete_schema.model_fields, filters if write_filters is None else write_filters
+        )
 
-        obj = await self._session.execute(stmt)
+    async def soft_delete(
+            self,
+            uuid: UUID,
+            input_data: soft_delete_schema,
+            filters: Union[tuple, None] = None,
+            expected_version: int | None = None,
+    ):
+        """Soft delete method, `expected_version` makes it conditional like update."""
+        self._check_soft_delete_fields()
+
+        result = await self._update_by_pk(uuid, input_data.model_dump(), filters, expected_version)
         await self._session.flush()
-        result = obj.scalars().first()
 
         if result is None:
-            raise DBException(
-                "Object Not Found",
-                status_code=404,
-                error_code=DBErrorCodeEnum.OBJECT_NOT_FOUND,
-            )
+            await self._raise_not_updated(uuid, filters, expected_version)
         return result
+
+    async def bulk_soft_delete(
+            self, uuids: list[UUID], input_data: soft_delete_schema, filters: Union[tuple, None] = None
+    ) -> list:
+        """Soft delete objects with a single UPDATE ... RETURNING, only matched rows are returned."""
+        self._check_soft_delete_fields()
+        if not uuids:
+            return []
+
+        stmt = (
+            update(self.model)
+            .where(self.model.uuid.in_(uuids), *(filters or ()))
+            .values(**self._versioned(input_data.model_dump()))
+            .returning(self.model)
+        )
+        res = await self._session.execute(stmt)
+        return list(res.scalars().all())
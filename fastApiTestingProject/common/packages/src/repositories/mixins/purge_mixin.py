@@ -0,0 +1,66 @@
+"""Purge Mixin."""
+from datetime import datetime
+from typing import Any, Sequence
+
+from sqlalchemy import Row, delete, insert, select, true
+
+from common.packages.src.core.exceptions.base import DBException
+from common.packages.src.core.exceptions.error_code import DBErrorCodeEnum
+
+
+class PurgeMixin:
+    """Purge mixin class removing soft deleted rows from the hot table in small batches.
+
+    Rows are picked with FOR UPDATE SKIP LOCKED, so a purge never waits for
+    writers or for another purging worker, and deleted (and archived) with a
+    single statement, so every batch is an atomic short transaction.
+    """
+
+    _session = NotImplemented
+    model = NotImplemented
+    archive_model = None
+
+    def _purge_batch_uuids(self, deleted_before: datetime, batch_size: int) -> Any:
+        """Select oldest soft deleted rows, skipping rows locked by others."""
+        return (
+            select(self.model.uuid)
+            .where(self.model.is_deleted == true(), self.model.deleted_at < deleted_before)
+            .order_by(self.model.deleted_at, self.model.uuid)
+            .limit(batch_size)
+            .with_for_update(skip_locked=True)
+        )
+
+    def _archived_columns(self) -> list[str]:
+        """Get columns copied to archive table, generated columns are not copied."""
+        table = self.model.__table__
+        archive_table = self.archive_model.__table__
+        return [column.key for column in table.columns if column.key in archive_table.c and column.computed is None]
+
+    async def purge_batch(self, deleted_before: datetime, batch_size: int, archive: bool = True) -> Sequence[Row]:
+        """Delete a batch of rows soft deleted before `deleted_before`, return their (uuid, deleted_at).
+
+        With `archive` the rows are moved to `archive_model` by the same statement.
+        """
+        table = self.model.__table__
+        purged = delete(table).where(table.c.uuid.in_(self._purge_batch_uuids(deleted_before, batch_size)))
+        if not archive:
+            res = await self._session.execute(purged.returning(table.c.uuid, table.c.deleted_at))
+            return res.all()
+
+        if self.archive_model is None:
+            raise DBException(
+                f"{type(self).__name__} has no archive model.",
+                status_code=500,
+                error_code=DBErrorCodeEnum.DB_FIELD_NOT_FOUND,
+            )
+        columns = self._archived_columns()
+        purged = purged.returning(*(table.c[name] for name in columns)).cte("purged")
+        archive_table = self.archive_model.__table__
+        stmt = (
+            insert(archive_table)
+            .from_select(columns, select(*(purged.c[name] for name in columns)))
+            .returning(archive_table.c.uuid, archive_table.c.deleted_at)
+            .add_cte(purged)
+        )
+        res = await self._session.execute(stmt)
+        return res.all()
@@ -0,0 +1,107 @@
+"""Search Mixin."""
+import enum
+import math
+from typing import Any, Sequence, Union
+
+from sqlalchemy import func, select, tuple_
+
+from common.packages.src.repositories.pagination import Cursor, CursorPage
+
+RANK_FIELD = "rank"
+HEADLINE_FIELD = "headline"
+
+
+class SearchMode(enum.StrEnum):
+    FULL_TEXT = "full_text"
+    PREFIX = "prefix"
+    FUZZY = "fuzzy"
+
+
+def escape_like(value: str, escape: str = "\\") -> str:
+    """Escape LIKE wildcards of user input."""
+    return value.replace(escape, escape * 2).replace("%", f"{escape}%").replace("_", f"{escape}_")
+
+
+class SearchMixin:
+    """Search mixin class for models with a generated tsvector column and a trigram indexed field.
+
+    Full text mode matches the tsvector with `websearch_to_tsquery` and is backed
+    by its GIN index, prefix and fuzzy modes match the trigram field with ILIKE
+    and pg_trgm `%` operator backed by a `gin_trgm_ops` index.
+    """
+
+    _session = NotImplemented
+    model = NotImplemented
+    search_config: str = "simple"
+    search_vector_field: str = "search_vector"
+    trigram_field: str = "title"
+    headline_field: str = "description"
+    headline_options: str = "StartSel=<b>, StopSel=</b>, MaxWords=35, MinWords=15, MaxFragments=2"
+
+    def _search_clause(self, query: str, mode: SearchMode) -> tuple[Any, Any, Any]:
+        """Get match condition, rank expression and tsquery used for highlighting."""
+        vector = getattr(self.model, self.search_vector_field)
+        field = getattr(self.model, self.trigram_field)
+        if mode == SearchMode.FULL_TEXT:
+            tsquery = func.websearch_to_tsquery(self.search_config, query)
+            return vector.op("@@")(tsquery), func.ts_rank(vector, tsquery), tsquery
+        tsquery = func.plainto_tsquery(self.search_config, query)
+        if mode == SearchMode.PREFIX:
+            condition = field.ilike(f"{escape_like(query)}%", escape="\\")
+        else:
+            condition = field.op("%")(query)
+        return condition, func.similarity(field, query), tsquery
+
+    @staticmethod
+    def _coerce_rank(value: Any) -> float:
+        """Convert rank of a search cursor, only finite numbers are produced by `search`."""
+        if isinstance(value, bool) or not isinstance(value, (int, float)) or not math.isfinite(value):
+            raise TypeError("Search cursor rank has to be a finite number")
+        return float(value)
+
+    async def search(
+            self,
+            query: str,
+            mode: SearchMode = SearchMode.FULL_TEXT,
+            limit: int = 20,
+            cursor: str | None = None,
+            filters: Union[tuple, None] = None,
+            columns: Sequence[str] | None = None,
+            include_deleted: bool = False,
+    ) -> CursorPage:
+        """Get page of rows ranked by relevance, seeking on (rank, uuid).
+
+        Rows contain `columns` (every non deferred column by default) followed
+        by `rank` and `headline` snippet. Matches are ranked and limited in a
+        subquery first, so snippets are built for the returned page only.
+        Soft deleted rows are skipped unless `include_deleted` is set.
+        """
+        condition, rank, tsquery = self._search_clause(query, mode)
+        position = Cursor.decode(cursor, RANK_FIELD) if cursor else None
+
+        ranked = select(self.model.uuid, rank.label(RANK_FIELD)).where(
+            condition, *self._scoped(filters, include_deleted)
+        )
+        if position is not None:
+            ranked = ranked.where(tuple_(rank, self.model.uuid) < position.boundary(self._coerce_rank))
+        ranked = ranked.order_by(rank.desc(), self.model.uuid.desc()).limit(limit + 1).subquery("ranked")
+
+        table = self.model.__table__
+        headline = func.ts_headline(
+            self.search_config, getattr(self.model, self.headline_field), tsquery, self.headline_options
+        )
+        stmt = (
+            select(
+                *(table.c[name] for name in columns or self.model.columns_projection().fields),
+                ranked.c[RANK_FIELD],
+                headline.label(HEADLINE_FIELD),
+            )
+            .join(ranked, self.model.uuid == ranked.c.uuid)
+            .order_by(ranked.c[RANK_FIELD].desc(), self.model.uuid.desc())
+        )
+        rows = (await self._session.execute(stmt)).all()
+        items = rows[:limit]
+        if len(rows) <= limit:
+            return CursorPage(items=items)
+        last = items[-1]
+        return CursorPage(items=items, next_cursor=Cursor(RANK_FIELD, last.rank, str(last.uuid)).encode())
@@ -0,0 +1,81 @@
+"""Module with keyset (cursor) pagination helpers."""
+import base64
+import binascii
+import enum
+import json
+from dataclasses import dataclass
+from datetime import date, datetime
+from typing import Any, Callable, Generic, Sequence, TypeVar
+from uuid import UUID
+
+from common.packages.src.core.exceptions.base import DomainException
+from common.packages.src.core.exceptions.error_code import DomainErrorCodeEnum
+
+ItemType = TypeVar("ItemType")
+
+
+def invalid_cursor() -> DomainException:
+    """Get error of a cursor which was not produced by `Cursor.encode`."""
+    return DomainException(
+        status_code=400,
+        detail="Invalid pagination cursor",
+        error_code=DomainErrorCodeEnum.INVALID_CURSOR.value,
+    )
+
+
+class CursorDirection(enum.StrEnum):
+    NEXT = "next"
+    PREVIOUS = "previous"
+
+
+@dataclass(frozen=True)
+class Cursor:
+    """Position of a page boundary: sort value and primary key of the boundary row."""
+
+    field: str
+    value: Any
+    pk: str
+    direction: CursorDirection = CursorDirection.NEXT
+
+    def encode(self) -> str:
+        """Encode cursor to opaque url-safe token."""
+        value = self.value
+        if isinstance(value, (datetime, date)):
+            value = value.isoformat()
+        elif isinstance(value, UUID):
+            value = str(value)
+        payload = json.dumps([self.field, value, str(self.pk), self.direction.value], separators=(",", ":"))
+        return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+    @classmethod
+    def decode(cls, token: str, field: str) -> "Cursor":
+        """Decode token produced by `encode`, it must belong to the same sort field."""
+        try:
+            padded = token + "=" * (-len(token) % 4)
+            cursor_field, value, pk, direction = json.loads(base64.urlsafe_b64decode(padded.encode()))
+            cursor = cls(field=cursor_field, value=value, pk=pk, direction=CursorDirection(direction))
+        except (binascii.Error, UnicodeDecodeError, ValueError, TypeError):
+            cursor = None
+        if cursor is None or cursor.field != field:
+            raise invalid_cursor()
+        return cursor
+
+    def boundary(self, coerce: Callable[[Any], Any]) -> tuple[Any, UUID]:
+        """Get sort value converted by `coerce` and primary key of the boundary row.
+
+        Values a tampered cursor could carry fail as invalid cursor instead of
+        reaching the database.
+        """
+        try:
+            return coerce(self.value), UUID(self.pk)
+        except (ValueError, TypeError, AttributeError, OverflowError):
+            raise invalid_cursor() from None
+
+
+@dataclass
+class CursorPage(Generic[ItemType]):
+    """Page of keyset paginated result."""
+
+    items: Sequence[ItemType]
+    next_cursor: str | None = None
+    previous_cursor: str | None = None
@@ -1,13 +1,19 @@
+from datetime import datetime
 from typing import Optional
 from uuid import UUID
 
 from pydantic import BaseModel, Field, ConfigDict
 
+from common.packages.src.core.serialization import Projection
+
+
+MAX_BATCH_SIZE = 1000
+
 
 class CreateNoteSchema(BaseModel):
     title: str = Field(..., max_length=100)
     description: str = Field(..., max_length=100)
-    user_id: Optional[UUID] = Field(None, exclude=True)
+    user_id: Optional[UUID] = None
 
     model_config = ConfigDict(from_attributes=True, arbitrary_types_allowed=True)
 
@@ -18,3 +24,75 @@ class UpdateNoteSchema(BaseModel):
     user_id: Optional[UUID] = Field(None, exclude=True)
 
     model_config = ConfigDict(from_attributes=True, arbitrary_types_allowed=True)
+
+
+class NoteSchema(BaseModel):
+    uuid: UUID
+    title: str
+    description: str
+    user_id: Optional[UUID] = None
+    created_at: datetime
+    updated_at: datetime
+    is_deleted: bool = False
+    version: int = 1
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+note_projection = Projection.of_schema(NoteSchema)
+
+
+class QueuedNoteSchema(BaseModel):
+    uuid: UUID
+    title: str
+    description: str
+    user_id: UUID
+
+
+class NoteSearchHitSchema(NoteSchema):
+    rank: float
+    headline: str
+
+
+search_hit_projection = Projection.of_schema(NoteSearchHitSchema)
+
+
+class NotesSearchPageSchema(BaseModel):
+    items: list[NoteSearchHitSchema]
+    next_cursor: Optional[str] = None
+
+
+class NotesPageSchema(BaseModel):
+    items: list[NoteSchema]
+    limit: int
+    offset: int
+
+
+class NotesCursorPageSchema(BaseModel):
+    items: list[NoteSchema]
+    next_cursor: Optional[str] = None
+    previous_cursor: Optional[str] = None
+
+
+class NotesBatchSchema(BaseModel):
+    notes: list[NoteSchema]
+
+
+class BatchCreateNotesSchema(BaseModel):
+    notes: list[CreateNoteSchema] = Field(..., min_length=1, max_length=MAX_BATCH_SIZE)
+
+
+class BatchGetNotesSchema(BaseModel):
+    uuids: list[UUID] = Field(..., min_length=1, max_length=MAX_BATCH_SIZE)
+
+
+class BatchUpdateNoteSchema(UpdateNoteSchema):
+    uuid: UUID = Field(..., exclude=True)
+
+
+class BatchUpdateNotesSchema(BaseModel):
+    notes: list[BatchUpdateNoteSchema] = Field(..., min_length=1, max_length=MAX_BATCH_SIZE)
+
+
+class BatchDeleteNotesSchema(BaseModel):
+    uuids: list[UUID] = Field(..., min_length=1, max_length=MAX_BATCH_SIZE)
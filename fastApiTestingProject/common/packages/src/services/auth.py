@@ -1,4 +1,7 @@
 """Auth services."""
+import functools
+from uuid import UUID
+
 import jwt
 from fastapi import Depends
 from loguru import logger
@@ -8,12 +11,31 @@ from common.packages.src.core.exceptions.api_exception import ApiException
 from common.packages.src.core.exceptions.base import DomainException
 from common.packages.src.core.exceptions.error_code import DomainErrorCodeEnum
 from common.packages.src.dependencies.token import JWTBearer
+from common.packages.src.metrics.cache import register_cache_metrics
+from common.packages.src.services.token_cache import VerifiedTokenCache
+
 
+@functools.cache
+def get_token_cache() -> VerifiedTokenCache | None:
+    """Get process-wide cache of verified tokens, None when disabled."""
+    if not settings.auth.token_cache_enabled:
+        return None
+    token_cache = VerifiedTokenCache(max_size=settings.auth.token_cache_size, max_ttl=settings.auth.token_cache_ttl)
+    register_cache_metrics("auth_tokens", token_cache.stats)
+    return token_cache
 
-def decode_user_jwt(token: str, secret_key: str = settings.auth.secret_key) -> dict:
-    """Decode access token."""
+
+def decode_user_jwt(token: str, secret_key: str | None = None) -> dict:
+    """Decode access token, verified payloads are served from token cache."""
+    secret_key = secret_key or settings.notes_app.secret_key
+    algorithm = settings.auth.algorithm
+    token_cache = get_token_cache()
+    if token_cache is not None:
+        payload = token_cache.get(token, secret_key, algorithm)
+        if payload is not None:
+            return payload
     try:
-        payload = jwt.decode(token, secret_key, algorithms=[settings.app.algorithm])
+        payload = jwt.decode(token, secret_key, algorithms=[algorithm])
     except jwt.ExpiredSignatureError:
         raise DomainException(
             status_code=401,
@@ -32,6 +54,8 @@ def decode_user_jwt(token: str, secret_key: str = settings.auth.secret_key) -> d
             detail="Invalid access token",
             error_code=DomainErrorCodeEnum.INVALID_TOKEN.value,
         )
+    if token_cache is not None:
+        token_cache.set(token, secret_key, algorithm, payload)
     return payload
 
 
@@ -51,7 +75,7 @@ class APIKeyValidator:
 
 async def get_current_user(token: str = Depends(JWTBearer())) -> dict:
     """Get current user based on token."""
-    payload = decode_user_jwt(token, settings.auth.secret_key)
+    payload = decode_user_jwt(token, settings.notes_app.secret_key)
     if payload is None:
         logger.warning("Credentials are not valid! Payload is None")
         raise ApiException(name="Credentials are not valid!", status_code=401)
@@ -64,3 +88,12 @@ async def get_current_user(token: str = Depends(JWTBearer())) -> dict:
 async def get_user_payload(token: str = Depends(JWTBearer())) -> dict:
     """Get user payload, based on jwt."""
     return decode_user_jwt(token)
+
+
+async def get_current_user_uuid(payload: dict = Depends(get_current_user)) -> UUID:
+    """Get uuid of current user."""
+    try:
+        return UUID(str(payload["user_uuid"]))
+    except ValueError:
+        logger.warning("Credentials are not valid! User uuid is malformed")
+        raise ApiException(name="Credentials are not valid!", status_code=401)
@@ -1,10 +1,18 @@
 """Base CRUD Service realizations."""
 import uuid as _uuid
-from typing import TypeVar
+from typing import AsyncIterator, Callable, Sequence, TypeVar
 
+from pydantic import BaseModel as BaseSchema
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from common.packages.src.abstract.cache import ICache
 from common.packages.src.abstract.repository import IRepository
 from common.packages.src.abstract.service import ICRUDService
+from common.packages.src.cache.base import defer_invalidation, is_invalidation_pending
 from common.packages.src.db.base import BaseModel
+from common.packages.src.db.routing import read_only, replica_reads
+from common.packages.src.loaders import DataLoader
+from common.packages.src.repositories.pagination import CursorPage
 
 ServiceRepository = TypeVar("ServiceRepository", bound=IRepository)
 CreateBaseSchema = TypeVar("CreateBaseSchema", bound=BaseModel)
@@ -16,41 +24,218 @@ class BaseCRUDService(ICRUDService):
 
     create_scheme: CreateBaseSchema = None  # type: ignore
     update_scheme: UpdateBaseSchema = None  # type: ignore
+    cache_scheme: type[BaseSchema] | None = None
+    cache_ttl: float | None = None
+
+    def __init__(
+            self,
+            repository: ServiceRepository,
+            cache: ICache | None = None,
+            session_factory: Callable[[], AsyncSession] | None = None,
+            loader: DataLoader | None = None,
+    ) -> None:
+        """Init method of base crud service class.
 
-    def __init__(self, repository: ServiceRepository) -> None:
-        """Init method of base crud service class."""
+        Cache misses are loaded in sessions of `session_factory`, one load
+        is shared by concurrent requests, so it must not use any of their
+        sessions. Lookups by uuid in the repository session go through
+        `loader`, a request scoped one batches and memoizes them.
+        """
+        if cache is not None and (self.cache_scheme is None or session_factory is None):
+            raise ValueError(f"{type(self).__name__} needs cache_scheme and session_factory to use cache")
         self._repository = repository
+        self._cache = cache
+        self._session_factory = session_factory
+        self._loader = loader
+
+    def cache_key(self, uuid: _uuid.UUID) -> str:
+        """Get entity cache key."""
+        return f"{self._repository.model.__tablename__}:{uuid}"
+
+    async def _invalidate(self, *uuids: _uuid.UUID) -> None:
+        """Drop cached entities once the write commits.
+
+        Dropping them before commit would let a concurrent miss cache the
+        row as it was before the write.
+        """
+        if self._loader is not None:
+            for uuid in uuids:
+                self._loader.clear(uuid)
+        if self._cache is not None and uuids:
+            defer_invalidation(self._repository.session.info, self._cache, *(self.cache_key(uuid) for uuid in uuids))
+
+    async def _evict(self, uuid: _uuid.UUID) -> None:
+        """Drop cached entity known to be outdated right away."""
+        if self._loader is not None:
+            self._loader.clear(uuid)
+        if self._cache is not None:
+            await self._cache.delete(self.cache_key(uuid))
+
+    async def _retrieve(self, uuid: _uuid.UUID):
+        """Get obj by uuid in repository session, through loader if there is one."""
+        if self._loader is None:
+            return await self._repository.retrieve(uuid)
+        obj = await self._loader.load(uuid)
+        self._repository.check_object(obj)
+        return obj
+
+    async def _snapshot(self, uuid: _uuid.UUID):
+        """Load obj detached from the session as `cache_scheme`."""
+        obj = await self._retrieve(uuid)
+        return self.cache_scheme.model_validate(obj)
+
+    async def _load_cached(self, uuid: _uuid.UUID):
+        """Load obj as `cache_scheme` in a short-lived session of its own."""
+        async with self._session_factory() as session:
+            obj = await type(self._repository)(session).retrieve(uuid)
+            return self.cache_scheme.model_validate(obj)
 
     async def get_by_uuid(self, uuid: _uuid.UUID):
-        """Get obj by uuid."""
-        obj = await self._repository.retrieve(uuid)
+        """Get obj by uuid, read through entity cache if it is configured.
+
+        Cached objects are `cache_scheme` snapshots loaded by a session of
+        their own, so a request waiting for a load started by another one
+        does not depend on the session of that request. Objects written by
+        the uncommitted transaction of the session are not cached. Cache is
+        filled from primary, a lagging replica would cache an object older
+        than the last invalidation.
+        """
+        if self._cache is None:
+            with replica_reads():
+                return await self._retrieve(uuid)
+        key = self.cache_key(uuid)
+        if is_invalidation_pending(self._repository.session.info, self._cache, key):
+            return await self._snapshot(uuid)
+        obj = await self._cache.get_or_load(key, lambda: self._load_cached(uuid), ttl=self.cache_ttl)
         return obj
 
+    @read_only
     async def get_all(self):
         """Get all objects."""
         objs = await self._repository.list()
         return objs
 
-    async def get_paginated(self, limit: int, offset: int):
+    async def stream(
+            self, filters: tuple | None = None, batch_size: int = 500, columns: Sequence[str] | None = None
+    ) -> AsyncIterator[Sequence]:
+        """Stream objects, or rows of `columns`, in batches."""
+        async for batch in self._repository.stream(filters=filters, batch_size=batch_size, columns=columns):
+            yield batch
+
+    @read_only
+    async def get_paginated(
+            self,
+            limit: int,
+            offset: int,
+            order_by_field: str = "created_at",
+            filters: tuple | None = None,
+            columns: Sequence[str] | None = None,
+    ):
         """Get paginated result."""
-        objs = await self._repository.get_paginated(limit=limit, offset=offset)
+        objs = await self._repository.get_paginated(
+            limit=limit, offset=offset, order_by_field=order_by_field, filters=filters, columns=columns
+        )
+        return objs
+
+    @read_only
+    async def get_paginated_by_cursor(
+            self,
+            limit: int,
+            cursor: str | None = None,
+            order_by_field: str = "created_at",
+            filters: tuple | None = None,
+            descending: bool = False,
+            columns: Sequence[str] | None = None,
+    ) -> CursorPage:
+        """Get keyset paginated result."""
+        page = await self._repository.get_paginated_by_cursor(
+            limit=limit,
+            order_by_field=order_by_field,
+            cursor=cursor,
+            filters=filters,
+            descending=descending,
+            columns=columns,
+        )
+        return page
+
+    @read_only
+    async def get_by_uuids(
+            self, uuids: list[_uuid.UUID], filters: tuple | None = None, columns: Sequence[str] | None = None
+    ):
+        """Get objects, or rows of `columns`, by uuids with a single query."""
+        objs = await self._repository.bulk_retrieve(uuids, filters=filters, columns=columns)
+        return objs
 
     async def create(self, data: create_scheme):
         """Create obj."""
         obj = await self._repository.create(data)
         return obj
 
-    async def update(self, uuid: _uuid.UUID, data: update_scheme):
-        """Update by uuid."""
-        result = await self._repository.update(uuid, data)
+    async def bulk_create(self, data: list[create_scheme]):
+        """Create objects with a single query."""
+        objs = await self._repository.bulk_create(data)
+        return objs
+
+    async def update(
+            self,
+            uuid: _uuid.UUID,
+            data: update_scheme,
+            filters: tuple | None = None,
+            expected_version: int | None = None,
+    ):
+        """Update by uuid, `expected_version` fails the update if object was changed meanwhile."""
+        result = await self._repository.update(uuid, data, filters=filters, expected_version=expected_version)
+        await self._invalidate(uuid)
+        return result
+
+    async def partial_update(
+            self,
+            uuid: _uuid.UUID,
+            data: update_scheme,
+            filters: tuple | None = None,
+            expected_version: int | None = None,
+    ):
+        """Partial update by uuid, `expected_version` fails the update if object was changed meanwhile."""
+        result = await self._repository.update(
+            uuid, data, partial=True, filters=filters, expected_version=expected_version
+        )
+        await self._invalidate(uuid)
+        return result
+
+    async def bulk_update(
+            self, uuids: list[_uuid.UUID], data: update_scheme, partial: bool = False, filters: tuple | None = None
+    ):
+        """Apply the same update to many objects."""
+        result = await self._repository.bulk_update(uuids, data, partial=partial, filters=filters)
+        await self._invalidate(*uuids)
+        return result
+
+    async def bulk_update_values(
+            self,
+            data: dict[_uuid.UUID, update_scheme | dict],
+            partial: bool = True,
+            filters: tuple | None = None,
+            match: Sequence[str] = (),
+    ):
+        """Apply individual update to every object, objects differing in `match` values are not updated."""
+        result = await self._repository.bulk_update_values(data, partial=partial, filters=filters, match=match)
+        await self._invalidate(*data)
+        return result
+
+    async def bulk_upsert(self, rows: list[dict], match: Sequence[str] = ()) -> int:
+        """Insert objects, present ones with equal `match` values are updated instead."""
+        result = await self._repository.bulk_upsert(rows, match=match)
+        await self._invalidate(*(row["uuid"] for row in rows))
         return result
 
-    async def partial_update(self, uuid: _uuid.UUID, data: update_scheme):
-        """Partial update by uuid."""
-        result = await self._repository.update(uuid, data, partial=True)
+    async def bulk_insert_missing(self, rows: list[dict]) -> int:
+        """Insert objects which are not present yet, get number of inserted objects."""
+        result = await self._repository.bulk_insert_missing(rows)
+        await self._invalidate(*(row["uuid"] for row in rows))
         return result
 
     async def delete_by_uuid(self, uuid: _uuid.UUID) -> dict:
         """Delete obj by uuid."""
         result = await self._repository.delete(uuid)
+        await self._invalidate(uuid)
         return result
@@ -17,6 +17,7 @@ class DeleteMixin:
     async def delete(self, uuid: UUID):
         """Delete record from database completely."""
         result = await self._repository.delete(uuid)
+        await self._invalidate(uuid)
 
         return result
 
@@ -26,12 +27,31 @@ class DeleteMixin:
             raise DomainException(f"{type(self._repository)} is not ready to apply soft delete yet.")
         soft_delete_info = SoftDeleteSchema(deleted_by=deleted_by_uuid, deleted_at=datetime.utcnow())
         result = await self._repository.soft_delete(uuid, soft_delete_info)
+        await self._invalidate(uuid)
         return result
 
-    async def soft_delete(self, uuid: UUID, deleted_by_uuid: UUID):
+    async def soft_delete(
+            self,
+            uuid: UUID,
+            deleted_by_uuid: UUID,
+            filters: tuple | None = None,
+            expected_version: int | None = None,
+    ):
         """Apply is_deleted flag on database record."""
         if not hasattr(self._repository, "soft_delete"):
             raise DomainException(f"{type(self._repository)} is not ready to apply soft delete yet.")
         soft_delete_info = SoftDeleteSchema(deleted_by=deleted_by_uuid, deleted_at=datetime.utcnow())
-        result = await self._repository.soft_delete(uuid, soft_delete_info)
+        result = await self._repository.soft_delete(
+            uuid, soft_delete_info, filters=filters, expected_version=expected_version
+        )
+        await self._invalidate(uuid)
+        return result
+
+    async def bulk_soft_delete(self, uuids: list[UUID], deleted_by_uuid: UUID, filters: tuple | None = None):
+        """Apply is_deleted flag on many database records with a single query."""
+        if not hasattr(self._repository, "bulk_soft_delete"):
+            raise DomainException(f"{type(self._repository)} is not ready to apply soft delete yet.")
+        soft_delete_info = SoftDeleteSchema(deleted_by=deleted_by_uuid, deleted_at=datetime.utcnow())
+        result = await self._repository.bulk_soft_delete(uuids, soft_delete_info, filters=filters)
+        await self._invalidate(*uuids)
         return result
@@ -0,0 +1,54 @@
+"""Verified access token cache."""
+import hashlib
+import time
+
+from common.packages.src.cache.base import CacheStats
+from common.packages.src.cache.memory import LRUCache
+
+
+class VerifiedTokenCache:
+    """Bounded cache of verified jwt payloads keyed by token hash.
+
+    Entry lifetime is capped by the token `exp` claim, so a cached
+    payload is never returned after the token itself has expired.
+    """
+
+    def __init__(self, max_size: int, max_ttl: float) -> None:
+        """Initialize storage."""
+        self.max_ttl = max_ttl
+        self._storage = LRUCache(max_size=max_size, ttl=max_ttl)
+
+    @property
+    def stats(self) -> CacheStats:
+        """Return cache counters."""
+        return self._storage.stats
+
+    @staticmethod
+    def _key(token: str, secret_key: str, algorithm: str) -> bytes:
+        """Hash token together with verification parameters."""
+        return hashlib.sha256(f"{algorithm}\0{secret_key}\0{token}".encode()).digest()
+
+    def get(self, token: str, secret_key: str, algorithm: str) -> dict | None:
+        """Get verified payload of token."""
+        key = self._key(token, secret_key, algorithm)
+        payload = self._storage.get(key)
+        if payload is None:
+            return None
+        exp = payload.get("exp")
+        if exp is not None and exp <= time.time():
+            self._storage.delete(key)
+            return None
+        return dict(payload)
+
+    def set(self, token: str, secret_key: str, algorithm: str, payload: dict) -> None:
+        """Store verified payload until token expiration."""
+        ttl = self.max_ttl
+        exp = payload.get("exp")
+        if exp is not None:
+            ttl = min(ttl, exp - time.time())
+        if ttl > 0:
+            self._storage.set(self._key(token, secret_key, algorithm), dict(payload), ttl)
+
+    def clear(self) -> None:
+        """Remove all entries."""
+        self._storage.clear()
@@ -0,0 +1,212 @@
+"""Module with background purge worker for soft deleted rows."""
+import asyncio
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Callable
+
+from loguru import logger
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from common.packages.src.db.locks import AdvisoryLock
+from common.packages.src.metrics.purge import (
+    purge_batch_duration,
+    purge_batches_total,
+    purge_throttled_seconds_total,
+    purged_rows_total,
+)
+from common.packages.src.repositories.mixins.purge_mixin import PurgeMixin
+
+REPLICATION_LAG_QUERY = text(
+    "SELECT coalesce(max(extract(epoch FROM replay_lag)), 0) FROM pg_stat_replication"
+)
+
+
+@dataclass
+class PurgeStats:
+    """Purge run progress report."""
+
+    deleted_before: datetime
+    rows: int = 0
+    batches: int = 0
+    last_deleted_at: datetime | None = None
+    throttled: float = 0.0
+    started_at: float = field(default_factory=time.perf_counter)
+    elapsed: float = 0.0
+
+    def add_batch(self, rows: int, last_deleted_at: datetime | None) -> None:
+        """Account committed batch."""
+        self.rows += rows
+        self.batches += 1
+        if last_deleted_at is not None:
+            self.last_deleted_at = last_deleted_at
+        self.elapsed = time.perf_counter() - self.started_at
+
+    @property
+    def rows_per_second(self) -> float:
+        """Return purge throughput."""
+        return self.rows / self.elapsed if self.elapsed else 0.0
+
+
+class PurgeWorker:
+    """Move rows soft deleted longer than `retention` ago to archive table, or hard delete them.
+
+    Every batch is committed on its own, so an interrupted run loses nothing
+    and the next one resumes from the oldest row left. Batches are paced to
+    `max_rows_per_second` and paused while replicas lag more than
+    `max_replication_lag` seconds behind. With `leader_lock` only the process
+    holding it purges, so running a worker in every app process is safe.
+    """
+
+    def __init__(
+            self,
+            repository_class: Callable[[AsyncSession], PurgeMixin],
+            session_factory: async_sessionmaker[AsyncSession],
+            retention: timedelta,
+            archive: bool = True,
+            batch_size: int = 500,
+            max_rows_per_second: float = 2000.0,
+            max_replication_lag: float = 10.0,
+            interval: float = 3600.0,
+            leader_lock: AdvisoryLock | None = None,
+    ) -> None:
+        """Initialize purge worker."""
+        if batch_size < 1:
+            raise ValueError("Batch size must be positive")
+        self._repository_class = repository_class
+        self._session_factory = session_factory
+        self.retention = retention
+        self.archive = archive
+        self.batch_size = batch_size
+        self.max_rows_per_second = max_rows_per_second
+        self.max_replication_lag = max_replication_lag
+        self.interval = interval
+        self._leader_lock = leader_lock
+        self._stopping = asyncio.Event()
+        self._task: asyncio.Task | None = None
+
+    @property
+    def table(self) -> str:
+        """Get purged table name."""
+        return self._repository_class.model.__tablename__
+
+    @property
+    def mode(self) -> str:
+        """Get purge mode label."""
+        return "archive" if self.archive else "delete"
+
+    async def _sleep(self, seconds: float) -> None:
+        """Pause unless worker is stopped meanwhile."""
+        try:
+            await asyncio.wait_for(self._stopping.wait(), timeout=seconds)
+        except asyncio.TimeoutError:
+            pass
+
+    async def _replication_lag(self) -> float:
+        """Get replay lag of the slowest replica in seconds, zero without replicas."""
+        async with self._session_factory() as session:
+            lag = (await session.execute(REPLICATION_LAG_QUERY)).scalar()
+        return float(lag or 0)
+
+    async def _wait_for_replicas(self, stats: PurgeStats) -> None:
+        """Hold next batch while replicas catch up."""
+        if self.max_replication_lag <= 0:
+            return
+        while not self._stopping.is_set():
+            lag = await self._replication_lag()
+            if lag <= self.max_replication_lag:
+                return
+            logger.warning(f"Purge of {self.table} paused, replication lag {lag:.1f}s")
+            pause = min(lag, 5.0)
+            stats.throttled += pause
+            purge_throttled_seconds_total.inc(pause, table=self.table)
+            await self._sleep(pause)
+
+    async def _throttle(self, rows: int, duration: float, stats: PurgeStats) -> None:
+        """Pace batches to the rows per second budget."""
+        if self.max_rows_per_second <= 0:
+            return
+        pause = rows / self.max_rows_per_second - duration
+        if pause > 0:
+            stats.throttled += pause
+            purge_throttled_seconds_total.inc(pause, table=self.table)
+            await self._sleep(pause)
+
+    async def _purge_batch(self, deleted_before: datetime) -> list:
+        """Purge one batch in its own transaction."""
+        async with self._session_factory() as session:
+            async with session.begin():
+                rows = await self._repository_class(session).purge_batch(
+                    deleted_before, self.batch_size, archive=self.archive
+                )
+        return list(rows)
+
+    async def purge(self, deleted_before: datetime | None = None, max_batches: int | None = None) -> PurgeStats:
+        """Purge rows deleted before cutoff until none is left, `max_batches` or stop.
+
+        Cutoff is fixed for the run, by default it is now minus retention.
+        """
+        stats = PurgeStats(deleted_before=deleted_before or datetime.utcnow() - self.retention)
+        logger.info(f"Purge of {self.table} started, mode={self.mode} deleted_before={stats.deleted_before}")
+        while not self._stopping.is_set() and (max_batches is None or stats.batches < max_batches):
+            await self._wait_for_replicas(stats)
+            if self._stopping.is_set():
+                break
+            started_at = time.perf_counter()
+            rows = await self._purge_batch(stats.deleted_before)
+            duration = time.perf_counter() - started_at
+            if not rows:
+                break
+            stats.add_batch(len(rows), max(row.deleted_at for row in rows))
+            purge_batch_duration.observe(duration, table=self.table)
+            purge_batches_total.inc(table=self.table, mode=self.mode)
+            purged_rows_total.inc(len(rows), table=self.table, mode=self.mode)
+            logger.debug(
+                f"Purged {stats.rows} rows of {self.table} in {stats.batches} batches, "
+                f"up to deleted_at={stats.last_deleted_at}"
+            )
+            if len(rows) < self.batch_size:
+                break
+            await self._throttle(len(rows), duration, stats)
+        logger.info(
+            f"Purge of {self.table} finished: {stats.rows} rows in {stats.batches} batches, "
+            f"{stats.rows_per_second:.0f} rows/sec, throttled {stats.throttled:.1f}s"
+        )
+        return stats
+
+    async def _is_leader(self) -> bool:
+        """Check if this process purges, followers try to take over on every tick."""
+        if self._leader_lock is None:
+            return True
+        if await self._leader_lock.acquire():
+            return True
+        logger.debug(f"Purge of {self.table} skipped, another process holds {self._leader_lock.name}")
+        return False
+
+    async def run(self) -> None:
+        """Purge every `interval` seconds until stopped, failed runs are retried on the next tick."""
+        try:
+            while not self._stopping.is_set():
+                try:
+                    if await self._is_leader():
+                        await self.purge()
+                except Exception as exc:
+                    logger.exception(f"Purge of {self.table} failed: {exc}")
+                await self._sleep(self.interval)
+        finally:
+            if self._leader_lock is not None:
+                await self._leader_lock.release()
+
+    def start(self) -> asyncio.Task:
+        """Run worker in background task."""
+        self._stopping.clear()
+        self._task = asyncio.create_task(self.run())
+        return self._task
+
+    async def stop(self) -> None:
+        """Stop after current batch is committed."""
+        self._stopping.set()
+        if self._task is not None:
+            await self._task
+            self._task = None
@@ -0,0 +1,490 @@
+"""Module with write-behind queue of entity writes.
+
+Writes are acknowledged once they are appended to a local log and synced to
+disk, the database is written later by a background task. Writes of the same
+entity are coalesced in memory, every field keeps its latest value, so a
+burst of autosaves costs a single row write per flush.
+
+The log is a directory of numbered JSON lines segments. A flush starts a new
+segment and takes every pending write, segments written before are removed
+once all of them are committed. Every process logs to a directory of its own,
+locked for the process lifetime. On start directories of processes which are
+gone are moved into the new log, so a crash loses no acknowledged write.
+Writes may be applied more than once after recovery, `apply` has to be
+idempotent. Every write carries the version of the entity it was based on,
+so a replayed or late write never overwrites changes made after it.
+
+Writes of an entity are applied in order within a process. Writes of the same
+entity queued by different processes are applied in the order of their
+flushes.
+"""
+import asyncio
+import enum
+import fcntl
+import os
+import shutil
+import time
+import uuid as _uuid
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Iterator
+
+import orjson
+from loguru import logger
+from sqlalchemy.exc import DBAPIError, InterfaceError, OperationalError
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from common.packages.src.cache.base import run_pending_invalidations
+from common.packages.src.core.exceptions.base import DomainException
+from common.packages.src.core.exceptions.error_code import DomainErrorCodeEnum
+from common.packages.src.metrics.registry import registry
+from common.packages.src.metrics.write_behind import (
+    write_behind_backpressure_total,
+    write_behind_coalesced_total,
+    write_behind_dropped_total,
+    write_behind_enqueued_total,
+    write_behind_flush_duration,
+    write_behind_flushed_total,
+    write_behind_log_sync_duration,
+    write_behind_skipped_total,
+)
+
+LOCK_FILE = "lock"
+SEGMENT_SUFFIX = ".log"
+
+
+class WriteKind(enum.StrEnum):
+    """Kind of queued write."""
+
+    CREATE = "create"
+    UPDATE = "update"
+
+
+@dataclass
+class PendingWrite:
+    """Latest values of an entity waiting to be written.
+
+    Update is applied only if the entity is still of `version`, None applies
+    it unconditionally.
+    """
+
+    kind: WriteKind
+    uuid: _uuid.UUID
+    user_id: _uuid.UUID
+    values: dict[str, Any]
+    version: int | None = None
+
+    def merge(self, newer: "PendingWrite") -> "PendingWrite":
+        """Coalesce newer write of the same entity, kind and version of the first write are kept."""
+        return PendingWrite(self.kind, self.uuid, self.user_id, {**self.values, **newer.values}, self.version)
+
+    def dump(self) -> bytes:
+        """Serialize write to a log line."""
+        line = {
+            "kind": self.kind,
+            "uuid": str(self.uuid),
+            "user_id": str(self.user_id),
+            "values": self.values,
+            "version": self.version,
+        }
+        return orjson.dumps(line) + b"\n"
+
+    @classmethod
+    def load(cls, line: bytes) -> "PendingWrite":
+        """Deserialize write from a log line, lines logged without version are unconditional."""
+        data = orjson.loads(line)
+        return cls(
+            WriteKind(data["kind"]),
+            _uuid.UUID(data["uuid"]),
+            _uuid.UUID(data["user_id"]),
+            data["values"],
+            data.get("version"),
+        )
+
+
+ApplyWrites = Callable[[AsyncSession, list[PendingWrite]], Awaitable[int]]
+
+
+def coalesce(writes: dict[_uuid.UUID, PendingWrite], write: PendingWrite) -> bool:
+    """Add write to pending writes by entity, check if it was merged into an earlier one."""
+    queued = writes.get(write.uuid)
+    writes[write.uuid] = write if queued is None else queued.merge(write)
+    return queued is not None
+
+
+def is_transient(exc: BaseException) -> bool:
+    """Check if failure is likely to pass on retry, like a lost connection or an exhausted pool."""
+    if isinstance(exc, DBAPIError):
+        return exc.connection_invalidated or isinstance(exc, (OperationalError, InterfaceError))
+    return isinstance(exc, (PoolTimeoutError, OSError))
+
+
+def _lock(directory: Path) -> int | None:
+    """Lock log directory, None when another process holds it or it is gone."""
+    try:
+        fd = os.open(directory / LOCK_FILE, os.O_RDWR | os.O_CREAT, 0o600)
+    except (FileNotFoundError, NotADirectoryError):
+        return None
+    try:
+        fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except BlockingIOError:
+        os.close(fd)
+        return None
+    return fd
+
+
+class WriteAheadLog:
+    """Append-only log of queued writes split into numbered segments, owned by one process."""
+
+    def __init__(self, root: str | Path, fsync: bool = True) -> None:
+        """Initialize log of this process under `root`, nothing is created until `open`."""
+        self.root = Path(root)
+        self.fsync = fsync
+        self.directory = self.root / _uuid.uuid4().hex
+        self._lock_fd: int | None = None
+        self._file: Any = None
+        self._segment = 1
+
+    def _segment_path(self, segment: int) -> Path:
+        """Get path of segment file."""
+        return self.directory / f"{segment:08d}{SEGMENT_SUFFIX}"
+
+    @staticmethod
+    def segments(directory: Path) -> list[Path]:
+        """Get segment files of log directory in write order."""
+        return sorted(directory.glob(f"*{SEGMENT_SUFFIX}"))
+
+    @classmethod
+    def read(cls, directory: Path) -> Iterator[PendingWrite]:
+        """Read writes of log directory, a line torn by a crash is skipped."""
+        for path in cls.segments(directory):
+            with path.open("rb") as segment:
+                for line in segment:
+                    try:
+                        yield PendingWrite.load(line)
+                    except (ValueError, KeyError, TypeError):
+                        logger.warning(f"Skipped unreadable write-behind log line of {path}")
+
+    def open(self) -> list[tuple[Path, int]]:
+        """Create and lock log directory of this process, claim directories of processes which are gone.
+
+        Directory is locked before it gets its name, so it is never claimed by
+        another process starting meanwhile. Claimed directories stay locked
+        until `discard`.
+        """
+        self.root.mkdir(parents=True, exist_ok=True)
+        staging = self.root / f".{self.directory.name}"
+        staging.mkdir()
+        self._lock_fd = _lock(staging)
+        staging.rename(self.directory)
+
+        orphans = []
+        for directory in sorted(self.root.iterdir()):
+            if directory == self.directory or directory.name.startswith("."):
+                continue
+            fd = _lock(directory)
+            if fd is not None:
+                orphans.append((directory, fd))
+        return orphans
+
+    @staticmethod
+    def discard(orphans: list[tuple[Path, int]]) -> None:
+        """Remove claimed directories once their writes are in this log."""
+        for directory, fd in orphans:
+            shutil.rmtree(directory, ignore_errors=True)
+            os.close(fd)
+
+    def _sync_directory(self) -> None:
+        """Sync directory entries, so a new segment file survives a crash."""
+        fd = os.open(self.directory, os.O_RDONLY)
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+
+    def append(self, lines: list[bytes]) -> None:
+        """Append lines to current segment and sync them to disk."""
+        if self._file is None:
+            self._file = self._segment_path(self._segment).open("ab")
+            if self.fsync:
+                self._sync_directory()
+        self._file.write(b"".join(lines))
+        self._file.flush()
+        if self.fsync:
+            os.fsync(self._file.fileno())
+
+    def rotate(self) -> int:
+        """Seal current segment, next append starts a new one, get number of the last sealed segment."""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+            self._segment += 1
+        return self._segment - 1
+
+    def drop(self, upto: int) -> None:
+        """Remove sealed segments up to `upto`, their writes are committed."""
+        for path in self.segments(self.directory):
+            if int(path.stem) <= upto:
+                path.unlink()
+
+    def close(self) -> None:
+        """Close log, directory is removed when no write is left in it."""
+        self.rotate()
+        if self._lock_fd is None:
+            return
+        if not self.segments(self.directory):
+            shutil.rmtree(self.directory, ignore_errors=True)
+        os.close(self._lock_fd)
+        self._lock_fd = None
+
+
+class WriteBehindQueue:
+    """Queue of entity writes acknowledged once logged and written to database in background batches.
+
+    Pending writes are coalesced by entity uuid. At most `max_pending`
+    entities are queued, further writes wait up to `enqueue_timeout` seconds
+    for a flush and then fail with 503. Batches are flushed every
+    `flush_interval` seconds, or as soon as `batch_size` entities are queued.
+    """
+
+    def __init__(
+            self,
+            apply: ApplyWrites,
+            session_factory: async_sessionmaker[AsyncSession],
+            directory: str | Path,
+            name: str,
+            batch_size: int = 500,
+            flush_interval: float = 1.0,
+            max_pending: int = 10000,
+            enqueue_timeout: float = 1.0,
+            retry_interval: float = 5.0,
+            fsync: bool = True,
+    ) -> None:
+        """Initialize closed queue, writes are accepted after `start`."""
+        if batch_size < 1 or max_pending < 1:
+            raise ValueError("Batch size and queue size must be positive")
+        self._apply = apply
+        self._session_factory = session_factory
+        self.name = name
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        self.enqueue_timeout = enqueue_timeout
+        self.retry_interval = retry_interval
+        self._log = WriteAheadLog(directory, fsync=fsync)
+        self._pending: dict[_uuid.UUID, PendingWrite] = {}
+        self._in_flight: dict[_uuid.UUID, PendingWrite] = {}
+        self._buffer: list[tuple[PendingWrite, bytes]] = []
+        self._buffer_synced: asyncio.Future | None = None
+        self._writers: set[asyncio.Task] = set()
+        self._log_lock = asyncio.Lock()
+        self._room = asyncio.Condition()
+        self._wakeup = asyncio.Event()
+        self._stopping = asyncio.Event()
+        self._accepting = False
+        self._task: asyncio.Task | None = None
+        registry.gauge(
+            "write_behind_pending", "Entities with writes not in database yet.", lambda: float(self.size), queue=name
+        )
+
+    @property
+    def size(self) -> int:
+        """Get number of entities with queued writes."""
+        return len(self._pending) + len(self._in_flight) + len(self._buffer)
+
+    def get(self, uuid: _uuid.UUID) -> PendingWrite | None:
+        """Get write of entity which is not in database yet, None when there is none."""
+        queued = self._in_flight.get(uuid)
+        pending = self._pending.get(uuid)
+        if queued is None or pending is None:
+            return queued or pending
+        return queued.merge(pending)
+
+    def _unavailable(self, detail: str) -> DomainException:
+        """Get error of a write which was not queued."""
+        return DomainException(
+            status_code=503, detail=detail, error_code=DomainErrorCodeEnum.WRITE_QUEUE_UNAVAILABLE.value
+        )
+
+    def _has_room(self, uuid: _uuid.UUID) -> bool:
+        """Check if write can be queued, writes of queued entities are coalesced and always fit."""
+        return uuid in self._pending or self.size < self.max_pending
+
+    async def _reserve(self, uuid: _uuid.UUID) -> None:
+        """Wait until write fits into queue, flushing it meanwhile."""
+        if self._has_room(uuid):
+            return
+        self._wakeup.set()
+        async with self._room:
+            try:
+                await asyncio.wait_for(self._room.wait_for(lambda: self._has_room(uuid)), self.enqueue_timeout)
+            except asyncio.TimeoutError:
+                write_behind_backpressure_total.inc(queue=self.name, result="rejected")
+                raise self._unavailable("Write queue is full, retry later") from None
+        write_behind_backpressure_total.inc(queue=self.name, result="waited")
+
+    async def enqueue(self, write: PendingWrite) -> None:
+        """Queue write, return once it is synced to the log.
+
+        Writes arriving while the log is synced are appended together by the
+        next sync, so concurrent writes share one fsync.
+        """
+        line = write.dump()
+        if not self._accepting:
+            raise self._unavailable("Write queue is not accepting writes")
+        await self._reserve(write.uuid)
+        if not self._accepting:
+            raise self._unavailable("Write queue is not accepting writes")
+        self._buffer.append((write, line))
+        if self._buffer_synced is None:
+            self._buffer_synced = asyncio.get_running_loop().create_future()
+            writer = asyncio.create_task(self._write_buffer())
+            self._writers.add(writer)
+            writer.add_done_callback(self._writers.discard)
+        synced = self._buffer_synced
+        try:
+            await asyncio.shield(synced)
+        except OSError as exc:
+            logger.error(f"Write-behind log of {self.name} failed: {exc!r}")
+            raise self._unavailable("Write queue is not accepting writes") from None
+        write_behind_enqueued_total.inc(queue=self.name, kind=write.kind)
+
+    async def _write_buffer(self) -> None:
+        """Sync buffered writes to the log and make them pending."""
+        async with self._log_lock:
+            buffered, synced = self._buffer, self._buffer_synced
+            self._buffer, self._buffer_synced = [], None
+            started_at = time.perf_counter()
+            try:
+                await asyncio.to_thread(self._log.append, [line for _, line in buffered])
+            except Exception as exc:
+                synced.set_exception(exc)
+                return
+            write_behind_log_sync_duration.observe(time.perf_counter() - started_at, queue=self.name)
+            for write, _ in buffered:
+                if coalesce(self._pending, write):
+                    write_behind_coalesced_total.inc(queue=self.name)
+            synced.set_result(None)
+        if len(self._pending) >= self.batch_size:
+            self._wakeup.set()
+
+    async def _transaction(self, writes: list[PendingWrite]) -> None:
+        """Apply writes in a transaction of their own."""
+        async with self._session_factory() as session:
+            async with session.begin():
+                applied = await self._apply(session, writes)
+            await run_pending_invalidations(session.info)
+        if applied < len(writes):
+            skipped = len(writes) - applied
+            write_behind_skipped_total.inc(skipped, queue=self.name)
+            logger.info(f"Write-behind skipped {skipped} writes of {self.name} which are gone or changed meanwhile")
+
+    async def _apply_batch(self, writes: list[PendingWrite]) -> None:
+        """Apply batch, when database rejects it the writes are applied one by one and the rejected ones dropped.
+
+        Transient failures are raised, the batch is retried as a whole.
+        """
+        started_at = time.perf_counter()
+        try:
+            await self._transaction(writes)
+        except Exception as exc:
+            if is_transient(exc):
+                raise
+            logger.warning(f"Write-behind batch of {len(writes)} {self.name} writes failed, isolating: {exc!r}")
+            for write in writes:
+                try:
+                    await self._transaction([write])
+                except Exception as write_exc:
+                    if is_transient(write_exc):
+                        raise
+                    write_behind_dropped_total.inc(queue=self.name)
+                    logger.error(f"Write-behind {write.kind} of {self.name} {write.uuid} dropped: {write_exc!r}")
+        write_behind_flush_duration.observe(time.perf_counter() - started_at, queue=self.name)
+        write_behind_flushed_total.inc(len(writes), queue=self.name)
+
+    async def flush(self) -> int:
+        """Write pending writes to database in batches of `batch_size`, get number of flushed entities.
+
+        On failure writes of batches not committed are queued again, under
+        writes which arrived meanwhile, and the error is raised.
+        """
+        async with self._log_lock:
+            if not self._pending:
+                return 0
+            sealed = self._log.rotate()
+            self._in_flight, self._pending = self._pending, {}
+        writes = list(self._in_flight.values())
+        flushed = 0
+        try:
+            for start in range(0, len(writes), self.batch_size):
+                await self._apply_batch(writes[start:start + self.batch_size])
+                flushed = min(start + self.batch_size, len(writes))
+        except BaseException:
+            newer, self._pending = self._pending, {}
+            for write in (*writes[flushed:], *newer.values()):
+                coalesce(self._pending, write)
+            raise
+        finally:
+            self._in_flight = {}
+            async with self._room:
+                self._room.notify_all()
+        await asyncio.to_thread(self._log.drop, sealed)
+        logger.debug(f"Write-behind flushed {flushed} {self.name} writes")
+        return flushed
+
+    async def _sleep(self, seconds: float) -> None:
+        """Pause until woken up, stopped or timed out."""
+        try:
+            await asyncio.wait_for(self._wakeup.wait(), timeout=seconds)
+        except asyncio.TimeoutError:
+            pass
+        self._wakeup.clear()
+
+    async def run(self) -> None:
+        """Flush every `flush_interval` seconds until stopped, then flush what is left."""
+        while not self._stopping.is_set():
+            await self._sleep(self.flush_interval)
+            try:
+                await self.flush()
+            except Exception as exc:
+                logger.warning(
+                    f"Write-behind flush of {self.name} failed, {self.size} writes retried in "
+                    f"{self.retry_interval}s: {exc!r}"
+                )
+                await self._sleep(self.retry_interval)
+        try:
+            await self.flush()
+        except Exception as exc:
+            logger.error(
+                f"Write-behind flush of {self.name} failed on shutdown, {self.size} writes left in log: {exc!r}"
+            )
+
+    async def start(self) -> asyncio.Task:
+        """Open log, recover writes of processes which are gone and flush in background task."""
+        orphans = await asyncio.to_thread(self._log.open)
+        recovered: dict[_uuid.UUID, PendingWrite] = {}
+        for directory, _ in orphans:
+            for write in WriteAheadLog.read(directory):
+                coalesce(recovered, write)
+        if recovered:
+            await asyncio.to_thread(self._log.append, [write.dump() for write in recovered.values()])
+            self._pending.update(recovered)
+            logger.warning(f"Write-behind recovered writes of {len(recovered)} {self.name} from {len(orphans)} logs")
+        await asyncio.to_thread(self._log.discard, orphans)
+        self._accepting = True
+        self._stopping.clear()
+        self._task = asyncio.create_task(self.run())
+        return self._task
+
+    async def stop(self) -> None:
+        """Stop accepting writes, flush queued ones and close log."""
+        self._accepting = False
+        if self._writers:
+            await asyncio.gather(*self._writers, return_exceptions=True)
+        self._stopping.set()
+        self._wakeup.set()
+        if self._task is not None:
+            await self._task
+            self._task = None
+        self._log.close()
@@ -1,3 +1,3 @@
 #!/bin/bash
 
-uvicorn main:init_app --host "$NOTES_APP_HOST" --port "$NOTES_APP_PORT"
+exec python -m notes.src.runner --host "$NOTES_APP_HOST" --port "$NOTES_APP_PORT"
@@ -1,33 +1,24 @@
-import os
-
-import uvicorn
 from fastapi import FastAPI
-from loguru import logger
 
+from common.packages.src.core.exceptions.exception_handlers import exception_handlers
+from common.packages.src.core.serialization import ORJSONResponse
+from common.packages.src.db.consistency import ReadYourWritesMiddleware
+from common.packages.src.metrics.http import RequestMetricsMiddleware
 from notes.src.api import api_router
+from notes.src.lifespan import lifespan
 
 
 def init_app() -> FastAPI:
     """Create FastAPI app."""
-    app = FastAPI()
+    app = FastAPI(default_response_class=ORJSONResponse, exception_handlers=exception_handlers, lifespan=lifespan)
     app.include_router(api_router)
-
-    @app.on_event("startup")
-    async def startup() -> None:
-        logger.info("Startup: Message")
-
-    @app.on_event("shutdown")
-    async def shutdown() -> None:
-        logger.info("Shutdown: Message")
+    app.add_middleware(ReadYourWritesMiddleware)
+    app.add_middleware(RequestMetricsMiddleware)
 
     return app
 
 
 if __name__ == "__main__":
-    uvicorn.run(
-        "main:init_app",
-        host=os.getenv("NOTES_APP_HOST", "0.0.0.0"),
-        port=int(os.getenv("NOTES_APP_PORT", 8000)),
-        reload=True,
-        factory=True,
-    )
+    from notes.src.runner import main
+
+    main()
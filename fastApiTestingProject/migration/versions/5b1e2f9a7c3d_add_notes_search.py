@@ -0,0 +1,61 @@
+"""add notes full-text search
+
+Revision ID: 5b1e2f9a7c3d
+Revises: c7298b689bcf
+Create Date: 2026-10-18 10:12:31.402718
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = '5b1e2f9a7c3d'
+down_revision: Union[str, None] = 'c7298b689bcf'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Keep in sync with Note.search_vector, later edits of the model need a new migration.
+SEARCH_VECTOR_EXPRESSION = (
+    "setweight(to_tsvector('simple', coalesce(title, '')), 'A') || "
+    "setweight(to_tsvector('simple', coalesce(description, '')), 'B')"
+)
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    op.add_column(
+        'store_item',
+        sa.Column(
+            'search_vector',
+            postgresql.TSVECTOR(),
+            sa.Computed(SEARCH_VECTOR_EXPRESSION, persisted=True),
+            nullable=True,
+        ),
+    )
+    # Build indexes without blocking writes to the table.
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_store_item_search_vector',
+            'store_item',
+            ['search_vector'],
+            postgresql_using='gin',
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            'ix_store_item_title_trgm',
+            'store_item',
+            ['title'],
+            postgresql_using='gin',
+            postgresql_ops={'title': 'gin_trgm_ops'},
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_store_item_title_trgm', table_name='store_item', postgresql_concurrently=True)
+        op.drop_index('ix_store_item_search_vector', table_name='store_item', postgresql_concurrently=True)
+    op.drop_column('store_item', 'search_vector')
@@ -0,0 +1,49 @@
+"""index live notes
+
+Revision ID: 8d4c0a6e2b91
+Revises: 5b1e2f9a7c3d
+Create Date: 2026-10-18 12:20:47.118305
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '8d4c0a6e2b91'
+down_revision: Union[str, None] = '5b1e2f9a7c3d'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+LIVE_SORT_FIELDS = ('created_at', 'updated_at', 'title')
+
+
+def upgrade() -> None:
+    # store_item was created without DeletableMixin columns.
+    op.add_column('store_item', sa.Column('is_deleted', sa.Boolean(), server_default='f', nullable=False))
+    op.add_column('store_item', sa.Column('deleted_at', sa.DateTime(), nullable=True))
+    op.add_column('store_item', sa.Column('deleted_by', sa.UUID(), nullable=True))
+    op.create_foreign_key('store_item_deleted_by_fkey', 'store_item', 'user', ['deleted_by'], ['uuid'])
+    # Listings of live notes of a user seek on (user_id, sort field, uuid), soft deleted rows stay out of them.
+    with op.get_context().autocommit_block():
+        for field in LIVE_SORT_FIELDS:
+            op.create_index(
+                f'ix_store_item_live_user_id_{field}',
+                'store_item',
+                ['user_id', field, 'uuid'],
+                postgresql_where=sa.text('is_deleted = false'),
+                postgresql_concurrently=True,
+            )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for field in LIVE_SORT_FIELDS:
+            op.drop_index(
+                f'ix_store_item_live_user_id_{field}', table_name='store_item', postgresql_concurrently=True
+            )
+    op.drop_constraint('store_item_deleted_by_fkey', 'store_item', type_='foreignkey')
+    op.drop_column('store_item', 'deleted_by')
+    op.drop_column('store_item', 'deleted_at')
+    op.drop_column('store_item', 'is_deleted')
@@ -0,0 +1,49 @@
+"""archive purged notes
+
+Revision ID: e3a7c51f0d24
+Revises: 8d4c0a6e2b91
+Create Date: 2026-10-18 13:05:12.774160
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'e3a7c51f0d24'
+down_revision: Union[str, None] = '8d4c0a6e2b91'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('store_item_archive',
+    sa.Column('uuid', sa.UUID(), nullable=False),
+    sa.Column('title', sa.String(length=100), nullable=False),
+    sa.Column('description', sa.Text(), nullable=False),
+    sa.Column('user_id', sa.UUID(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=False),
+    sa.Column('deleted_at', sa.DateTime(), nullable=True),
+    sa.Column('deleted_by', sa.UUID(), nullable=True),
+    sa.Column('archived_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+    sa.PrimaryKeyConstraint('uuid')
+    )
+    op.create_index('ix_store_item_archive_user_id', 'store_item_archive', ['user_id'])
+    # Purge worker picks the oldest soft deleted rows, live rows stay out of this index.
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_store_item_deleted_at',
+            'store_item',
+            ['deleted_at', 'uuid'],
+            postgresql_where=sa.text('is_deleted = true'),
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_store_item_deleted_at', table_name='store_item', postgresql_concurrently=True)
+    op.drop_index('ix_store_item_archive_user_id', table_name='store_item_archive')
+    op.drop_table('store_item_archive')
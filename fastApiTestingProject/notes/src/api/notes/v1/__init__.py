@@ -0,0 +1,11 @@
+"""Package with notes v1 routes."""
+
+from fastapi import APIRouter
+
+from notes.src.api.notes.v1.core import router as core
+from notes.src.api.notes.v1.stream import router as stream
+
+router = APIRouter()
+
+router.include_router(stream, tags=["Notes"], prefix="/notes")
+router.include_router(core, tags=["Notes"], prefix="/notes")
@@ -1,8 +1,258 @@
-from fastapi import APIRouter, Depends
+"""Notes CRUD and batch endpoints.
 
-router = APIRouter()
+Every endpoint works with notes of the authenticated user only, notes of other
+users and soft deleted notes are reported as not found. Batch endpoints run in
+the request transaction, so they either apply to every requested note or fail.
 
+Responses are projected to NoteSchema fields and rendered with orjson directly,
+`response_model` only documents them: a returned response skips its validation.
+Read endpoints select plain rows of these fields instead of ORM objects.
 
-@router.get("/", response_model=..., dependencies=[Depends()])
-async def get_all_notes():
-    pass
+GET endpoints send ETag validators. Conditional requests are checked against
+a probe selecting only version and updated_at, 304 is returned without loading
+or serializing notes. Pages are validated by If-None-Match only, because notes
+leaving a page do not change the newest modification time of the page.
+
+Note ETag is its version counter. PATCH and DELETE with If-Match are applied
+by a single conditional UPDATE and fail with 412 if the note was changed since.
+
+When write-behind is enabled, POST and PATCH sent with `Prefer: respond-async`
+are answered with 202 as soon as the write is queued, the note is written
+within WRITE_BEHIND_FLUSH_INTERVAL seconds. Reads see the write after that.
+PATCH with If-Match is always applied right away.
+"""
+from datetime import datetime
+from typing import Annotated, Any, Iterator
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, Response, status
+
+from common.packages.src.core.exceptions.base import DomainException
+from common.packages.src.core.exceptions.error_code import DomainErrorCodeEnum
+from common.packages.src.core.schemas.exception_schema import ExceptionSchema
+from common.packages.src.core.serialization import ORJSONResponse
+from common.packages.src.dependencies.conditional import (
+    VERSION_FIELDS,
+    Preconditions,
+    collection_etag,
+    entity_etag,
+    not_modified,
+    validators,
+)
+from common.packages.src.dependencies.prefer import RESPOND_ASYNC, Preferences
+from common.packages.src.dependencies.query import Pagination, SearchParams
+from common.packages.src.schemas.notes import (
+    BatchCreateNotesSchema,
+    BatchDeleteNotesSchema,
+    BatchGetNotesSchema,
+    BatchUpdateNotesSchema,
+    CreateNoteSchema,
+    NoteSchema,
+    NotesBatchSchema,
+    NotesCursorPageSchema,
+    NotesPageSchema,
+    NotesSearchPageSchema,
+    QueuedNoteSchema,
+    UpdateNoteSchema,
+    note_projection,
+    search_hit_projection,
+)
+from common.packages.src.services.auth import get_current_user_uuid
+from common.packages.src.workers.write_behind import WriteBehindQueue
+from notes.src.providers.service import get_notes_service, get_write_behind_queue
+from notes.src.services.core import NoteService
+
+router = APIRouter(
+    responses={
+        status.HTTP_401_UNAUTHORIZED: {"model": ExceptionSchema},
+        status.HTTP_404_NOT_FOUND: {"model": ExceptionSchema},
+    }
+)
+
+ORDER_FIELDS = ("created_at", "updated_at", "title")
+
+
+Service = Annotated[NoteService, Depends(get_notes_service)]
+UserUUID = Annotated[UUID, Depends(get_current_user_uuid)]
+Pages = Annotated[Pagination, Depends(Pagination)]
+Conditions = Annotated[Preconditions, Depends(Preconditions)]
+Search = Annotated[SearchParams, Depends(SearchParams)]
+Prefer = Annotated[Preferences, Depends(Preferences)]
+WriteQueue = Annotated[WriteBehindQueue | None, Depends(get_write_behind_queue)]
+QUEUED_RESPONSES = {
+    status.HTTP_202_ACCEPTED: {"model": QueuedNoteSchema},
+    status.HTTP_503_SERVICE_UNAVAILABLE: {"model": ExceptionSchema},
+}
+
+
+def check_order_field(order_by: str) -> str:
+    """Allow ordering by indexed note fields only."""
+    if order_by not in ORDER_FIELDS:
+        raise DomainException(
+            status_code=400,
+            detail=f"Notes can be ordered by {', '.join(ORDER_FIELDS)}",
+            error_code=DomainErrorCodeEnum.INVALID_ORDER_FIELD.value,
+        )
+    return order_by
+
+
+def note_response(note: Any, status_code: int = status.HTTP_200_OK) -> ORJSONResponse:
+    """Render note with its validators."""
+    headers = validators(entity_etag(note.version), note.updated_at)
+    return ORJSONResponse(note_projection(note), status_code=status_code, headers=headers)
+
+
+def queued_response(note: dict) -> ORJSONResponse:
+    """Render note queued for writing, it has no validators until written."""
+    return ORJSONResponse(note, status_code=status.HTTP_202_ACCEPTED, headers=Preferences.applied(RESPOND_ASYNC))
+
+
+def versions_of(items: list[dict]) -> Iterator[tuple[UUID, datetime]]:
+    """Get uuid and modification time of serialized notes."""
+    return ((item["uuid"], item["updated_at"]) for item in items)
+
+
+@router.get("", response_model=NotesPageSchema)
+async def list_notes(service: Service, user_uuid: UserUUID, pages: Pages, preconditions: Conditions) -> Response:
+    """Get page of notes by offset."""
+    query = {"limit": pages.limit, "offset": pages.offset, "order_by_field": check_order_field(pages.order_by)}
+    if preconditions.if_none_match is not None:
+        versions = await service.list_owned(user_uuid, **query, columns=VERSION_FIELDS)
+        etag = collection_etag((row[0], row[1]) for row in versions)
+        if preconditions.not_modified(etag):
+            return not_modified(validators(etag))
+
+    notes = note_projection.many(await service.list_owned(user_uuid, **query, columns=note_projection.fields))
+    return ORJSONResponse(
+        {"items": notes, "limit": pages.limit, "offset": pages.offset},
+        headers=validators(collection_etag(versions_of(notes))),
+    )
+
+
+@router.get("/cursor", response_model=NotesCursorPageSchema)
+async def list_notes_by_cursor(
+        service: Service, user_uuid: UserUUID, pages: Pages, preconditions: Conditions
+) -> Response:
+    """Get page of notes by cursor returned with the previous page."""
+    query = {
+        "limit": pages.limit,
+        "cursor": pages.cursor,
+        "order_by_field": check_order_field(pages.order_by),
+        "descending": pages.descending,
+    }
+    if preconditions.if_none_match is not None:
+        versions = await service.list_owned_by_cursor(user_uuid, **query, columns=VERSION_FIELDS)
+        etag = collection_etag(
+            ((row[0], row[1]) for row in versions.items), versions.next_cursor, versions.previous_cursor
+        )
+        if preconditions.not_modified(etag):
+            return not_modified(validators(etag))
+
+    page = await service.list_owned_by_cursor(user_uuid, **query, columns=note_projection.fields)
+    notes = note_projection.many(page.items)
+    return ORJSONResponse(
+        {"items": notes, "next_cursor": page.next_cursor, "previous_cursor": page.previous_cursor},
+        headers=validators(collection_etag(versions_of(notes), page.next_cursor, page.previous_cursor)),
+    )
+
+
+@router.get("/search", response_model=NotesSearchPageSchema)
+async def search_notes(service: Service, user_uuid: UserUUID, search: Search) -> ORJSONResponse:
+    """Search notes by title and description, best matches first."""
+    page = await service.search_owned(
+        user_uuid,
+        search.q,
+        mode=search.mode,
+        limit=search.limit,
+        cursor=search.cursor,
+        columns=note_projection.fields,
+    )
+    return ORJSONResponse({"items": search_hit_projection.many(page.items), "next_cursor": page.next_cursor})
+
+
+@router.post("", response_model=NoteSchema, status_code=status.HTTP_201_CREATED, responses=QUEUED_RESPONSES)
+async def create_note(
+        data: CreateNoteSchema, service: Service, user_uuid: UserUUID, preferences: Prefer, queue: WriteQueue
+) -> ORJSONResponse:
+    """Create note, or queue its creation if client prefers to respond async."""
+    if queue is not None and preferences.respond_async:
+        return queued_response(await service.enqueue_create_owned(data, user_uuid, queue))
+    note = await service.create_owned(data, user_uuid)
+    return note_response(note, status.HTTP_201_CREATED)
+
+
+@router.post(":batchCreate", response_model=NotesBatchSchema, status_code=status.HTTP_201_CREATED)
+async def batch_create_notes(data: BatchCreateNotesSchema, service: Service, user_uuid: UserUUID) -> ORJSONResponse:
+    """Create notes with a single query."""
+    notes = await service.bulk_create_owned(data.notes, user_uuid)
+    return ORJSONResponse({"notes": note_projection.many(notes)}, status_code=status.HTTP_201_CREATED)
+
+
+@router.post(":batchGet", response_model=NotesBatchSchema)
+async def batch_get_notes(data: BatchGetNotesSchema, service: Service, user_uuid: UserUUID) -> ORJSONResponse:
+    """Get notes in requested order with a single query."""
+    notes = await service.get_many_owned(data.uuids, user_uuid, columns=note_projection.fields)
+    return ORJSONResponse({"notes": note_projection.many(notes)})
+
+
+@router.post(":batchUpdate", response_model=NotesBatchSchema)
+async def batch_update_notes(data: BatchUpdateNotesSchema, service: Service, user_uuid: UserUUID) -> ORJSONResponse:
+    """Partially update notes, notes updating the same fields share one query."""
+    notes = await service.bulk_update_owned({item.uuid: item for item in data.notes}, user_uuid)
+    return ORJSONResponse({"notes": note_projection.many(notes)})
+
+
+@router.post(":batchDelete", response_model=NotesBatchSchema)
+async def batch_delete_notes(data: BatchDeleteNotesSchema, service: Service, user_uuid: UserUUID) -> ORJSONResponse:
+    """Soft delete notes with a single query."""
+    notes = await service.bulk_soft_delete_owned(data.uuids, user_uuid)
+    return ORJSONResponse({"notes": note_projection.many(notes)})
+
+
+@router.get("/{uuid}", response_model=NoteSchema)
+async def get_note(uuid: UUID, service: Service, user_uuid: UserUUID, preconditions: Conditions) -> Response:
+    """Get note, conditional request is answered by version probe."""
+    version = None
+    if preconditions.is_conditional:
+        probe = await service.get_owned_version(uuid, user_uuid)
+        etag = entity_etag(probe.version)
+        if preconditions.not_modified(etag, probe.updated_at):
+            return not_modified(validators(etag, probe.updated_at))
+        version = probe.version
+    note = await service.get_owned(uuid, user_uuid, version)
+    return note_response(note)
+
+
+@router.patch(
+    "/{uuid}",
+    response_model=NoteSchema,
+    responses={status.HTTP_412_PRECONDITION_FAILED: {"model": ExceptionSchema}, **QUEUED_RESPONSES},
+)
+async def update_note(
+        uuid: UUID,
+        data: UpdateNoteSchema,
+        service: Service,
+        user_uuid: UserUUID,
+        preconditions: Conditions,
+        preferences: Prefer,
+        queue: WriteQueue,
+) -> ORJSONResponse:
+    """Partially update note, If-Match makes the update conditional on note version.
+
+    Unconditional update is queued if client prefers to respond async.
+    """
+    if queue is not None and preferences.respond_async and preconditions.if_match is None:
+        return queued_response(await service.enqueue_update_owned(uuid, data, user_uuid, queue))
+    note = await service.update_owned(uuid, data, user_uuid, expected_version=preconditions.expected_version)
+    return note_response(note)
+
+
+@router.delete(
+    "/{uuid}",
+    response_model=NoteSchema,
+    responses={status.HTTP_412_PRECONDITION_FAILED: {"model": ExceptionSchema}},
+)
+async def delete_note(uuid: UUID, service: Service, user_uuid: UserUUID, preconditions: Conditions) -> ORJSONResponse:
+    """Soft delete note, If-Match makes the deletion conditional on note version."""
+    note = await service.soft_delete_owned(uuid, user_uuid, expected_version=preconditions.expected_version)
+    return note_response(note)
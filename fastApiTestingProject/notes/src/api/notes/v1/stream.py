@@ -0,0 +1,39 @@
+"""Notes streaming endpoints."""
+from typing import Annotated, AsyncIterator
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, Query, status
+from fastapi.responses import StreamingResponse
+
+from common.packages.src.core.schemas.exception_schema import ExceptionSchema
+from common.packages.src.core.serialization import dumps
+from common.packages.src.db.session import get_async_session
+from common.packages.src.schemas.notes import note_projection
+from common.packages.src.services.auth import get_current_user_uuid
+from notes.src.providers.service import provide_notes_service
+from notes.src.services.core import NoteService
+
+router = APIRouter(responses={status.HTTP_401_UNAUTHORIZED: {"model": ExceptionSchema}})
+
+
+async def iter_notes_ndjson(user_uuid: UUID, batch_size: int) -> AsyncIterator[bytes]:
+    """Yield notes of user serialized as NDJSON, one chunk per fetched batch.
+
+    Session is opened inside the generator because it has to outlive
+    the endpoint function while the response body is being sent.
+    """
+    async with get_async_session() as session:
+        service = provide_notes_service(session)
+        async for batch in service.stream(
+                filters=NoteService.owned_by(user_uuid), batch_size=batch_size, columns=note_projection.fields
+        ):
+            yield b"".join(dumps(note) + b"\n" for note in note_projection.many(batch))
+
+
+@router.get("/stream", response_class=StreamingResponse)
+async def stream_notes(
+        user_uuid: Annotated[UUID, Depends(get_current_user_uuid)],
+        batch_size: int = Query(500, ge=1, le=10000),
+) -> StreamingResponse:
+    """Export notes of current user as newline delimited json."""
+    return StreamingResponse(iter_notes_ndjson(user_uuid, batch_size), media_type="application/x-ndjson")
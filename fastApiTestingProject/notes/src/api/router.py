@@ -2,7 +2,9 @@
 from fastapi import APIRouter
 
 
+from notes.src.api.notes.v1 import router as notes_v1
 from notes.src.api.v1 import router as api_v1
 
 api_router = APIRouter(prefix="/api")
-api_router.include_router(api_v1, prefix="/v1")
\ No newline at end of file
+api_router.include_router(api_v1, prefix="/v1")
+api_router.include_router(notes_v1, prefix="/v1")
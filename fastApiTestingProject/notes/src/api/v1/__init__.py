@@ -3,7 +3,9 @@
 from fastapi import APIRouter
 
 from notes.src.api.v1.healthcheck import router as healthcheck
+from notes.src.api.v1.metrics import router as metrics
 
 router = APIRouter()
 
 router.include_router(healthcheck, tags=["HealthCheck"], prefix="/health-check")
+router.include_router(metrics, tags=["Metrics"], prefix="/metrics")
@@ -1,11 +1,29 @@
 # """Microservice healthcheck endpoints."""
-from fastapi import APIRouter
+from fastapi import APIRouter, Request
 from fastapi.responses import JSONResponse
 
+from common.packages.src.conf.settings import settings
+from common.packages.src.core.lifecycle import draining
+from common.packages.src.db.engine import engines
+from common.packages.src.db.warmup import pool_exhausted
+
 router = APIRouter()
 
 
 @router.get("/")
+@router.get("/live")
 async def get_health_check_status() -> JSONResponse:
-    """Get health check status."""
-    return JSONResponse(content={"message": "Success."}, status_code=200)
\ No newline at end of file
+    """Get liveness status, the process serves requests."""
+    return JSONResponse(content={"message": "Success."}, status_code=200)
+
+
+@router.get("/ready")
+async def get_readiness_status(request: Request) -> JSONResponse:
+    """Get readiness status, fails until warm up completes, while database pool is exhausted and when draining."""
+    if draining.is_set():
+        return JSONResponse(content={"message": "Draining."}, status_code=503)
+    if not getattr(request.app.state, "ready", False):
+        return JSONResponse(content={"message": "Warming up."}, status_code=503)
+    if pool_exhausted(engines.get_engine(settings.postgres.db_uri, settings.postgres.echo)):
+        return JSONResponse(content={"message": "Database pool exhausted."}, status_code=503)
+    return JSONResponse(content={"message": "Success."}, status_code=200)
@@ -0,0 +1,23 @@
+"""Microservice metrics endpoints."""
+import asyncio
+
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+
+from common.packages.src.conf.settings import settings
+from common.packages.src.metrics import registry
+
+router = APIRouter()
+
+
+@router.get("/", response_class=PlainTextResponse)
+async def get_metrics() -> PlainTextResponse:
+    """Get metrics in Prometheus text format, of all workers when they share a metrics directory."""
+    directory = settings.metrics.multiproc_dir
+    if directory:
+        from common.packages.src.metrics.multiprocess import render_merged
+
+        content = await asyncio.to_thread(render_merged, directory, registry)
+    else:
+        content = registry.render()
+    return PlainTextResponse(content, media_type="text/plain; version=0.0.4")
@@ -0,0 +1,121 @@
+"""Application lifespan.
+
+Startup configures mappers and then warms the database up in background:
+pool connections are opened and hot note statements are compiled and
+prepared on each of them. Readiness probe fails until warm up completes,
+liveness does not depend on it. Failed warm up is retried, so the app
+becomes ready as soon as the database is reachable.
+
+With write-behind enabled, note writes left in logs of processes which are
+gone are recovered at startup, queued writes are flushed on shutdown before
+connections are released. With a metrics directory set, metrics of the
+worker are snapshotted into it for scrapes served by other workers.
+
+Optional subsystems are imported only when enabled. With
+NOTES_APP_PROFILE_IMPORTS=true import cost of `main` in a fresh
+interpreter is logged at boot.
+"""
+import asyncio
+from contextlib import asynccontextmanager, suppress
+from typing import AsyncIterator
+from uuid import uuid4
+
+from fastapi import FastAPI
+from loguru import logger
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from common.packages.src.conf.settings import settings
+from common.packages.src.db.engine import engines, pool_limits
+from common.packages.src.db.models.note import LIVE_SORT_FIELDS
+from common.packages.src.db.warmup import configure_models, warm_up_connections
+from common.packages.src.schemas.notes import note_projection
+from notes.src.repositories.notes.core import NoteRepository
+from notes.src.services.core import NoteService
+
+WARM_UP_RETRY_INTERVAL = 5.0
+
+
+async def prime_statements(session: AsyncSession) -> None:
+    """Run note statements of hot endpoints, shaped like the ones of real requests."""
+    user_id = uuid4()
+    await NoteRepository(session).warm_up(
+        LIVE_SORT_FIELDS,
+        filters=NoteService.owned_by(user_id),
+        columns=note_projection.fields,
+        write_filters=NoteService.writable_by(user_id),
+    )
+
+
+async def warm_up(app: FastAPI) -> None:
+    """Warm database up until it succeeds, then mark app ready."""
+    config = settings.postgres
+    pool_size, _ = pool_limits(config)
+    connections = min(config.warmup_connections or pool_size, pool_size)
+    session_factory = engines.get_session_factory(config.db_uri, config.echo)
+    while True:
+        try:
+            await warm_up_connections(session_factory, connections, prime_statements)
+        except Exception as exc:
+            logger.warning(f"Database warm up failed, retrying in {WARM_UP_RETRY_INTERVAL}s: {exc!r}")
+            await asyncio.sleep(WARM_UP_RETRY_INTERVAL)
+        else:
+            break
+    app.state.ready = True
+    logger.info("Startup: warm up completed, ready")
+
+
+async def log_import_profile() -> None:
+    """Log per module import cost of the entry point."""
+    from common.packages.src.core.importtime import profile, summarize
+
+    try:
+        timings = await asyncio.to_thread(profile, "main")
+    except Exception as exc:
+        logger.warning(f"Import profiling failed: {exc!r}")
+    else:
+        logger.info(summarize(timings))
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    """Warm up and start background workers, stop them and release connections on shutdown."""
+    app.state.ready = False
+    configure_models()
+    engines.get_engine(settings.postgres.db_uri, settings.postgres.echo)
+    warm_up_task = asyncio.create_task(warm_up(app))
+    if settings.postgres.replica_uris:
+        engines.get_replica_set(settings.postgres.replica_uris, settings.postgres.echo).start()
+    purge_worker = None
+    if settings.purge.enabled:
+        from notes.src.workers.purge import create_purge_worker
+
+        purge_worker = create_purge_worker()
+        purge_worker.start()
+    write_behind = None
+    if settings.write_behind.enabled:
+        from notes.src.providers.service import get_write_behind_queue
+
+        write_behind = get_write_behind_queue()
+        await write_behind.start()
+    background = [asyncio.create_task(log_import_profile())] if settings.notes_app.profile_imports else []
+    if settings.metrics.multiproc_dir:
+        from common.packages.src.metrics import registry
+        from common.packages.src.metrics.multiprocess import run_snapshots
+
+        snapshots = run_snapshots(settings.metrics.multiproc_dir, registry, settings.metrics.snapshot_interval)
+        background.append(asyncio.create_task(snapshots))
+    logger.info("Startup: Message")
+    try:
+        yield
+    finally:
+        app.state.ready = False
+        for task in (warm_up_task, *background):
+            task.cancel()
+            with suppress(asyncio.CancelledError):
+                await task
+        if purge_worker is not None:
+            await purge_worker.stop()
+        if write_behind is not None:
+            await write_behind.stop()
+        await engines.dispose()
+        logger.info("Shutdown: Message")
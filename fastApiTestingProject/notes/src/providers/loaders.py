@@ -0,0 +1,22 @@
+from dataclasses import dataclass
+from typing import Any
+from uuid import UUID
+
+from fastapi import Depends
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from common.packages.src.db.session import get_session
+from common.packages.src.loaders import DataLoader, repository_loader
+from notes.src.repositories.notes.core import NoteRepository
+
+
+@dataclass
+class NoteLoaders:
+    """Request scoped batching loaders."""
+
+    notes: DataLoader[UUID, Any]
+
+
+def provide_loaders(session: AsyncSession = Depends(get_session)) -> NoteLoaders:
+    """Create loaders of request session, FastAPI builds them once per request."""
+    return NoteLoaders(notes=repository_loader(NoteRepository(session)))
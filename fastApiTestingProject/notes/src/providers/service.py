@@ -1,10 +1,64 @@
+import functools
+
+from fastapi import Depends
+from loguru import logger
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from common.packages.src.cache import InMemoryCache
+from common.packages.src.conf.settings import settings
+from common.packages.src.db.engine import engines
+from common.packages.src.db.session import get_session
+from common.packages.src.metrics.cache import register_cache_metrics
+from common.packages.src.workers.write_behind import WriteBehindQueue
+from notes.src.providers.loaders import NoteLoaders, provide_loaders
 from notes.src.repositories.notes.core import NoteRepository
 from notes.src.services.core import NoteService
 
 
-def provide_notes_service(session: AsyncSession) -> NoteService:
+@functools.cache
+def get_notes_cache() -> InMemoryCache | None:
+    """Get process-wide notes cache, None when disabled.
+
+    Other workers would keep serving notes changed by this one until
+    their cached copies expire, so with several workers it is disabled
+    unless enabled explicitly.
+    """
+    enabled = settings.cache.enabled
+    workers = settings.server.workers or 1
+    if enabled is None:
+        enabled = workers == 1
+    elif enabled and workers > 1:
+        logger.warning(f"Notes cache is per worker, {workers} workers may serve notes up to {settings.cache.ttl}s old")
+    if not enabled:
+        return None
+    notes_cache = InMemoryCache(max_size=settings.cache.max_size, ttl=settings.cache.ttl)
+    register_cache_metrics("notes", notes_cache.stats)
+    return notes_cache
+
+
+@functools.cache
+def get_write_behind_queue() -> WriteBehindQueue | None:
+    """Get process-wide queue of note writes, None when write-behind is disabled."""
+    if not settings.write_behind.enabled:
+        return None
+    from notes.src.workers.write_behind import create_write_behind_queue
+
+    return create_write_behind_queue()
+
+
+def provide_notes_service(session: AsyncSession, loaders: NoteLoaders | None = None) -> NoteService:
     notes_repository = NoteRepository(session)
-    notes_service = NoteService(notes_repository)
+    notes_cache = get_notes_cache()
+    session_factory = None
+    if notes_cache is not None:
+        session_factory = engines.get_session_factory(settings.postgres.db_uri, settings.postgres.echo)
+    notes_loader = loaders.notes if loaders is not None else None
+    notes_service = NoteService(notes_repository, notes_cache, session_factory, notes_loader)
     return notes_service
+
+
+def get_notes_service(
+        session: AsyncSession = Depends(get_session), loaders: NoteLoaders = Depends(provide_loaders)
+) -> NoteService:
+    """Get notes service bound to request session and loaders."""
+    return provide_notes_service(session, loaders)
@@ -2,13 +2,18 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from common.packages.src.repositories.base import BaseRepository
 from common.packages.src.repositories.mixins.delete_mixin import DeleteMixin
+from common.packages.src.repositories.mixins.purge_mixin import PurgeMixin
+from common.packages.src.repositories.mixins.search_mixin import SearchMixin
 
-from common.packages.src.db.models import Note
+from common.packages.src.db.models import Note, NoteArchive
+from common.packages.src.db.models.note import SEARCH_CONFIG
 from common.packages.src.schemas.notes import CreateNoteSchema, UpdateNoteSchema
 
 
-class NoteRepository(DeleteMixin, BaseRepository):
+class NoteRepository(SearchMixin, PurgeMixin, DeleteMixin, BaseRepository):
     model = Note
+    archive_model = NoteArchive
+    search_config = SEARCH_CONFIG
     create_scheme = CreateNoteSchema
     update_scheme = UpdateNoteSchema
 
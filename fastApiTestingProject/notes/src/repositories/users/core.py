@@ -0,0 +1,13 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from common.packages.src.repositories.base import BaseRepository
+
+from common.packages.src.db.models import User
+
+
+class UserRepository(BaseRepository):
+    model = User
+
+    def __init__(self, session: AsyncSession):
+        """Initialize users repository with async session."""
+        super().__init__(session)
@@ -0,0 +1,151 @@
+"""Run notes service.
+
+Usage:
+    python -m notes.src.runner
+    python -m notes.src.runner --workers 4 --loop uvloop --http httptools
+    python -m notes.src.runner --reload
+
+Worker processes (SERVER_WORKERS, CPU count by default) share one listening
+socket. Event loop and HTTP parser default to "auto", which picks uvloop and
+httptools when they are installed (`speedups` extra) and falls back to
+asyncio and h11 otherwise.
+
+POSTGRES_MAX_CONNECTIONS is the connection budget of all workers together,
+every worker pool gets its share of it, see `pool_limits`.
+
+With multiple workers /metrics of any worker reports all of them, workers
+snapshot their metrics into METRICS_MULTIPROC_DIR, a temporary directory
+unless set. Snapshots of a previous run are removed at start.
+
+On SIGTERM every worker fails readiness and keeps serving for
+SERVER_DRAIN_DELAY seconds, so load balancers stop routing to it, then
+stops accepting connections, waits up to SERVER_GRACEFUL_TIMEOUT seconds
+for requests in flight and shuts the app down.
+"""
+import argparse
+import logging
+import os
+import signal
+import tempfile
+import threading
+from types import FrameType
+
+import uvicorn
+from loguru import logger
+from uvicorn.supervisors import ChangeReload, Multiprocess
+
+from common.packages.src.conf.settings import settings
+from common.packages.src.core.lifecycle import draining
+from common.packages.src.db.engine import pool_limits
+from common.packages.src.metrics.multiprocess import clear_snapshots
+
+APP = "main:init_app"
+
+
+class DrainingServer(uvicorn.Server):
+    """Server which fails readiness and keeps serving for `drain_delay` seconds after SIGTERM before it stops."""
+
+    def __init__(self, config: uvicorn.Config, drain_delay: float = 0.0) -> None:
+        """Initialize server."""
+        super().__init__(config)
+        self.drain_delay = drain_delay
+
+    def handle_exit(self, sig: int, frame: FrameType | None) -> None:
+        """Start draining on first SIGTERM, any other signal stops the server right away."""
+        if sig != signal.SIGTERM or self.drain_delay <= 0 or draining.is_set():
+            super().handle_exit(sig, frame)
+            return
+        draining.set()
+        logger.info(f"Draining for {self.drain_delay}s before shutdown")
+        timer = threading.Timer(self.drain_delay, super().handle_exit, (sig, frame))
+        timer.daemon = True
+        timer.start()
+
+
+class Supervisor(Multiprocess):
+    """Worker processes supervisor signalling all workers at once, so they drain concurrently."""
+
+    def shutdown(self) -> None:
+        """Terminate workers and wait until all of them finish."""
+        for process in self.processes:
+            process.terminate()
+        for process in self.processes:
+            process.join()
+        logging.getLogger("uvicorn.error").info(f"Stopping parent process [{self.pid}]")
+
+
+def configure_workers(workers: int) -> tuple[int, int]:
+    """Pass number of workers and metrics directory to worker processes through environment, get pool limits.
+
+    Worker processes are spawned, they build settings from environment on their own.
+    """
+    os.environ["SERVER_WORKERS"] = str(workers)
+    if workers > 1:
+        metrics_dir = settings.metrics.multiproc_dir or tempfile.mkdtemp(prefix="notes-metrics-")
+        clear_snapshots(metrics_dir)
+        os.environ["METRICS_MULTIPROC_DIR"] = metrics_dir
+    return pool_limits(settings.postgres, workers)
+
+
+def run(
+        host: str,
+        port: int,
+        workers: int,
+        loop: str = "auto",
+        http: str = "auto",
+        reload: bool = False,
+        log_level: str = "info",
+) -> None:
+    """Serve app with `workers` processes, or with a single reloading one."""
+    if reload:
+        workers = 1
+    pool_size, max_overflow = configure_workers(workers)
+    logger.info(f"Starting {workers} workers, database pool of each {pool_size}+{max_overflow} connections")
+
+    config = uvicorn.Config(
+        APP,
+        factory=True,
+        host=host,
+        port=port,
+        workers=workers,
+        loop=loop,
+        http=http,
+        reload=reload,
+        log_level=log_level,
+        backlog=settings.server.backlog,
+        timeout_graceful_shutdown=settings.server.graceful_timeout,
+    )
+    server = DrainingServer(config, drain_delay=settings.server.drain_delay)
+    if reload:
+        ChangeReload(config, target=server.run, sockets=[config.bind_socket()]).run()
+    elif workers > 1:
+        Supervisor(config, target=server.run, sockets=[config.bind_socket()]).run()
+    else:
+        server.run()
+
+
+def main() -> None:
+    """Parse arguments and serve app."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default=os.getenv("NOTES_APP_HOST", "0.0.0.0"))
+    parser.add_argument("--port", type=int, default=int(os.getenv("NOTES_APP_PORT", 8000)))
+    parser.add_argument("--workers", type=int, help="worker processes, default SERVER_WORKERS or CPU count")
+    parser.add_argument("--loop", choices=("auto", "asyncio", "uvloop"), help="event loop, default SERVER_LOOP")
+    parser.add_argument("--http", choices=("auto", "h11", "httptools"), help="HTTP parser, default SERVER_HTTP")
+    parser.add_argument("--reload", action="store_true", help="single process reloading on code changes")
+    parser.add_argument("--log-level", default="info", choices=("critical", "error", "warning", "info", "debug"))
+    args = parser.parse_args()
+
+    run(
+        args.host,
+        args.port,
+        workers=args.workers or settings.server.workers or os.cpu_count() or 1,
+        loop=args.loop or settings.server.loop,
+        http=args.http or settings.server.http,
+        reload=args.reload,
+        log_level=args.log_level,
+    )
+
+
+if __name__ == "__main__":
+    main()
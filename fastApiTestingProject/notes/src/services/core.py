@@ -1,13 +1,259 @@
-from common.packages.src.schemas.notes import CreateNoteSchema, UpdateNoteSchema
+from typing import Callable, Iterable, Sequence
+from uuid import UUID, uuid4
+
+from sqlalchemy import Row, false
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from common.packages.src.abstract.cache import ICache
+from common.packages.src.core.exceptions.base import DBException
+from common.packages.src.core.exceptions.error_code import DBErrorCodeEnum
+from common.packages.src.db.models import Note
+from common.packages.src.db.routing import read_only
+from common.packages.src.loaders import DataLoader
+from common.packages.src.repositories.mixins.search_mixin import SearchMode
+from common.packages.src.repositories.pagination import CursorPage
+from common.packages.src.schemas.notes import CreateNoteSchema, NoteSchema, UpdateNoteSchema
 from common.packages.src.services.base import BaseCRUDService
 from common.packages.src.services.mixins.delete_mixin import DeleteMixin
+from common.packages.src.workers.write_behind import PendingWrite, WriteBehindQueue, WriteKind
 from notes.src.repositories.notes.core import NoteRepository
 
 
 class NoteService(DeleteMixin, BaseCRUDService):
     create_scheme = CreateNoteSchema
     update_scheme = UpdateNoteSchema
+    cache_scheme = NoteSchema
+    queued_fields = ("title", "description")
 
-    def __init__(self, repository: NoteRepository) -> None:
+    def __init__(
+            self,
+            repository: NoteRepository,
+            cache: ICache | None = None,
+            session_factory: Callable[[], AsyncSession] | None = None,
+            loader: DataLoader | None = None,
+    ) -> None:
         """Initialize store items repository with async session."""
-        super().__init__(repository)
+        super().__init__(repository, cache, session_factory, loader)
+
+    @staticmethod
+    def owned_by(user_id: UUID) -> tuple:
+        """Get filters of user notes, reads hide deleted notes on their own."""
+        return (Note.user_id == user_id,)
+
+    @classmethod
+    def writable_by(cls, user_id: UUID) -> tuple:
+        """Get filters of user notes which can be written, writes do not skip deleted notes on their own."""
+        return *cls.owned_by(user_id), Note.is_deleted == false()
+
+    @staticmethod
+    def _ensure_found(uuids: Iterable[UUID], notes: Iterable[Note]) -> None:
+        """Raise not found listing requested uuids missing from result."""
+        missing = set(uuids) - {note.uuid for note in notes}
+        if missing:
+            raise DBException(
+                status_code=404,
+                detail=f"Notes not found: {', '.join(sorted(str(uuid) for uuid in missing))}",
+                error_code=DBErrorCodeEnum.OBJECT_NOT_FOUND.value,
+            )
+
+    @read_only
+    async def get_owned_version(self, uuid: UUID, user_id: UUID) -> Row:
+        """Get version and modification time of user note without loading it."""
+        version = await self._repository.get_version(uuid, filters=self.owned_by(user_id))
+        return version
+
+    async def get_owned(self, uuid: UUID, user_id: UUID, version: int | None = None) -> Note | NoteSchema:
+        """Get note of user, foreign and deleted notes are reported as not found.
+
+        Cached note of other than known `version` is dropped and loaded again.
+        """
+        note = await self.get_by_uuid(uuid)
+        if version is not None and note.version != version:
+            await self._evict(uuid)
+            note = await self.get_by_uuid(uuid)
+        if note.user_id != user_id or note.is_deleted:
+            raise DBException(
+                status_code=404,
+                detail="Object not found",
+                error_code=DBErrorCodeEnum.OBJECT_NOT_FOUND.value,
+            )
+        return note
+
+    async def list_owned(
+            self,
+            user_id: UUID,
+            limit: int,
+            offset: int,
+            order_by_field: str = "created_at",
+            columns: Sequence[str] | None = None,
+    ):
+        """Get page of user notes by offset."""
+        notes = await self.get_paginated(
+            limit=limit,
+            offset=offset,
+            order_by_field=order_by_field,
+            filters=self.owned_by(user_id),
+            columns=columns,
+        )
+        return notes
+
+    async def list_owned_by_cursor(
+            self,
+            user_id: UUID,
+            limit: int,
+            cursor: str | None = None,
+            order_by_field: str = "created_at",
+            descending: bool = False,
+            columns: Sequence[str] | None = None,
+    ) -> CursorPage:
+        """Get page of user notes by cursor."""
+        page = await self.get_paginated_by_cursor(
+            limit=limit,
+            cursor=cursor,
+            order_by_field=order_by_field,
+            filters=self.owned_by(user_id),
+            descending=descending,
+            columns=columns,
+        )
+        return page
+
+    @read_only
+    async def search_owned(
+            self,
+            user_id: UUID,
+            query: str,
+            mode: SearchMode = SearchMode.FULL_TEXT,
+            limit: int = 20,
+            cursor: str | None = None,
+            columns: Sequence[str] | None = None,
+    ) -> CursorPage:
+        """Search user notes ranked by relevance."""
+        page = await self._repository.search(
+            query, mode=mode, limit=limit, cursor=cursor, filters=self.owned_by(user_id), columns=columns
+        )
+        return page
+
+    async def get_many_owned(
+            self, uuids: list[UUID], user_id: UUID, columns: Sequence[str] | None = None
+    ) -> list[Note]:
+        """Get user notes in requested order, fails when any of them is not found."""
+        if columns:
+            columns = tuple(dict.fromkeys((*columns, "uuid")))
+        notes = await self.get_by_uuids(uuids, filters=self.owned_by(user_id), columns=columns)
+        self._ensure_found(uuids, notes)
+        by_uuid = {note.uuid: note for note in notes}
+        return [by_uuid[uuid] for uuid in uuids]
+
+    async def create_owned(self, data: CreateNoteSchema, user_id: UUID) -> Note:
+        """Create note of user."""
+        note = await self.create(data.model_copy(update={"user_id": user_id}))
+        return note
+
+    async def bulk_create_owned(self, data: list[CreateNoteSchema], user_id: UUID) -> list[Note]:
+        """Create notes of user with a single query."""
+        notes = await self.bulk_create([item.model_copy(update={"user_id": user_id}) for item in data])
+        return notes
+
+    async def update_owned(
+            self, uuid: UUID, data: UpdateNoteSchema, user_id: UUID, expected_version: int | None = None
+    ) -> Note:
+        """Partially update note of user, optionally only if it is still of `expected_version`."""
+        note = await self.partial_update(
+            uuid, data, filters=self.writable_by(user_id), expected_version=expected_version
+        )
+        return note
+
+    async def bulk_update_owned(self, data: dict[UUID, UpdateNoteSchema], user_id: UUID) -> list[Note]:
+        """Partially update user notes, fails when any of them is not found."""
+        notes = await self.bulk_update_values(data, partial=True, filters=self.writable_by(user_id))
+        updated = {note.uuid for note in notes}
+        unchanged = [
+            uuid for uuid, item in data.items() if uuid not in updated and not item.model_dump(exclude_unset=True)
+        ]
+        if unchanged:
+            notes.extend(await self.get_many_owned(unchanged, user_id))
+        self._ensure_found(data, notes)
+        by_uuid = {note.uuid: note for note in notes}
+        return [by_uuid[uuid] for uuid in data]
+
+    async def soft_delete_owned(self, uuid: UUID, user_id: UUID, expected_version: int | None = None) -> Note:
+        """Soft delete note of user, optionally only if it is still of `expected_version`."""
+        note = await self.soft_delete(
+            uuid, user_id, filters=self.writable_by(user_id), expected_version=expected_version
+        )
+        return note
+
+    async def bulk_soft_delete_owned(self, uuids: list[UUID], user_id: UUID) -> list[Note]:
+        """Soft delete user notes with a single query, fails when any of them is not found."""
+        notes = await self.bulk_soft_delete(uuids, user_id, filters=self.writable_by(user_id))
+        self._ensure_found(uuids, notes)
+        by_uuid = {note.uuid: note for note in notes}
+        return [by_uuid[uuid] for uuid in dict.fromkeys(uuids)]
+
+    @staticmethod
+    def _queued_note(write: PendingWrite) -> dict:
+        """Get note as it will be once queued write is flushed."""
+        return {"uuid": write.uuid, "user_id": write.user_id, **write.values}
+
+    async def enqueue_create_owned(self, data: CreateNoteSchema, user_id: UUID, queue: WriteBehindQueue) -> dict:
+        """Queue creation of user note, get note as it will be written."""
+        write = PendingWrite(WriteKind.CREATE, uuid4(), user_id, data.model_dump(include=set(self.queued_fields)))
+        await queue.enqueue(write)
+        return self._queued_note(write)
+
+    async def enqueue_update_owned(
+            self, uuid: UUID, data: UpdateNoteSchema, user_id: UUID, queue: WriteBehindQueue
+    ) -> dict:
+        """Queue partial update of user note, get note as it will be once every queued write is flushed.
+
+        Notes created through the queue can be updated before they are written.
+        Update is based on the version the note has once queued writes are
+        flushed, it is skipped if the note is changed by anyone else meanwhile.
+        """
+        queued = queue.get(uuid)
+        if queued is not None and queued.user_id != user_id:
+            queued = None
+        if queued is not None and queued.kind == WriteKind.CREATE:
+            version = Note.version.default.arg
+        else:
+            note = await self.get_owned(uuid, user_id)
+            version = note.version
+            if queued is not None:
+                version = queued.version + 1 if queued.version is not None else None
+            current = PendingWrite(
+                WriteKind.UPDATE, uuid, user_id, {field: getattr(note, field) for field in self.queued_fields}
+            )
+            queued = current if queued is None else current.merge(queued)
+        write = PendingWrite(WriteKind.UPDATE, uuid, user_id, data.model_dump(exclude_unset=True), version)
+        if write.values:
+            await queue.enqueue(write)
+        return self._queued_note(queued.merge(write))
+
+    async def apply_queued(self, writes: list[PendingWrite]) -> int:
+        """Write queued notes, get number of notes written.
+
+        Created notes present already are left as they are, so a creation
+        replayed after a crash does not overwrite later updates. Updates of
+        notes deleted meanwhile or of other than their base version are skipped.
+        """
+        created = [
+            {"uuid": write.uuid, "user_id": write.user_id, **write.values}
+            for write in writes
+            if write.kind == WriteKind.CREATE
+        ]
+        written = await self.bulk_insert_missing(created) if created else 0
+        versioned = {
+            write.uuid: {**write.values, "user_id": write.user_id, "version": write.version}
+            for write in writes
+            if write.kind == WriteKind.UPDATE and write.version is not None
+        }
+        unversioned = {
+            write.uuid: {**write.values, "user_id": write.user_id}
+            for write in writes
+            if write.kind == WriteKind.UPDATE and write.version is None
+        }
+        for updates, match in ((versioned, ("user_id", "version")), (unversioned, ("user_id",))):
+            if updates:
+                notes = await self.bulk_update_values(updates, filters=(Note.is_deleted == false(),), match=match)
+                written += len(notes)
+        return written
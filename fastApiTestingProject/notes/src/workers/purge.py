@@ -0,0 +1,86 @@
+"""Purge soft deleted notes.
+
+Usage:
+    python -m notes.src.workers.purge --retention-days 30 --batch-size 500
+    python -m notes.src.workers.purge --forever
+
+Notes deleted longer than retention ago are moved to store_item_archive,
+or hard deleted with --delete. Defaults are read from PURGE_* settings.
+An interrupted run is resumed by starting it again. With --forever it
+purges only while no app worker or other purge process holds the purge
+advisory lock.
+"""
+import argparse
+import asyncio
+from datetime import datetime, timedelta
+
+from common.packages.src.conf.settings import PurgeSettings, settings
+from common.packages.src.db.engine import engines
+from common.packages.src.db.locks import AdvisoryLock
+from common.packages.src.workers.purge import PurgeWorker
+from notes.src.repositories.notes.core import NoteRepository
+
+
+def create_purge_worker(config: PurgeSettings | None = None) -> PurgeWorker:
+    """Create notes purge worker configured from purge settings, one process at a time purges."""
+    config = config or settings.purge
+    engine = engines.get_engine(settings.postgres.db_uri, settings.postgres.echo)
+    return PurgeWorker(
+        NoteRepository,
+        engines.get_session_factory(settings.postgres.db_uri, settings.postgres.echo),
+        retention=timedelta(days=config.retention_days),
+        archive=config.archive,
+        batch_size=config.batch_size,
+        max_rows_per_second=config.max_rows_per_second,
+        max_replication_lag=config.max_replication_lag,
+        interval=config.interval,
+        leader_lock=AdvisoryLock(engine, f"purge:{NoteRepository.model.__tablename__}"),
+    )
+
+
+async def main_async(args: argparse.Namespace) -> None:
+    """Run purge once or until interrupted."""
+    config = settings.purge.model_copy(
+        update={
+            name: value
+            for name, value in (
+                ("retention_days", args.retention_days),
+                ("batch_size", args.batch_size),
+                ("max_rows_per_second", args.max_rows_per_second),
+                ("archive", False if args.delete else None),
+            )
+            if value is not None
+        }
+    )
+    worker = create_purge_worker(config)
+    try:
+        if args.forever:
+            await worker.run()
+        else:
+            await worker.purge(deleted_before=args.deleted_before, max_batches=args.max_batches)
+    finally:
+        await engines.dispose()
+
+
+def main() -> None:
+    """Run purge worker."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--retention-days", type=int, help="purge notes deleted longer ago")
+    parser.add_argument(
+        "--deleted-before", type=datetime.fromisoformat, help="explicit UTC cutoff, overrides retention"
+    )
+    parser.add_argument("--batch-size", type=int, help="rows per transaction")
+    parser.add_argument("--max-rows-per-second", type=float, help="rate limit, zero disables it")
+    parser.add_argument("--max-batches", type=int, help="stop after this many batches")
+    parser.add_argument("--delete", action="store_true", help="hard delete instead of archiving")
+    parser.add_argument("--forever", action="store_true", help="repeat every PURGE_INTERVAL seconds")
+    args = parser.parse_args()
+
+    try:
+        asyncio.run(main_async(args))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
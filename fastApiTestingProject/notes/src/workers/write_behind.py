@@ -0,0 +1,34 @@
+"""Write-behind queue of note writes.
+
+Notes created or updated with `Prefer: respond-async` are acknowledged once
+logged and written by the queue in batches, see `WriteBehindQueue`.
+"""
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from common.packages.src.conf.settings import WriteBehindSettings, settings
+from common.packages.src.db.engine import engines
+from common.packages.src.workers.write_behind import PendingWrite, WriteBehindQueue
+from notes.src.providers.service import provide_notes_service
+
+
+async def apply_note_writes(session: AsyncSession, writes: list[PendingWrite]) -> int:
+    """Write batch of queued notes in session transaction."""
+    written = await provide_notes_service(session).apply_queued(writes)
+    return written
+
+
+def create_write_behind_queue(config: WriteBehindSettings | None = None) -> WriteBehindQueue:
+    """Create notes write-behind queue configured from write-behind settings."""
+    config = config or settings.write_behind
+    return WriteBehindQueue(
+        apply_note_writes,
+        engines.get_session_factory(settings.postgres.db_uri, settings.postgres.echo),
+        directory=config.directory,
+        name="notes",
+        batch_size=config.batch_size,
+        flush_interval=config.flush_interval,
+        max_pending=config.max_pending,
+        enqueue_timeout=config.enqueue_timeout,
+        retry_interval=config.retry_interval,
+        fsync=config.fsync,
+    )
@@ -0,0 +1,61 @@
+"""Fixtures of API tests, requests run in the rolled back test transaction."""
+from typing import AsyncIterator
+
+import httpx
+import jwt
+import pytest
+from fastapi import Depends
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncSession
+
+from common.packages.src.conf.settings import settings
+from common.packages.src.db.models import User
+from common.packages.src.db.session import get_session
+from main import init_app
+from notes.src.providers.loaders import NoteLoaders, provide_loaders
+from notes.src.providers.service import get_notes_service
+from notes.src.repositories.notes.core import NoteRepository
+from notes.src.services.core import NoteService
+
+
+def auth_headers(user_uuid) -> dict:
+    """Get authorization header of user."""
+    token = jwt.encode({"user_uuid": str(user_uuid)}, settings.notes_app.secret_key, algorithm=settings.auth.algorithm)
+    return {"Authorization": f"Bearer {token}"}
+
+
+@pytest.fixture
+async def other_user_headers(connection: AsyncConnection) -> dict:
+    """Authorization header of another user."""
+    result = await connection.execute(
+        insert(User).values(email="other@example.com", password="password").returning(User.uuid)
+    )
+    return auth_headers(result.scalar_one())
+
+
+@pytest.fixture
+async def client(session: AsyncSession, user_uuid) -> AsyncIterator[httpx.AsyncClient]:
+    """Client of the app authenticated as test user.
+
+    Requests share the test session, notes service has no entity cache, it
+    would load notes outside of the test transaction.
+    """
+    app = init_app()
+
+    async def test_session() -> AsyncIterator[AsyncSession]:
+        try:
+            yield session
+            await session.commit()
+        except Exception:
+            await session.rollback()
+            raise
+
+    def notes_service(loaders: NoteLoaders = Depends(provide_loaders)) -> NoteService:
+        return NoteService(NoteRepository(session), loader=loaders.notes)
+
+    app.dependency_overrides[get_session] = test_session
+    app.dependency_overrides[get_notes_service] = notes_service
+    transport = httpx.ASGITransport(app=app)
+    headers = auth_headers(user_uuid)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test", headers=headers) as client:
+        yield client
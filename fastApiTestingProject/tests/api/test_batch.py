@@ -0,0 +1,96 @@
+"""Batch endpoints apply to every requested note of the user or fail as a whole."""
+import uuid
+
+import httpx
+import pytest
+
+from common.packages.src.schemas.notes import MAX_BATCH_SIZE
+
+NOTES = "/api/v1/notes"
+
+
+async def create_notes(client: httpx.AsyncClient, *titles: str) -> list[dict]:
+    """Create notes of client user."""
+    response = await client.post(
+        f"{NOTES}:batchCreate", json={"notes": [{"title": title, "description": "description"} for title in titles]}
+    )
+    assert response.status_code == 201
+    return response.json()["notes"]
+
+
+@pytest.fixture
+async def foreign_note(client: httpx.AsyncClient, other_user_headers: dict) -> str:
+    """Uuid of note of another user."""
+    body = {"title": "foreign", "description": "description"}
+    response = await client.post(NOTES, json=body, headers=other_user_headers)
+    return response.json()["uuid"]
+
+
+async def test_batch_get_keeps_request_order(client: httpx.AsyncClient) -> None:
+    notes = await create_notes(client, "a", "b", "c")
+    uuids = [note["uuid"] for note in reversed(notes)]
+
+    response = await client.post(f"{NOTES}:batchGet", json={"uuids": uuids})
+
+    assert response.status_code == 200
+    assert [note["uuid"] for note in response.json()["notes"]] == uuids
+
+
+@pytest.mark.parametrize("action", [":batchGet", ":batchDelete", ":batchUpdate"])
+@pytest.mark.parametrize("missing", ["unknown", "foreign", "deleted"])
+async def test_batch_fails_as_a_whole_when_any_note_is_missing(
+        client: httpx.AsyncClient, foreign_note: str, action: str, missing: str
+) -> None:
+    notes = await create_notes(client, "a", "b")
+    if missing == "deleted":
+        missing_uuid = (await create_notes(client, "deleted"))[0]["uuid"]
+        await client.delete(f"{NOTES}/{missing_uuid}")
+    else:
+        missing_uuid = foreign_note if missing == "foreign" else str(uuid.uuid4())
+    uuids = [notes[0]["uuid"], missing_uuid, notes[1]["uuid"]]
+    if action == ":batchUpdate":
+        body = {"notes": [{"uuid": pk, "title": "updated"} for pk in uuids]}
+    else:
+        body = {"uuids": uuids}
+
+    response = await client.post(f"{NOTES}{action}", json=body)
+
+    assert response.status_code == 404
+    assert response.json()["detail"] == f"Notes not found: {missing_uuid}"
+    current = await client.post(f"{NOTES}:batchGet", json={"uuids": [note["uuid"] for note in notes]})
+    assert [(note["title"], note["version"]) for note in current.json()["notes"]] == [("a", 1), ("b", 1)]
+
+
+@pytest.mark.parametrize("action", [":batchGet", ":batchDelete"])
+async def test_batch_size_is_limited(client: httpx.AsyncClient, action: str) -> None:
+    uuids = [str(uuid.uuid4()) for _ in range(MAX_BATCH_SIZE + 1)]
+
+    assert (await client.post(f"{NOTES}{action}", json={"uuids": uuids})).status_code == 422
+    assert (await client.post(f"{NOTES}{action}", json={"uuids": []})).status_code == 422
+
+
+async def test_batch_create_size_is_limited(client: httpx.AsyncClient) -> None:
+    notes = [{"title": "title", "description": "description"}] * (MAX_BATCH_SIZE + 1)
+
+    response = await client.post(f"{NOTES}:batchCreate", json={"notes": notes})
+
+    assert response.status_code == 422
+
+
+@pytest.mark.parametrize("path", ["", "/cursor"])
+@pytest.mark.parametrize("order_by", ["description", "user_id", "search_vector", "uuid; DROP TABLE store_item"])
+async def test_order_field_outside_whitelist_is_rejected(client: httpx.AsyncClient, path: str, order_by: str) -> None:
+    response = await client.get(f"{NOTES}{path}", params={"order_by": order_by})
+
+    assert response.status_code == 400
+    assert response.json()["error_code"] == "invalid_order_field"
+
+
+@pytest.mark.parametrize("order_by", ["created_at", "updated_at", "title"])
+async def test_whitelisted_order_field_is_accepted(client: httpx.AsyncClient, order_by: str) -> None:
+    await create_notes(client, "b", "a")
+
+    response = await client.get(NOTES, params={"order_by": order_by})
+
+    assert response.status_code == 200
+    assert len(response.json()["items"]) == 2
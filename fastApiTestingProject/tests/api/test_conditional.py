@@ -0,0 +1,64 @@
+"""Conditional GET of notes and pages is answered with 304 until they change."""
+import httpx
+import pytest
+
+NOTES = "/api/v1/notes"
+
+
+@pytest.fixture
+async def note(client: httpx.AsyncClient) -> dict:
+    """Note of client user."""
+    response = await client.post(NOTES, json={"title": "title", "description": "description"})
+    return response.json()
+
+
+async def test_note_with_matching_etag_is_not_modified(client: httpx.AsyncClient, note: dict) -> None:
+    response = await client.get(f"{NOTES}/{note['uuid']}")
+    etag = response.headers["ETag"]
+
+    not_modified = await client.get(f"{NOTES}/{note['uuid']}", headers={"If-None-Match": f"W/{etag}"})
+
+    assert etag == '"1"'
+    assert response.headers["Cache-Control"] == "private, no-cache"
+    assert not_modified.status_code == 304 and not_modified.content == b""
+    assert not_modified.headers["ETag"] == etag
+    assert not_modified.headers["Last-Modified"] == response.headers["Last-Modified"]
+
+
+async def test_changed_note_is_sent_again(client: httpx.AsyncClient, note: dict) -> None:
+    etag = (await client.get(f"{NOTES}/{note['uuid']}")).headers["ETag"]
+    await client.patch(f"{NOTES}/{note['uuid']}", json={"title": "new"})
+
+    response = await client.get(f"{NOTES}/{note['uuid']}", headers={"If-None-Match": etag})
+
+    assert response.status_code == 200
+    assert response.json()["title"] == "new" and response.headers["ETag"] == '"2"'
+
+
+async def test_note_is_not_modified_since_last_modified(client: httpx.AsyncClient, note: dict) -> None:
+    last_modified = (await client.get(f"{NOTES}/{note['uuid']}")).headers["Last-Modified"]
+
+    response = await client.get(f"{NOTES}/{note['uuid']}", headers={"If-Modified-Since": last_modified})
+
+    assert response.status_code == 304
+
+
+async def test_note_modified_after_date_is_sent(client: httpx.AsyncClient, note: dict) -> None:
+    response = await client.get(
+        f"{NOTES}/{note['uuid']}", headers={"If-Modified-Since": "Mon, 01 Jan 2001 00:00:00 GMT"}
+    )
+
+    assert response.status_code == 200
+
+
+@pytest.mark.parametrize("path", ["", "/cursor"])
+async def test_page_with_matching_etag_is_not_modified(client: httpx.AsyncClient, note: dict, path: str) -> None:
+    etag = (await client.get(f"{NOTES}{path}")).headers["ETag"]
+
+    not_modified = await client.get(f"{NOTES}{path}", headers={"If-None-Match": etag})
+    await client.post(NOTES, json={"title": "other", "description": "description"})
+    changed = await client.get(f"{NOTES}{path}", headers={"If-None-Match": etag})
+
+    assert not_modified.status_code == 304 and not_modified.headers["ETag"] == etag
+    assert changed.status_code == 200 and changed.headers["ETag"] != etag
+    assert len(changed.json()["items"]) == 2
@@ -0,0 +1,66 @@
+"""Readiness fails while warming up, draining or out of pooled connections, liveness does not."""
+import importlib
+from typing import AsyncIterator, Iterator
+
+import httpx
+import pytest
+from fastapi import FastAPI
+
+from common.packages.src.core.lifecycle import draining
+from main import init_app
+
+HEALTH = "/api/v1/health-check"
+
+
+@pytest.fixture
+def app() -> FastAPI:
+    """App which completed warm up, lifespan is not run."""
+    app = init_app()
+    app.state.ready = True
+    return app
+
+
+@pytest.fixture
+async def client(app: FastAPI) -> AsyncIterator[httpx.AsyncClient]:
+    """Client of the app."""
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+        yield client
+
+
+@pytest.fixture
+def draining_process() -> Iterator[None]:
+    """Process which got SIGTERM."""
+    draining.set()
+    yield
+    draining.clear()
+
+
+async def test_ready_after_warm_up(client: httpx.AsyncClient) -> None:
+    response = await client.get(f"{HEALTH}/ready")
+
+    assert response.status_code == 200
+
+
+async def test_not_ready_before_warm_up(app: FastAPI, client: httpx.AsyncClient) -> None:
+    app.state.ready = False
+
+    response = await client.get(f"{HEALTH}/ready")
+
+    assert (response.status_code, response.json()["message"]) == (503, "Warming up.")
+    assert (await client.get(f"{HEALTH}/live")).status_code == 200
+
+
+async def test_not_ready_while_draining(client: httpx.AsyncClient, draining_process) -> None:
+    response = await client.get(f"{HEALTH}/ready")
+
+    assert (response.status_code, response.json()["message"]) == (503, "Draining.")
+    assert (await client.get(f"{HEALTH}/live")).status_code == 200
+
+
+async def test_not_ready_while_pool_is_exhausted(client: httpx.AsyncClient, monkeypatch) -> None:
+    healthcheck = importlib.import_module("notes.src.api.v1.healthcheck")
+    monkeypatch.setattr(healthcheck, "pool_exhausted", lambda engine: True)
+
+    response = await client.get(f"{HEALTH}/ready")
+
+    assert (response.status_code, response.json()["message"]) == (503, "Database pool exhausted.")
@@ -0,0 +1,70 @@
+"""If-Match of PATCH and DELETE, a stale ETag fails with 412 while a missing note is 404."""
+import uuid
+
+import httpx
+import pytest
+
+NOTES = "/api/v1/notes"
+
+
+@pytest.fixture
+async def note(client: httpx.AsyncClient) -> dict:
+    """Note of version 2 with its ETag."""
+    created = await client.post(NOTES, json={"title": "title", "description": "description"})
+    response = await client.patch(f"{NOTES}/{created.json()['uuid']}", json={"title": "updated"})
+    return {**response.json(), "etag": response.headers["ETag"]}
+
+
+@pytest.fixture
+async def foreign_note(client: httpx.AsyncClient, other_user_headers: dict) -> str:
+    """Uuid of note of another user."""
+    body = {"title": "foreign", "description": "description"}
+    response = await client.post(NOTES, json=body, headers=other_user_headers)
+    return response.json()["uuid"]
+
+
+async def test_patch_with_current_etag_is_applied(client: httpx.AsyncClient, note: dict) -> None:
+    response = await client.patch(f"{NOTES}/{note['uuid']}", json={"title": "new"}, headers={"If-Match": note["etag"]})
+
+    assert response.status_code == 200
+    assert response.headers["ETag"] == '"3"' and note["etag"] == '"2"'
+
+
+@pytest.mark.parametrize("method", ["PATCH", "DELETE"])
+async def test_stale_etag_is_version_conflict(client: httpx.AsyncClient, note: dict, method: str) -> None:
+    body = {"title": "new"} if method == "PATCH" else None
+    response = await client.request(method, f"{NOTES}/{note['uuid']}", json=body, headers={"If-Match": '"1"'})
+
+    assert response.status_code == 412
+    assert response.json()["error_code"] == "version_conflict"
+    assert (await client.get(f"{NOTES}/{note['uuid']}")).json()["title"] == "updated"
+
+
+@pytest.mark.parametrize("method", ["PATCH", "DELETE"])
+@pytest.mark.parametrize("missing", ["unknown", "foreign", "deleted"])
+async def test_missing_note_is_not_found_whatever_etag(
+        client: httpx.AsyncClient, note: dict, foreign_note: str, method: str, missing: str
+) -> None:
+    if missing == "deleted":
+        await client.delete(f"{NOTES}/{note['uuid']}")
+    pk = {"unknown": str(uuid.uuid4()), "foreign": foreign_note, "deleted": note["uuid"]}[missing]
+
+    body = {"title": "new"} if method == "PATCH" else None
+    response = await client.request(method, f"{NOTES}/{pk}", json=body, headers={"If-Match": '"1"'})
+
+    assert response.status_code == 404
+
+
+@pytest.mark.parametrize("if_match", ['W/"2"', '"2", "3"', "2", '"abc"'])
+async def test_if_match_other_than_entity_etag_fails(client: httpx.AsyncClient, note: dict, if_match: str) -> None:
+    response = await client.delete(f"{NOTES}/{note['uuid']}", headers={"If-Match": if_match})
+
+    assert response.status_code == 412
+    assert response.json()["error_code"] == "invalid_precondition"
+
+
+async def test_delete_with_current_etag_is_applied(client: httpx.AsyncClient, note: dict) -> None:
+    response = await client.delete(f"{NOTES}/{note['uuid']}", headers={"If-Match": note["etag"]})
+
+    assert response.status_code == 200
+    assert (await client.get(f"{NOTES}/{note['uuid']}")).status_code == 404
@@ -0,0 +1,23 @@
+"""Search endpoint returns ranked hits with snippets, paged by cursor."""
+import httpx
+import pytest
+
+SEARCH = "/api/v1/notes/search"
+
+
+async def test_search_returns_ranked_hits_with_headline(client: httpx.AsyncClient) -> None:
+    for title in ("apples", "pears", "apples and apples"):
+        await client.post("/api/v1/notes", json={"title": title, "description": "fruit"})
+
+    first = await client.get(SEARCH, params={"q": "apples", "limit": 1})
+    second = await client.get(SEARCH, params={"q": "apples", "limit": 1, "cursor": first.json()["next_cursor"]})
+
+    hits = [*first.json()["items"], *second.json()["items"]]
+    assert [hit["title"] for hit in hits] == ["apples and apples", "apples"]
+    assert hits[0]["rank"] >= hits[1]["rank"] and "headline" in hits[0]
+    assert second.json()["next_cursor"] is None
+
+
+@pytest.mark.parametrize("params", [{"q": ""}, {"q": "apples", "mode": "regex"}, {"q": "apples", "limit": 0}])
+async def test_invalid_search_is_rejected(client: httpx.AsyncClient, params: dict) -> None:
+    assert (await client.get(SEARCH, params=params)).status_code == 422
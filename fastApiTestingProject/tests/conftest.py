@@ -0,0 +1,70 @@
+"""Shared fixtures, database tests run against POSTGRES_* database inside a rolled back transaction."""
+from typing import AsyncIterator, Iterator
+
+import pytest
+from sqlalchemy import event, insert
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine, AsyncSession, create_async_engine
+from sqlalchemy.pool import NullPool
+
+from common.packages.src.db.models import User
+
+SAVEPOINT_STATEMENTS = ("SAVEPOINT", "RELEASE SAVEPOINT", "ROLLBACK TO SAVEPOINT")
+
+
+@pytest.fixture
+async def engine() -> AsyncIterator[AsyncEngine]:
+    """Engine of the test database, tests are skipped when it is not configured or reachable."""
+    from common.packages.src.conf.settings import settings
+
+    try:
+        db_uri = settings.postgres.db_uri
+    except Exception as exc:
+        pytest.skip(f"Database is not configured: {exc}")
+    engine = create_async_engine(db_uri, poolclass=NullPool)
+    try:
+        async with engine.connect():
+            pass
+    except Exception as exc:
+        await engine.dispose()
+        pytest.skip(f"Database is not reachable: {exc!r}")
+    yield engine
+    await engine.dispose()
+
+
+@pytest.fixture
+async def connection(engine: AsyncEngine) -> AsyncIterator[AsyncConnection]:
+    """Connection in a transaction rolled back after test."""
+    async with engine.connect() as connection:
+        transaction = await connection.begin()
+        yield connection
+        await transaction.rollback()
+
+
+@pytest.fixture
+async def session(connection: AsyncConnection) -> AsyncIterator[AsyncSession]:
+    """Session whose commits only release savepoints of the test transaction."""
+    async with AsyncSession(bind=connection, join_transaction_mode="create_savepoint") as session:
+        yield session
+
+
+@pytest.fixture
+def statements(engine: AsyncEngine) -> Iterator[list[str]]:
+    """Statements executed by engine since the fixture was requested, savepoints are left out."""
+    executed: list[str] = []
+
+    def record(conn, cursor, statement, parameters, context, executemany) -> None:
+        if not statement.startswith(SAVEPOINT_STATEMENTS):
+            executed.append(statement)
+
+    event.listen(engine.sync_engine, "before_cursor_execute", record)
+    yield executed
+    event.remove(engine.sync_engine, "before_cursor_execute", record)
+
+
+@pytest.fixture
+async def user_uuid(connection: AsyncConnection):
+    """Uuid of user created for test."""
+    result = await connection.execute(
+        insert(User).values(email="test@example.com", password="password").returning(User.uuid)
+    )
+    return result.scalar_one()
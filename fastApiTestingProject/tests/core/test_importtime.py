@@ -0,0 +1,49 @@
+"""Cold import of the service entry point stays within its budget."""
+import os
+from pathlib import Path
+
+import pytest
+
+from common.packages.src.core.importtime import parse, profile, subtree
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+IMPORT_BUDGET_MS = float(os.environ.get("IMPORT_BUDGET_MS", 1500))
+IMPORT_RUNS = 5
+DEFERRED_MODULES = ("uvicorn",)
+
+REPORT = """\
+import time: self [us] | cumulative | imported package
+import time:       100 |        100 | site
+import time:        10 |         10 |     json.scanner
+import time:        20 |         30 |   json
+import time:         5 |          5 |   config
+import time:        40 |         75 | main
+Traceback is not a report line
+"""
+
+
+def test_subtree_drops_interpreter_startup_imports() -> None:
+    timings = subtree(parse(REPORT.splitlines()), "main")
+
+    assert [(timing.module, timing.depth) for timing in timings] == [
+        ("json.scanner", 2), ("json", 1), ("config", 1), ("main", 0)
+    ]
+    assert timings[-1].cumulative_us == 75
+
+
+def test_subtree_of_module_not_imported_fails() -> None:
+    with pytest.raises(ValueError):
+        subtree(parse(REPORT.splitlines()), "notes")
+
+
+def test_main_import_is_within_budget(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.chdir(PROJECT_ROOT)
+
+    # a busy machine slows single imports down, so any of a few runs within budget passes
+    for _ in range(IMPORT_RUNS):
+        timings = profile("main")
+        if timings[-1].cumulative_us / 1000 <= IMPORT_BUDGET_MS:
+            break
+
+    assert timings[-1].cumulative_us / 1000 <= IMPORT_BUDGET_MS
+    assert not {timing.package for timing in timings} & set(DEFERRED_MODULES)
@@ -0,0 +1,40 @@
+"""Runner passes its configuration to spawned worker processes through environment."""
+import multiprocessing
+from pathlib import Path
+
+import pytest
+
+from common.packages.src.conf.settings import settings
+from notes.src.runner import configure_workers
+
+
+def worker_settings(results: multiprocessing.Queue) -> None:
+    """Report settings of a worker process built from inherited environment."""
+    from common.packages.src.conf.settings import get_settings
+
+    settings = get_settings()
+    results.put((settings.server.workers, settings.metrics.multiproc_dir))
+
+
+@pytest.fixture
+def environment(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> Path:
+    """Restore runner environment after test, metrics go to a configured temporary directory."""
+    monkeypatch.setenv("SERVER_WORKERS", "1")
+    monkeypatch.delenv("METRICS_MULTIPROC_DIR", raising=False)
+    monkeypatch.setattr(settings.metrics, "multiproc_dir", str(tmp_path))
+    (tmp_path / "1.json").write_text("{}")
+    return tmp_path
+
+
+def test_spawned_worker_sees_number_of_workers(environment: Path) -> None:
+    configure_workers(3)
+
+    context = multiprocessing.get_context("spawn")
+    results = context.Queue()
+    process = context.Process(target=worker_settings, args=(results,))
+    process.start()
+    try:
+        assert results.get(timeout=60) == (3, str(environment))
+    finally:
+        process.join()
+    assert list(environment.iterdir()) == []
@@ -0,0 +1,63 @@
+"""Fast path responses render notes exactly as pydantic response models would."""
+import uuid
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+import orjson
+from pydantic import TypeAdapter
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from common.packages.src.core.serialization import ORJSONResponse
+from common.packages.src.db.models import Note
+from common.packages.src.schemas.notes import CreateNoteSchema, NoteSchema, note_projection
+from notes.src.repositories.notes.core import NoteRepository
+
+notes_adapter = TypeAdapter(list[NoteSchema])
+
+
+def rendered(notes: list) -> list[dict]:
+    """Get notes rendered by fast path response."""
+    return orjson.loads(ORJSONResponse(note_projection.many(notes)).body)
+
+
+def validated(notes: list) -> list[dict]:
+    """Get notes rendered by pydantic response model."""
+    return orjson.loads(notes_adapter.dump_json(notes_adapter.validate_python(notes, from_attributes=True)))
+
+
+def note(**fields) -> SimpleNamespace:
+    """Get object with note attributes."""
+    now = datetime(2024, 5, 17, 12, 30, 15, 123456, tzinfo=timezone.utc)
+    defaults = {
+        "uuid": uuid.uuid4(), "title": "title", "description": "description", "user_id": uuid.uuid4(),
+        "created_at": now, "updated_at": now, "is_deleted": False, "version": 1,
+    }
+    return SimpleNamespace(**{**defaults, **fields})
+
+
+def test_projection_matches_pydantic_for_plain_objects() -> None:
+    notes = [
+        note(),
+        note(user_id=None),
+        note(created_at=datetime(2024, 1, 1, tzinfo=timezone.utc)),
+        note(updated_at=datetime(2024, 1, 1, 3, tzinfo=timezone(timedelta(hours=3)))),
+    ]
+
+    assert rendered(notes) == validated(notes)
+
+
+async def test_projection_matches_pydantic_for_database_rows(session: AsyncSession, user_uuid) -> None:
+    repository = NoteRepository(session)
+    await repository.bulk_create(
+        [CreateNoteSchema(title=str(index), description="description", user_id=user_uuid) for index in range(3)]
+    )
+    query = select(Note).where(Note.user_id == user_uuid).order_by(Note.title)
+    columns = [getattr(Note, field) for field in note_projection.fields]
+
+    objects = (await session.execute(query)).scalars().all()
+    rows = (await session.execute(query.with_only_columns(*columns))).all()
+
+    assert rendered(objects) == validated(objects)
+    assert rendered(rows) == validated(rows)
+    assert rendered(rows) == rendered(objects)
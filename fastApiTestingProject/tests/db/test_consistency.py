@@ -0,0 +1,57 @@
+"""Read-your-writes marker travels with the client, so every worker keeps its reads on primary."""
+import time
+
+import httpx
+import pytest
+from fastapi import FastAPI
+
+from common.packages.src.db.consistency import LAST_WRITE_COOKIE, ReadYourWritesMiddleware, write_marker_var
+
+
+@pytest.fixture
+def client() -> httpx.AsyncClient:
+    """Client of an app reporting whether its reads are sticky, POST marks a write."""
+    app = FastAPI()
+    app.add_middleware(ReadYourWritesMiddleware, window=5.0)
+
+    @app.get("/")
+    async def read() -> dict:
+        return {"sticky": write_marker_var.get().is_sticky(5.0)}
+
+    @app.post("/")
+    async def write() -> dict:
+        write_marker_var.get().wrote = True
+        return {}
+
+    return httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test")
+
+
+async def test_write_sets_marker_cookie(client: httpx.AsyncClient) -> None:
+    response = await client.post("/")
+
+    assert float(response.cookies[LAST_WRITE_COOKIE]) <= time.time()
+    assert "Max-Age=5" in response.headers["set-cookie"]
+    assert (await client.get("/")).json() == {"sticky": True}
+
+
+async def test_read_does_not_set_marker_cookie(client: httpx.AsyncClient) -> None:
+    response = await client.get("/")
+
+    assert "set-cookie" not in response.headers
+    assert response.json() == {"sticky": False}
+
+
+@pytest.mark.parametrize(
+    ("value", "sticky"),
+    [
+        (lambda: str(time.time() - 1), True),
+        (lambda: str(time.time() - 10), False),
+        (lambda: str(time.time() + 60), False),
+        (lambda: "nan", False),
+        (lambda: "garbage", False),
+    ],
+)
+async def test_marker_cookie_is_compared_with_window(client: httpx.AsyncClient, value, sticky: bool) -> None:
+    response = await client.get("/", headers={"cookie": f"{LAST_WRITE_COOKIE}={value()}"})
+
+    assert response.json() == {"sticky": sticky}
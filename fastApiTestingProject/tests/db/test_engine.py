@@ -0,0 +1,39 @@
+"""Connection budget of all workers is split into per worker pools."""
+import pytest
+
+from common.packages.src.conf.settings import PostgresSettings, settings
+from common.packages.src.db.engine import pool_limits
+
+
+def postgres(pool_size: int = 10, max_overflow: int = 10, max_connections: int = 0) -> PostgresSettings:
+    """Get postgres settings with pool limits."""
+    update = {"pool_size": pool_size, "max_overflow": max_overflow, "max_connections": max_connections}
+    return settings.postgres.model_copy(update=update)
+
+
+@pytest.mark.parametrize("workers", [1, 4, 64])
+def test_unlimited_budget_keeps_configured_pool(workers: int) -> None:
+    assert pool_limits(postgres(max_connections=0), workers) == (10, 10)
+
+
+@pytest.mark.parametrize(
+    ("max_connections", "workers", "limits"),
+    [
+        (100, 4, (10, 10)),
+        (60, 4, (10, 5)),
+        (40, 4, (10, 0)),
+        (12, 4, (3, 0)),
+        (13, 4, (3, 0)),
+        (4, 4, (1, 0)),
+    ],
+)
+def test_budget_is_split_between_workers(max_connections: int, workers: int, limits: tuple[int, int]) -> None:
+    pool_size, max_overflow = pool_limits(postgres(max_connections=max_connections), workers)
+
+    assert (pool_size, max_overflow) == limits
+    assert (pool_size + max_overflow) * workers <= max_connections
+
+
+def test_budget_smaller_than_workers_is_rejected() -> None:
+    with pytest.raises(ValueError):
+        pool_limits(postgres(max_connections=3), 4)
@@ -0,0 +1,34 @@
+"""Advisory lock is held by one process at a time and handed over once released."""
+import uuid
+
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from common.packages.src.db.locks import AdvisoryLock
+
+
+async def test_lock_has_one_holder(engine: AsyncEngine) -> None:
+    name = f"test:{uuid.uuid4()}"
+    leader, follower = AdvisoryLock(engine, name), AdvisoryLock(engine, name)
+
+    try:
+        assert await leader.acquire()
+        assert not await follower.acquire()
+        assert await leader.acquire()
+        assert (leader.held, follower.held) == (True, False)
+    finally:
+        await leader.release()
+        await follower.release()
+
+
+async def test_released_lock_is_taken_over(engine: AsyncEngine) -> None:
+    name = f"test:{uuid.uuid4()}"
+    leader, follower = AdvisoryLock(engine, name), AdvisoryLock(engine, name)
+    await leader.acquire()
+
+    await leader.release()
+
+    try:
+        assert not leader.held
+        assert await follower.acquire()
+    finally:
+        await follower.release()
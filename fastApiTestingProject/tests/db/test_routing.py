@@ -0,0 +1,84 @@
+"""Statement routing of RoutingSession between primary and read replicas."""
+import uuid
+from typing import AsyncIterator
+
+import pytest
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, create_async_engine
+
+from common.packages.src.db.models import Note, User
+from common.packages.src.db.routing import ReplicaSet, RoutingSession, replica_reads
+
+
+@pytest.fixture
+async def replica() -> AsyncIterator[AsyncEngine]:
+    """Engine of a replica which is never connected to, routing only picks it."""
+    engine = create_async_engine("postgresql+asyncpg://replica@replica.invalid/notes")
+    yield engine
+    await engine.dispose()
+
+
+@pytest.fixture
+def replicas(replica: AsyncEngine) -> ReplicaSet:
+    """Replica set of a single healthy replica."""
+    return ReplicaSet([replica])
+
+
+@pytest.fixture
+async def primary() -> AsyncIterator[AsyncEngine]:
+    """Engine of a primary which is never connected to."""
+    engine = create_async_engine("postgresql+asyncpg://primary@primary.invalid/notes")
+    yield engine
+    await engine.dispose()
+
+
+@pytest.fixture
+def routing_session(primary: AsyncEngine, replicas: ReplicaSet) -> RoutingSession:
+    """Routing session which is only asked for binds."""
+    return RoutingSession(primary, replicas)
+
+
+def test_select_in_read_only_block_goes_to_replica(routing_session: RoutingSession, replica: AsyncEngine) -> None:
+    with replica_reads():
+        assert routing_session.get_bind(clause=select(Note)) is replica.sync_engine
+
+
+def test_select_outside_read_only_block_goes_to_primary(
+        routing_session: RoutingSession, primary: AsyncEngine
+) -> None:
+    assert routing_session.get_bind(clause=select(Note)) is primary.sync_engine
+
+
+def test_select_for_update_goes_to_primary(routing_session: RoutingSession, primary: AsyncEngine) -> None:
+    with replica_reads():
+        assert routing_session.get_bind(clause=select(Note).with_for_update()) is primary.sync_engine
+
+
+def test_write_goes_to_primary_and_session_sticks_to_it(
+        routing_session: RoutingSession, primary: AsyncEngine
+) -> None:
+    with replica_reads():
+        assert routing_session.get_bind(clause=update(Note).values(title="title")) is primary.sync_engine
+        assert routing_session.get_bind(clause=select(Note)) is primary.sync_engine
+
+
+def test_reads_fall_back_to_primary_when_replicas_are_down(
+        routing_session: RoutingSession, primary: AsyncEngine, replica: AsyncEngine, replicas: ReplicaSet
+) -> None:
+    replicas.mark(replica, False)
+
+    with replica_reads():
+        assert routing_session.get_bind(clause=select(Note)) is primary.sync_engine
+
+
+async def test_session_sticks_to_primary_after_flush(
+        engine: AsyncEngine, replicas: ReplicaSet, replica: AsyncEngine
+) -> None:
+    async with AsyncSession(sync_session_class=RoutingSession, primary=engine, replicas=replicas) as session:
+        with replica_reads():
+            assert session.sync_session.get_bind(clause=select(User)) is replica.sync_engine
+            session.add(User(email=f"{uuid.uuid4()}@example.com", password="password"))
+            await session.flush()
+
+            assert session.sync_session.get_bind(clause=select(User)) is engine.sync_engine
+        await session.rollback()
@@ -0,0 +1,23 @@
+"""Pool counts as exhausted once every connection it may open is checked out."""
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from common.packages.src.conf.settings import settings
+from common.packages.src.db.engine import create_engine
+from common.packages.src.db.warmup import pool_exhausted
+
+
+async def test_pool_is_exhausted_when_all_connections_are_checked_out(engine: AsyncEngine) -> None:
+    config = settings.postgres.model_copy(update={"pool_size": 1, "max_overflow": 1, "max_connections": 0})
+    pooled = create_engine(settings.postgres.db_uri, config=config)
+    try:
+        async with pooled.connect():
+            assert not pool_exhausted(pooled, config)
+            async with pooled.connect():
+                assert pool_exhausted(pooled, config)
+        assert not pool_exhausted(pooled, config)
+    finally:
+        await pooled.dispose()
+
+
+def test_pool_without_checkout_count_is_never_exhausted(engine: AsyncEngine) -> None:
+    assert not pool_exhausted(engine, settings.postgres)
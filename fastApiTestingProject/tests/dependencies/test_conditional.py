@@ -0,0 +1,71 @@
+"""Validators of notes and pages, and evaluation of conditional request headers."""
+import re
+import uuid
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from common.packages.src.dependencies.conditional import Preconditions, collection_etag, entity_etag, http_date
+
+UPDATED_AT = datetime(2024, 1, 1, 12, 0, 0, 500000)
+
+
+def preconditions(**headers: str) -> Preconditions:
+    """Get preconditions of request sending only `headers`."""
+    return Preconditions(**{"if_none_match": None, "if_modified_since": None, "if_match": None, **headers})
+
+
+def test_entity_etag_is_strong_version_tag() -> None:
+    assert entity_etag(7) == '"7"'
+    assert preconditions(if_match=entity_etag(7)).expected_version == 7
+
+
+def test_collection_etag_is_strong_digest_of_items_and_parts() -> None:
+    pk = uuid.uuid4()
+    etag = collection_etag([(pk, UPDATED_AT)], "next")
+
+    assert re.fullmatch(r'"[0-9a-f]{24}"', etag)
+    assert etag == collection_etag([(str(pk), UPDATED_AT)], "next")
+    assert etag != collection_etag([(pk, UPDATED_AT + timedelta(microseconds=1))], "next")
+    assert etag != collection_etag([(pk, UPDATED_AT)], None)
+    assert collection_etag([], None) == collection_etag([], "")
+
+
+@pytest.mark.parametrize(
+    ("if_none_match", "modified"),
+    [('"1"', False), ('W/"1"', False), ('"0", W/"1"', False), ("*", False), ('"2"', True), ('"1', True)],
+)
+def test_if_none_match_accepts_weak_comparison(if_none_match: str, modified: bool) -> None:
+    assert preconditions(if_none_match=if_none_match).not_modified('"1"') is not modified
+
+
+@pytest.mark.parametrize(
+    ("if_modified_since", "modified"),
+    [
+        (UPDATED_AT, False),
+        (UPDATED_AT + timedelta(hours=1), False),
+        (UPDATED_AT - timedelta(seconds=1), True),
+    ],
+)
+def test_if_modified_since_is_compared_in_whole_seconds(if_modified_since: datetime, modified: bool) -> None:
+    conditions = preconditions(if_modified_since=http_date(if_modified_since))
+
+    assert conditions.not_modified('"1"', UPDATED_AT) is not modified
+
+
+def test_invalid_if_modified_since_is_ignored() -> None:
+    conditions = preconditions(if_modified_since="yesterday")
+
+    assert not conditions.is_conditional
+    assert not conditions.not_modified('"1"', UPDATED_AT)
+
+
+def test_if_none_match_takes_precedence_over_if_modified_since() -> None:
+    conditions = preconditions(if_none_match='"2"', if_modified_since=http_date(UPDATED_AT))
+
+    assert not conditions.not_modified('"1"', UPDATED_AT)
+
+
+def test_http_date_treats_naive_time_as_utc() -> None:
+    assert http_date(UPDATED_AT) == http_date(UPDATED_AT.replace(tzinfo=timezone.utc))
+    assert http_date(UPDATED_AT) == "Mon, 01 Jan 2024 12:00:00 GMT"
@@ -0,0 +1,58 @@
+"""Statements differing in number of bound values are normalized to the same metric label."""
+import uuid
+from datetime import datetime
+
+import pytest
+from sqlalchemy import insert, select, text
+from sqlalchemy.dialects.postgresql.asyncpg import dialect
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from common.packages.src.db.models import Note
+from common.packages.src.metrics.db import instrument_engine, normalize_sql
+
+
+def asyncpg_sql(statement) -> str:
+    """Get statement as asyncpg driver executes it, parameters are cast."""
+    return str(statement.compile(dialect=dialect(), compile_kwargs={"render_postcompile": True}))
+
+
+@pytest.mark.parametrize("size", [2, 5, 50])
+def test_in_list_of_cast_parameters_is_collapsed(size: int) -> None:
+    statement = select(Note.uuid).where(
+        Note.uuid.in_([uuid.uuid4() for _ in range(size)]),
+        Note.created_at.in_([datetime.now()] * size),
+    )
+
+    assert normalize_sql(asyncpg_sql(statement)).endswith(
+        "WHERE store_item.uuid IN (...) AND store_item.created_at IN (...)"
+    )
+
+
+@pytest.mark.parametrize("size", [2, 5, 50])
+def test_multi_row_values_of_cast_parameters_are_collapsed(size: int) -> None:
+    rows = [{"title": "title", "description": "description", "user_id": uuid.uuid4()}] * size
+    statement = insert(Note).values(rows).returning(Note.uuid)
+
+    assert normalize_sql(asyncpg_sql(statement)) == normalize_sql(
+        asyncpg_sql(insert(Note).values(rows[:2]).returning(Note.uuid))
+    )
+    assert " VALUES (...) RETURNING" in normalize_sql(asyncpg_sql(statement))
+
+
+def test_plain_placeholders_are_collapsed() -> None:
+    statement = "SELECT a FROM t WHERE b IN ($1, $2, $3) AND c = 'x'"
+
+    assert normalize_sql(statement) == "SELECT a FROM t WHERE b IN (...) AND c = ?"
+
+
+async def test_failed_statement_does_not_leave_start_time_behind(engine: AsyncEngine) -> None:
+    instrument_engine(engine, slow_query_threshold=0)
+
+    async with engine.connect() as connection:
+        with pytest.raises(DBAPIError):
+            await connection.execute(text("SELECT 1 / 0"))
+        await connection.rollback()
+        await connection.execute(text("SELECT 1"))
+
+        assert connection.info["query_started_at"] == []
@@ -0,0 +1,34 @@
+"""Request id sent by client is echoed only when it is a short token."""
+import httpx
+import pytest
+from fastapi import FastAPI
+
+from common.packages.src.metrics.http import REQUEST_ID_HEADER, RequestMetricsMiddleware
+
+
+@pytest.fixture
+def client() -> httpx.AsyncClient:
+    """Client of an empty app with metrics middleware."""
+    app = FastAPI()
+    app.add_middleware(RequestMetricsMiddleware)
+
+    @app.get("/")
+    async def index() -> dict:
+        return {}
+
+    return httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test")
+
+
+@pytest.mark.parametrize("request_id", ["abc", "trace-1.2:3_x", "a" * 128])
+async def test_client_request_id_is_kept(client: httpx.AsyncClient, request_id: str) -> None:
+    response = await client.get("/", headers={REQUEST_ID_HEADER: request_id})
+
+    assert response.headers[REQUEST_ID_HEADER] == request_id
+
+
+@pytest.mark.parametrize("request_id", ["", "a" * 129, "id with spaces", "<script>", "a,b", "a/b"])
+async def test_client_request_id_is_replaced(client: httpx.AsyncClient, request_id: str) -> None:
+    response = await client.get("/", headers={REQUEST_ID_HEADER: request_id})
+
+    assert response.headers[REQUEST_ID_HEADER] != request_id
+    assert len(response.headers[REQUEST_ID_HEADER]) == 32
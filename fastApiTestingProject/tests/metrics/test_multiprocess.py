@@ -0,0 +1,56 @@
+"""Scrape served by one worker reports metrics of all workers sharing the metrics directory."""
+import os
+from pathlib import Path
+
+import orjson
+
+from common.packages.src.metrics.multiprocess import clear_snapshots, render_merged, write_snapshot
+from common.packages.src.metrics.registry import MetricsRegistry
+
+GONE_PID = 2 ** 22 + 1
+
+
+def worker_registry(requests: int, pending: float) -> MetricsRegistry:
+    """Registry of a worker which handled `requests` requests of 10ms."""
+    registry = MetricsRegistry()
+    counter = registry.counter("requests_total", "Requests.")
+    histogram = registry.histogram("duration_seconds", "Duration.", buckets=(0.1, 1.0))
+    for _ in range(requests):
+        counter.inc(route="/notes")
+        histogram.observe(0.01, route="/notes")
+    registry.gauge("pending", "Pending.", lambda: pending, queue="notes")
+    return registry
+
+
+def write_foreign_snapshot(directory: Path, pid: int, registry: MetricsRegistry) -> None:
+    """Write snapshot as the worker of `pid` would."""
+    (directory / f"{pid}.json").write_bytes(orjson.dumps(registry.snapshot()))
+
+
+def test_counters_and_histograms_of_workers_are_summed(tmp_path: Path) -> None:
+    write_foreign_snapshot(tmp_path, os.getppid(), worker_registry(requests=2, pending=5))
+
+    lines = render_merged(tmp_path, worker_registry(requests=3, pending=1)).splitlines()
+
+    assert 'requests_total{route="/notes"} 5.0' in lines
+    assert 'duration_seconds_bucket{route="/notes",le="0.1"} 5' in lines
+    assert 'duration_seconds_count{route="/notes"} 5' in lines
+    assert f'pending{{pid="{os.getpid()}",queue="notes"}} 1' in lines
+    assert f'pending{{pid="{os.getppid()}",queue="notes"}} 5' in lines
+
+
+def test_gauges_of_gone_workers_are_dropped(tmp_path: Path) -> None:
+    write_foreign_snapshot(tmp_path, GONE_PID, worker_registry(requests=2, pending=5))
+
+    rendered = render_merged(tmp_path, worker_registry(requests=0, pending=1))
+
+    assert 'requests_total{route="/notes"} 2.0' in rendered
+    assert f'pid="{GONE_PID}"' not in rendered
+
+
+def test_previous_run_snapshots_are_cleared(tmp_path: Path) -> None:
+    write_snapshot(tmp_path, worker_registry(requests=1, pending=0))
+
+    clear_snapshots(tmp_path)
+
+    assert list(tmp_path.iterdir()) == []
@@ -0,0 +1,202 @@
+"""Round trips of BaseRepository operations, every operation is expected to cost a single statement."""
+import pytest
+from sqlalchemy import insert, select, update
+from sqlalchemy.exc import InvalidRequestError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from common.packages.src.conf.settings import settings
+from common.packages.src.db.models import Note, User
+from common.packages.src.repositories.base import _statement_cache
+from common.packages.src.schemas.notes import CreateNoteSchema, UpdateNoteSchema
+from notes.src.repositories.notes.core import NoteRepository
+
+
+@pytest.fixture
+def statement_cache(monkeypatch: pytest.MonkeyPatch):
+    """Statement cache of two entries, rebuilt for test and after it."""
+    monkeypatch.setattr(settings.postgres, "query_cache_size", 2)
+    _statement_cache.cache_clear()
+    yield _statement_cache()
+    _statement_cache.cache_clear()
+
+
+def note_schema(user_uuid, title: str = "title") -> CreateNoteSchema:
+    """Get note creation schema of user."""
+    return CreateNoteSchema(title=title, description="description", user_id=user_uuid)
+
+
+async def test_create_is_single_insert_returning(session: AsyncSession, user_uuid, statements: list[str]) -> None:
+    note = await NoteRepository(session).create(note_schema(user_uuid))
+
+    assert len(statements) == 1
+    assert statements[0].startswith("INSERT") and "RETURNING" in statements[0]
+    assert note.uuid is not None and note.created_at is not None and note.version == 1
+
+
+async def test_create_refresh_is_opt_in(session: AsyncSession, user_uuid, statements: list[str]) -> None:
+    await NoteRepository(session).create(note_schema(user_uuid), refresh=True)
+
+    assert len(statements) == 2
+
+
+async def test_bulk_create_is_single_statement_in_request_order(
+        session: AsyncSession, user_uuid, statements: list[str]
+) -> None:
+    titles = [f"note {index}" for index in range(5, 0, -1)]
+
+    notes = await NoteRepository(session).bulk_create([note_schema(user_uuid, title) for title in titles])
+
+    assert len(statements) == 1
+    assert [note.title for note in notes] == titles
+
+
+async def test_retrieve_is_single_select(session: AsyncSession, user_uuid, statements: list[str]) -> None:
+    repository = NoteRepository(session)
+    created = await repository.create(note_schema(user_uuid))
+    statements.clear()
+
+    note = await repository.retrieve(created.uuid)
+    refreshed = await repository.retrieve(created.uuid, refresh=True)
+
+    assert note is refreshed is created
+    assert len(statements) == 2
+    assert all(statement.startswith("SELECT") for statement in statements)
+
+
+async def test_retrieve_loads_user_only_on_request(session: AsyncSession, user_uuid, statements: list[str]) -> None:
+    repository = NoteRepository(session)
+    created = await repository.create(note_schema(user_uuid))
+    session.expunge_all()
+    statements.clear()
+
+    note = await repository.retrieve(created.uuid, load={"user": "joined"})
+
+    assert note.user.uuid == user_uuid
+    assert len(statements) == 1
+    session.expunge_all()
+    with pytest.raises(InvalidRequestError):
+        _ = (await repository.retrieve(created.uuid)).user
+
+
+async def test_bulk_retrieve_is_single_select(session: AsyncSession, user_uuid, statements: list[str]) -> None:
+    repository = NoteRepository(session)
+    created = await repository.bulk_create([note_schema(user_uuid, str(index)) for index in range(3)])
+    statements.clear()
+
+    notes = await repository.bulk_retrieve([note.uuid for note in created])
+
+    assert len(notes) == 3
+    assert len(statements) == 1
+
+
+async def test_get_by_uuids_is_single_select(session: AsyncSession, user_uuid, statements: list[str]) -> None:
+    repository = NoteRepository(session)
+    created = await repository.bulk_create([note_schema(user_uuid, str(index)) for index in range(2)])
+    statements.clear()
+
+    notes = await repository.get_by_uuids([note.uuid for note in created])
+
+    assert {note.uuid for note in notes} == {note.uuid for note in created}
+    assert len(statements) == 1
+
+
+async def test_update_is_single_update_returning(session: AsyncSession, user_uuid, statements: list[str]) -> None:
+    repository = NoteRepository(session)
+    created = await repository.create(note_schema(user_uuid))
+    statements.clear()
+
+    note = await repository.update(created.uuid, UpdateNoteSchema(title="updated"), partial=True)
+
+    assert note.title == "updated" and note.version == 2
+    assert len(statements) == 1
+    assert statements[0].startswith("UPDATE") and "RETURNING" in statements[0]
+
+
+async def test_bulk_update_values_is_single_statement_per_column_set(
+        session: AsyncSession, user_uuid, statements: list[str]
+) -> None:
+    repository = NoteRepository(session)
+    created = await repository.bulk_create([note_schema(user_uuid, str(index)) for index in range(3)])
+    statements.clear()
+
+    notes = await repository.bulk_update_values({note.uuid: {"title": f"{note.title}!"} for note in created})
+
+    assert sorted(note.title for note in notes) == ["0!", "1!", "2!"]
+    assert len(statements) == 1
+
+
+async def test_bulk_update_values_skips_rows_failing_match(
+        session: AsyncSession, user_uuid, statements: list[str]
+) -> None:
+    repository = NoteRepository(session)
+    other_uuid = (
+        await session.execute(insert(User).values(email="other@example.com", password="password").returning(User.uuid))
+    ).scalar_one()
+    owned, deleted, foreign = (
+        note.uuid for note in await repository.bulk_create(
+            [note_schema(user_uuid, "owned"), note_schema(user_uuid, "deleted"), note_schema(other_uuid, "foreign")]
+        )
+    )
+    await session.execute(update(Note).where(Note.uuid == deleted).values(is_deleted=True))
+    statements.clear()
+
+    notes = await repository.bulk_update_values(
+        {pk: {"title": "updated", "user_id": user_uuid, "is_deleted": False} for pk in (owned, deleted, foreign)},
+        match=("user_id", "is_deleted"),
+    )
+
+    assert [(note.uuid, note.title, note.version) for note in notes] == [(owned, "updated", 2)]
+    assert len(statements) == 1
+    result = await session.execute(select(Note.title, Note.version).where(Note.uuid.in_([deleted, foreign])))
+    assert sorted(result.all()) == [("deleted", 1), ("foreign", 1)]
+
+
+async def test_bulk_update_values_groups_rows_by_column_set(
+        session: AsyncSession, user_uuid, statements: list[str]
+) -> None:
+    repository = NoteRepository(session)
+    created = await repository.bulk_create([note_schema(user_uuid, str(index)) for index in range(4)])
+    statements.clear()
+    data = [
+        {"title": "a"},
+        {"description": "b"},
+        {"title": "c", "description": "c"},
+        {"description": "d"},
+    ]
+
+    notes = await repository.bulk_update_values({note.uuid: values for note, values in zip(created, data)})
+
+    assert len(statements) == 3
+    assert all(statement.startswith("UPDATE") for statement in statements)
+    by_uuid = {note.uuid: (note.title, note.description) for note in notes}
+    assert [by_uuid[note.uuid] for note in created] == [
+        ("a", "description"), ("1", "b"), ("c", "c"), ("3", "d"),
+    ]
+
+
+async def test_statement_is_built_once_per_shape(session: AsyncSession, user_uuid, statement_cache) -> None:
+    repository = NoteRepository(session)
+    created = await repository.create(note_schema(user_uuid))
+
+    await repository.update(created.uuid, UpdateNoteSchema(title="first"), partial=True)
+    misses = statement_cache.stats.misses
+    note = await repository.update(created.uuid, UpdateNoteSchema(title="second"), partial=True)
+
+    assert note.title == "second" and note.version == 3
+    assert statement_cache.stats.misses == misses
+    assert statement_cache.stats.hits > 0
+
+
+def test_statement_cache_is_bounded(session: AsyncSession, statement_cache) -> None:
+    repository = NoteRepository(session)
+    built = []
+
+    def build(shape: int) -> str:
+        built.append(shape)
+        return f"statement {shape}"
+
+    for shape in (1, 2, 1, 3, 1, 2):
+        assert repository._statement("test", lambda: build(shape), shape) == f"statement {shape}"
+
+    assert built == [1, 2, 3, 2]
+    assert len(statement_cache) == 2
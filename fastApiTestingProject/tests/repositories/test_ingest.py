@@ -0,0 +1,108 @@
+"""Bulk ingest writes rows in chunks of one statement each, or with COPY, and reports what it wrote."""
+import uuid
+from typing import AsyncIterator
+
+import pytest
+from sqlalchemy import func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from common.packages.src.db.models import Note
+from common.packages.src.repositories.ingest import IngestStats, iter_chunks
+from notes.src.repositories.notes.core import NoteRepository
+
+
+def note_rows(user_uuid, count: int) -> list[dict]:
+    """Get insert parameters of `count` notes of user."""
+    return [{"title": f"note {index}", "description": "description", "user_id": user_uuid} for index in range(count)]
+
+
+async def aiter_rows(rows: list[dict]) -> AsyncIterator[dict]:
+    """Yield rows from an async source."""
+    for row in rows:
+        yield row
+
+
+async def count_notes(session: AsyncSession, user_uuid) -> int:
+    """Count notes of user."""
+    return (await session.execute(select(func.count()).where(Note.user_id == user_uuid))).scalar_one()
+
+
+@pytest.mark.parametrize(("count", "sizes"), [(0, []), (3, [3]), (4, [3, 1]), (6, [3, 3]), (7, [3, 3, 1])])
+@pytest.mark.parametrize("is_async", [False, True])
+async def test_chunks_split_at_size(count: int, sizes: list[int], is_async: bool) -> None:
+    rows = list(range(count))
+
+    chunks = [chunk async for chunk in iter_chunks(aiter_rows(rows) if is_async else iter(rows), 3)]
+
+    assert [len(chunk) for chunk in chunks] == sizes
+    assert [row for chunk in chunks for row in chunk] == rows
+
+
+async def test_chunk_size_must_be_positive() -> None:
+    with pytest.raises(ValueError):
+        [chunk async for chunk in iter_chunks([1], 0)]
+
+
+def test_stats_count_rows_and_chunks() -> None:
+    stats = IngestStats()
+
+    stats.add_chunk(3)
+    stats.add_chunk(1)
+
+    assert (stats.rows, stats.chunks) == (4, 2)
+    assert stats.elapsed > 0 and stats.rows_per_second > 0
+
+
+async def test_ingest_is_one_insert_per_chunk(session: AsyncSession, user_uuid, statements: list[str]) -> None:
+    stats = await NoteRepository(session).bulk_ingest(aiter_rows(note_rows(user_uuid, 5)), chunk_size=2)
+
+    assert (stats.rows, stats.chunks) == (5, 3)
+    assert len(statements) == 3 and all(statement.startswith("INSERT") for statement in statements)
+    assert await count_notes(session, user_uuid) == 5
+
+
+async def test_ingest_with_copy_bypasses_insert(session: AsyncSession, user_uuid, statements: list[str]) -> None:
+    stats = await NoteRepository(session).bulk_ingest(note_rows(user_uuid, 5), chunk_size=2, use_copy=True)
+
+    assert (stats.rows, stats.chunks) == (5, 3)
+    assert statements == []
+    notes = (await session.execute(select(Note).where(Note.user_id == user_uuid))).scalars().all()
+    assert sorted(note.title for note in notes) == [f"note {index}" for index in range(5)]
+    assert all(note.uuid is not None and note.version == 1 for note in notes)
+
+
+async def test_ingest_returning_yields_rows_of_every_chunk(
+        session: AsyncSession, user_uuid, statements: list[str]
+) -> None:
+    rows = note_rows(user_uuid, 5)
+
+    chunks = [chunk async for chunk in NoteRepository(session).bulk_ingest_returning(rows, chunk_size=2)]
+
+    assert [len(chunk) for chunk in chunks] == [2, 2, 1]
+    assert [row["title"] for chunk in chunks for row in chunk] == [row["title"] for row in rows]
+    assert all(row["uuid"] is not None for chunk in chunks for row in chunk)
+    assert len(statements) == 3
+
+
+async def test_upsert_inserts_new_and_updates_matching_rows(session: AsyncSession, user_uuid) -> None:
+    repository = NoteRepository(session)
+    present, foreign, deleted, new = (uuid.uuid4() for _ in range(4))
+    await repository.bulk_ingest(
+        [{**row, "uuid": pk} for row, pk in zip(note_rows(user_uuid, 3), (present, foreign, deleted))]
+    )
+    await session.execute(update(Note).where(Note.uuid == deleted).values(is_deleted=True))
+    rows = [
+        {"uuid": pk, "title": "upserted", "description": "description", "user_id": user_id}
+        for pk, user_id in ((present, user_uuid), (foreign, uuid.uuid4()), (deleted, user_uuid), (new, user_uuid))
+    ]
+
+    assert await repository.bulk_upsert(rows, match=("user_id",)) == 4
+
+    result = await session.execute(select(Note.uuid, Note.title, Note.version).where(Note.user_id == user_uuid))
+    notes = {pk: (title, version) for pk, title, version in result}
+    assert notes == {
+        present: ("upserted", 2),
+        foreign: ("note 1", 1),
+        deleted: ("note 2", 1),
+        new: ("upserted", 1),
+    }
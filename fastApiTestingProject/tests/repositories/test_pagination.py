@@ -0,0 +1,58 @@
+"""Cursors carrying values `Cursor.encode` could not produce are rejected before reaching the database."""
+import uuid
+from datetime import datetime
+
+import pytest
+
+from common.packages.src.core.exceptions.base import DomainException
+from common.packages.src.repositories.mixins.search_mixin import RANK_FIELD
+from common.packages.src.repositories.pagination import Cursor
+from notes.src.repositories.notes.core import NoteRepository
+
+
+def token(field: str, value, pk=None) -> str:
+    """Get cursor token with arbitrary sort value and primary key."""
+    return Cursor(field=field, value=value, pk=str(uuid.uuid4()) if pk is None else pk).encode()
+
+
+@pytest.mark.parametrize(
+    ("field", "value", "pk"),
+    [
+        ("created_at", "not a date", None),
+        ("created_at", 1700000000, None),
+        ("created_at", "2024-01-01T00:00:00+05:00", None),
+        ("title", 42, None),
+        ("title", ["title"], None),
+        ("created_at", datetime(2024, 1, 1).isoformat(), "not a uuid"),
+        ("title", "title", 42),
+    ],
+)
+async def test_malformed_cursor_is_bad_request(field: str, value, pk) -> None:
+    repository = NoteRepository(None)  # type: ignore[arg-type]
+
+    with pytest.raises(DomainException) as error:
+        await repository.get_paginated_by_cursor(limit=10, order_by_field=field, cursor=token(field, value, pk))
+
+    assert error.value.status_code == 400
+
+
+@pytest.mark.parametrize(
+    ("value", "pk"),
+    [("0.5", None), (True, None), (float("nan"), None), (float("inf"), None), (None, None), (0.5, "not a uuid")],
+)
+async def test_malformed_search_cursor_is_bad_request(value, pk) -> None:
+    repository = NoteRepository(None)  # type: ignore[arg-type]
+
+    with pytest.raises(DomainException) as error:
+        await repository.search("query", cursor=token(RANK_FIELD, value, pk))
+
+    assert error.value.status_code == 400
+
+
+def test_boundary_restores_encoded_values() -> None:
+    pk = uuid.uuid4()
+    created_at = datetime(2024, 1, 1, 12, 30)
+    column = NoteRepository.model.created_at
+    cursor = Cursor.decode(Cursor(field="created_at", value=created_at, pk=str(pk)).encode(), "created_at")
+
+    assert cursor.boundary(lambda value: NoteRepository._coerce_cursor_value(column, value)) == (created_at, pk)
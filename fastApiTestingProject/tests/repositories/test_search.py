@@ -0,0 +1,95 @@
+"""Search ranks matches by relevance, pages them without gaps and highlights query terms."""
+import pytest
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from common.packages.src.repositories.mixins.search_mixin import SearchMode
+from common.packages.src.schemas.notes import CreateNoteSchema
+from notes.src.repositories.notes.core import NoteRepository
+from notes.src.services.core import NoteService
+
+
+async def create_note(session: AsyncSession, user_uuid, title: str, description: str = "description"):
+    """Create note of user, get its uuid."""
+    data = CreateNoteSchema(title=title, description=description, user_id=user_uuid)
+    note = await NoteRepository(session).create(data)
+    return note.uuid
+
+
+async def search(session: AsyncSession, user_uuid, query: str, **kwargs):
+    """Search notes of user."""
+    return await NoteRepository(session).search(query, filters=NoteService.owned_by(user_uuid), **kwargs)
+
+
+@pytest.fixture
+async def trigram(session: AsyncSession) -> None:
+    """Skip test when pg_trgm extension is not installed, prefix and fuzzy modes rank by its similarity."""
+    installed = (await session.execute(text("SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm'"))).first()
+    if installed is None:
+        pytest.skip("pg_trgm extension is not installed")
+
+
+async def test_title_match_ranks_above_description_match(session: AsyncSession, user_uuid) -> None:
+    in_description = await create_note(session, user_uuid, "groceries", "buy apples and pears")
+    in_title = await create_note(session, user_uuid, "apples", "buy them")
+    await create_note(session, user_uuid, "pears", "buy them")
+
+    page = await search(session, user_uuid, "apples")
+
+    assert [row.uuid for row in page.items] == [in_title, in_description]
+    assert page.items[0].rank > page.items[1].rank
+    assert page.next_cursor is None
+
+
+async def test_headline_highlights_query_terms(session: AsyncSession, user_uuid) -> None:
+    await create_note(session, user_uuid, "shopping", "buy apples and pears")
+
+    page = await search(session, user_uuid, "apples")
+
+    headline = page.items[0].headline
+    assert "<b>apples</b> and pears" in headline and headline.count("<b>") == 1
+
+
+async def test_pages_follow_each_other_without_gaps(session: AsyncSession, user_uuid) -> None:
+    for index in range(7):
+        await create_note(session, user_uuid, f"apples {index}", "apples " * (index % 3))
+    everything = [row.uuid for row in (await search(session, user_uuid, "apples", limit=100)).items]
+
+    paged, cursor = [], None
+    while True:
+        page = await search(session, user_uuid, "apples", limit=3, cursor=cursor)
+        paged.extend(row.uuid for row in page.items)
+        cursor = page.next_cursor
+        if cursor is None:
+            break
+
+    assert len(everything) == 7
+    assert paged == everything
+
+
+async def test_deleted_and_foreign_notes_are_not_found(session: AsyncSession, user_uuid) -> None:
+    deleted = await create_note(session, user_uuid, "apples")
+    await NoteService(NoteRepository(session)).soft_delete_owned(deleted, user_uuid)
+
+    assert (await search(session, user_uuid, "apples")).items == []
+
+
+async def test_prefix_mode_matches_title_start(session: AsyncSession, user_uuid, trigram) -> None:
+    match = await create_note(session, user_uuid, "applesauce")
+    await create_note(session, user_uuid, "green apples")
+    await create_note(session, user_uuid, "100% apples")
+
+    page = await search(session, user_uuid, "apple", mode=SearchMode.PREFIX)
+
+    assert [row.uuid for row in page.items] == [match]
+    assert (await search(session, user_uuid, "100%", mode=SearchMode.PREFIX)).items != []
+    assert (await search(session, user_uuid, "_00", mode=SearchMode.PREFIX)).items == []
+
+
+async def test_fuzzy_mode_tolerates_typos(session: AsyncSession, user_uuid, trigram) -> None:
+    match = await create_note(session, user_uuid, "strawberries")
+    await create_note(session, user_uuid, "groceries")
+
+    page = await search(session, user_uuid, "strawbery", mode=SearchMode.FUZZY)
+
+    assert [row.uuid for row in page.items] == [match]
@@ -0,0 +1,66 @@
+"""Conditional writes report a stale version as conflict and a missing row as not found."""
+import uuid
+from datetime import datetime
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from common.packages.src.core.exceptions.base import DBException
+from common.packages.src.schemas.base import SoftDeleteSchema
+from common.packages.src.schemas.notes import CreateNoteSchema, UpdateNoteSchema
+from notes.src.repositories.notes.core import NoteRepository
+
+
+@pytest.fixture
+async def note_uuid(session: AsyncSession, user_uuid) -> uuid.UUID:
+    """Uuid of note of version 2."""
+    repository = NoteRepository(session)
+    note = await repository.create(CreateNoteSchema(title="title", description="description", user_id=user_uuid))
+    pk = note.uuid
+    await repository.update(pk, UpdateNoteSchema(title="updated"), partial=True)
+    return pk
+
+
+def soft_delete_data(user_uuid) -> SoftDeleteSchema:
+    """Get soft deletion values of user."""
+    return SoftDeleteSchema(deleted_by=user_uuid, deleted_at=datetime.utcnow())
+
+
+async def test_update_of_current_version_bumps_it(session: AsyncSession, note_uuid) -> None:
+    repository = NoteRepository(session)
+
+    note = await repository.update(note_uuid, UpdateNoteSchema(title="new"), partial=True, expected_version=2)
+
+    assert (note.title, note.version) == ("new", 3)
+
+
+@pytest.mark.parametrize("data", [UpdateNoteSchema(title="new"), UpdateNoteSchema()])
+async def test_update_of_stale_version_is_conflict(session: AsyncSession, note_uuid, data) -> None:
+    with pytest.raises(DBException) as error:
+        await NoteRepository(session).update(note_uuid, data, partial=True, expected_version=1)
+
+    assert (error.value.status_code, error.value.error_code) == (412, "version_conflict")
+
+
+@pytest.mark.parametrize("expected_version", [None, 1])
+async def test_update_of_missing_row_is_not_found(session: AsyncSession, expected_version) -> None:
+    with pytest.raises(DBException) as error:
+        await NoteRepository(session).update(
+            uuid.uuid4(), UpdateNoteSchema(title="new"), partial=True, expected_version=expected_version
+        )
+
+    assert (error.value.status_code, error.value.error_code) == (404, "object_not_found")
+
+
+async def test_soft_delete_of_stale_version_is_conflict(session: AsyncSession, note_uuid, user_uuid) -> None:
+    with pytest.raises(DBException) as error:
+        await NoteRepository(session).soft_delete(note_uuid, soft_delete_data(user_uuid), expected_version=1)
+
+    assert (error.value.status_code, error.value.error_code) == (412, "version_conflict")
+
+
+async def test_soft_delete_of_missing_row_is_not_found(session: AsyncSession, user_uuid) -> None:
+    with pytest.raises(DBException) as error:
+        await NoteRepository(session).soft_delete(uuid.uuid4(), soft_delete_data(user_uuid), expected_version=1)
+
+    assert error.value.status_code == 404
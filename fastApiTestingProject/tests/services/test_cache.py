@@ -0,0 +1,77 @@
+"""Entity cache of services holds committed state only, detached from sessions."""
+import asyncio
+from typing import Callable
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncSession, async_sessionmaker
+
+from common.packages.src.cache import InMemoryCache, run_pending_invalidations
+from common.packages.src.conf.settings import settings
+from common.packages.src.schemas.notes import CreateNoteSchema, NoteSchema, UpdateNoteSchema
+from notes.src.providers.service import get_notes_cache
+from notes.src.repositories.notes.core import NoteRepository
+from notes.src.services.core import NoteService
+
+
+@pytest.fixture
+def session_factory(connection: AsyncConnection) -> Callable[[], AsyncSession]:
+    """Factory of sessions cache loads run in, they see data of the test transaction."""
+    return async_sessionmaker(bind=connection, join_transaction_mode="create_savepoint")
+
+
+async def test_cached_note_survives_rollback(session: AsyncSession, session_factory, user_uuid) -> None:
+    cache = InMemoryCache()
+    service = NoteService(NoteRepository(session), cache, session_factory)
+    note = await service.create(CreateNoteSchema(title="title", description="description", user_id=user_uuid))
+    key = service.cache_key(note.uuid)
+    await service.get_by_uuid(note.uuid)
+
+    await session.rollback()
+
+    cached = await cache.get(key)
+    assert isinstance(cached, NoteSchema) and cached.title == "title"
+
+
+async def test_write_invalidates_cache_after_commit(session: AsyncSession, session_factory, user_uuid) -> None:
+    cache = InMemoryCache()
+    service = NoteService(NoteRepository(session), cache, session_factory)
+    note = await service.create(CreateNoteSchema(title="title", description="description", user_id=user_uuid))
+    key = service.cache_key(note.uuid)
+    await service.get_by_uuid(note.uuid)
+
+    await service.partial_update(note.uuid, UpdateNoteSchema(title="new"))
+
+    assert (await service.get_by_uuid(note.uuid)).title == "new"
+    assert (await cache.get(key)).title == "title"
+    await run_pending_invalidations(session.info)
+    assert await cache.get(key) is None
+
+
+async def test_shared_load_outlives_request_which_started_it(
+        session: AsyncSession, session_factory, user_uuid
+) -> None:
+    cache = InMemoryCache()
+    note = await NoteService(NoteRepository(session)).create(
+        CreateNoteSchema(title="title", description="description", user_id=user_uuid)
+    )
+    first, second = (NoteService(NoteRepository(AsyncSession()), cache, session_factory) for _ in range(2))
+
+    started = asyncio.create_task(first.get_by_uuid(note.uuid))
+    await asyncio.sleep(0)
+    waiting = asyncio.create_task(second.get_by_uuid(note.uuid))
+    await asyncio.sleep(0)
+    started.cancel()
+
+    assert (await waiting).title == "title"
+    assert cache.stats.coalesced == 1
+
+
+@pytest.mark.parametrize(
+    ("enabled", "workers", "expected"),
+    [(None, None, True), (None, 1, True), (None, 4, False), (True, 4, True), (False, 1, False)],
+)
+def test_notes_cache_defaults_to_single_worker(monkeypatch: pytest.MonkeyPatch, enabled, workers, expected) -> None:
+    monkeypatch.setattr(settings.cache, "enabled", enabled)
+    monkeypatch.setattr(settings.server, "workers", workers)
+
+    assert (get_notes_cache.__wrapped__() is not None) == expected
@@ -0,0 +1,50 @@
+"""Request scoped loader batches and memoizes note lookups of a service."""
+import asyncio
+import uuid
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from common.packages.src.core.exceptions.base import DBException
+from common.packages.src.loaders import repository_loader
+from common.packages.src.schemas.notes import CreateNoteSchema, UpdateNoteSchema
+from notes.src.repositories.notes.core import NoteRepository
+from notes.src.services.core import NoteService
+
+
+def loaded_service(session: AsyncSession) -> NoteService:
+    """Get service of session with a loader of its own, as one request has."""
+    return NoteService(NoteRepository(session), loader=repository_loader(NoteRepository(session)))
+
+
+async def test_concurrent_lookups_cost_one_statement(session: AsyncSession, user_uuid, statements: list[str]) -> None:
+    service = loaded_service(session)
+    created = await service.bulk_create_owned(
+        [CreateNoteSchema(title=str(index), description="description") for index in range(5)], user_uuid
+    )
+    uuids = [note.uuid for note in created]
+    statements.clear()
+
+    notes = await asyncio.gather(*(service.get_by_uuid(uuid) for uuid in uuids))
+    again = await service.get_by_uuid(uuids[0])
+
+    assert [note.uuid for note in notes] == uuids and again is notes[0]
+    assert len(statements) == 1
+    assert " IN " in statements[0]
+
+
+async def test_missing_note_is_not_found(session: AsyncSession) -> None:
+    with pytest.raises(DBException) as error:
+        await loaded_service(session).get_by_uuid(uuid.uuid4())
+
+    assert error.value.status_code == 404
+
+
+async def test_write_forgets_memoized_note(session: AsyncSession, user_uuid) -> None:
+    service = loaded_service(session)
+    note = await service.create_owned(CreateNoteSchema(title="title", description="description"), user_uuid)
+    await service.get_by_uuid(note.uuid)
+
+    await service.update_owned(note.uuid, UpdateNoteSchema(title="new"), user_uuid)
+
+    assert (await service.get_by_uuid(note.uuid)).title == "new"
@@ -0,0 +1,39 @@
+"""Owner filters of note service, deleted notes are hidden from reads and refused by writes."""
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from common.packages.src.core.exceptions.base import DBException
+from common.packages.src.schemas.notes import CreateNoteSchema, UpdateNoteSchema
+from notes.src.repositories.notes.core import NoteRepository
+from notes.src.services.core import NoteService
+
+
+@pytest.fixture
+async def deleted_note(session: AsyncSession, user_uuid):
+    """Uuid of soft deleted note of user."""
+    service = NoteService(NoteRepository(session))
+    note = await service.create_owned(CreateNoteSchema(title="title", description="description"), user_uuid)
+    await service.soft_delete_owned(note.uuid, user_uuid)
+    return note.uuid
+
+
+async def test_deleted_note_is_hidden_from_reads(session: AsyncSession, user_uuid, deleted_note) -> None:
+    service = NoteService(NoteRepository(session))
+
+    assert await service.list_owned(user_uuid, limit=10, offset=0) == []
+    with pytest.raises(DBException):
+        await service.get_owned_version(deleted_note, user_uuid)
+
+
+async def test_deleted_note_is_not_written(session: AsyncSession, user_uuid, deleted_note) -> None:
+    service = NoteService(NoteRepository(session))
+
+    with pytest.raises(DBException) as error:
+        await service.update_owned(deleted_note, UpdateNoteSchema(title="new"), user_uuid)
+    assert error.value.status_code == 404
+    with pytest.raises(DBException):
+        await service.soft_delete_owned(deleted_note, user_uuid)
+    with pytest.raises(DBException):
+        await service.bulk_update_owned({deleted_note: UpdateNoteSchema(title="new")}, user_uuid)
+    with pytest.raises(DBException):
+        await service.bulk_soft_delete_owned([deleted_note], user_uuid)
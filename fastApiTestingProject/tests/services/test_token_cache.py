@@ -0,0 +1,84 @@
+"""Verified token cache never outlives tokens and never mixes up verification parameters."""
+import time
+
+import pytest
+
+from common.packages.src.services.token_cache import VerifiedTokenCache
+
+SECRET_KEY = "secret"
+ALGORITHM = "HS256"
+
+
+class Clock:
+    """Manually advanced wall and monotonic clock."""
+
+    def __init__(self) -> None:
+        """Start at current time."""
+        self.now = time.time()
+
+    def __call__(self) -> float:
+        """Get current time."""
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch: pytest.MonkeyPatch) -> Clock:
+    """Clock cache expiration is checked against."""
+    clock = Clock()
+    monkeypatch.setattr(time, "time", clock)
+    monkeypatch.setattr(time, "monotonic", clock)
+    return clock
+
+
+def cached(cache: VerifiedTokenCache, token: str) -> dict | None:
+    """Get payload of token verified with default parameters."""
+    return cache.get(token, SECRET_KEY, ALGORITHM)
+
+
+@pytest.mark.parametrize(("expires_in", "expired_after"), [(10, 10), (1000, 300)])
+def test_entry_lives_until_token_expires_or_ttl_ends(clock: Clock, expires_in: float, expired_after: float) -> None:
+    cache = VerifiedTokenCache(max_size=10, max_ttl=300)
+    payload = {"sub": "user", "exp": clock.now + expires_in}
+    cache.set("token", SECRET_KEY, ALGORITHM, payload)
+
+    clock.now += expired_after - 1
+    assert cached(cache, "token") == payload
+    clock.now += 1
+    assert cached(cache, "token") is None
+
+
+def test_expired_token_is_not_stored(clock: Clock) -> None:
+    cache = VerifiedTokenCache(max_size=10, max_ttl=300)
+
+    cache.set("token", SECRET_KEY, ALGORITHM, {"sub": "user", "exp": clock.now})
+
+    assert len(cache._storage) == 0
+
+
+def test_least_recently_used_token_is_evicted() -> None:
+    cache = VerifiedTokenCache(max_size=2, max_ttl=300)
+    for token in ("a", "b"):
+        cache.set(token, SECRET_KEY, ALGORITHM, {"sub": token})
+    cached(cache, "a")
+
+    cache.set("c", SECRET_KEY, ALGORITHM, {"sub": "c"})
+
+    assert [cached(cache, token) for token in ("a", "b", "c")] == [{"sub": "a"}, None, {"sub": "c"}]
+
+
+@pytest.mark.parametrize(("secret_key", "algorithm"), [("other", ALGORITHM), (SECRET_KEY, "HS512")])
+def test_token_verified_with_other_parameters_is_missed(secret_key: str, algorithm: str) -> None:
+    cache = VerifiedTokenCache(max_size=10, max_ttl=300)
+    cache.set("token", SECRET_KEY, ALGORITHM, {"sub": "user"})
+
+    assert cache.get("token", secret_key, algorithm) is None
+    assert cached(cache, "token") == {"sub": "user"}
+
+
+def test_returned_payload_is_a_copy() -> None:
+    cache = VerifiedTokenCache(max_size=10, max_ttl=300)
+    cache.set("token", SECRET_KEY, ALGORITHM, {"sub": "user"})
+
+    cached(cache, "token")["sub"] = "other"
+
+    assert cached(cache, "token") == {"sub": "user"}
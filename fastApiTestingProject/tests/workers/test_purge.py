@@ -0,0 +1,48 @@
+"""Purge worker runs in every app process, only the one holding the leader lock purges."""
+import asyncio
+import uuid
+from datetime import timedelta
+
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker
+
+from common.packages.src.db.locks import AdvisoryLock
+from common.packages.src.workers.purge import PurgeWorker
+from notes.src.repositories.notes.core import NoteRepository
+
+
+class RecordingPurgeWorker(PurgeWorker):
+    """Purge worker counting purge runs instead of purging."""
+
+    runs = 0
+
+    async def purge(self, *args, **kwargs):
+        self.runs += 1
+
+
+def make_worker(engine: AsyncEngine, name: str) -> RecordingPurgeWorker:
+    """Worker competing for leader lock of `name`."""
+    return RecordingPurgeWorker(
+        NoteRepository,
+        async_sessionmaker(engine),
+        retention=timedelta(days=30),
+        interval=0.01,
+        leader_lock=AdvisoryLock(engine, name),
+    )
+
+
+async def test_only_leader_purges(engine: AsyncEngine) -> None:
+    name = f"test:{uuid.uuid4()}"
+    leader, follower = make_worker(engine, name), make_worker(engine, name)
+
+    leader.start()
+    await asyncio.sleep(0.1)
+    follower.start()
+    await asyncio.sleep(0.1)
+    await leader.stop()
+    runs = follower.runs
+    await asyncio.sleep(0.1)
+    await follower.stop()
+
+    assert leader.runs > 0
+    assert runs == 0
+    assert follower.runs > 0
@@ -0,0 +1,159 @@
+"""Write-behind queue recovers logged writes after a crash and never overwrites changes made after them."""
+import os
+import uuid
+from pathlib import Path
+from typing import Callable
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncSession, async_sessionmaker
+
+from common.packages.src.schemas.notes import CreateNoteSchema, UpdateNoteSchema
+from common.packages.src.workers.write_behind import PendingWrite, WriteBehindQueue, WriteKind, coalesce
+from notes.src.repositories.notes.core import NoteRepository
+from notes.src.services.core import NoteService
+
+
+async def apply_note_writes(session: AsyncSession, writes: list[PendingWrite]) -> int:
+    """Write batch of queued notes without entity cache."""
+    written = await NoteService(NoteRepository(session)).apply_queued(writes)
+    return written
+
+
+@pytest.fixture
+def session_factory(connection: AsyncConnection) -> Callable[[], AsyncSession]:
+    """Factory of sessions flushes run in, they see data of the test transaction."""
+    return async_sessionmaker(bind=connection, join_transaction_mode="create_savepoint")
+
+
+@pytest.fixture
+def make_queue(session_factory, tmp_path: Path) -> Callable[[], WriteBehindQueue]:
+    """Factory of note queues logging into one directory, they flush only when asked to."""
+    def make() -> WriteBehindQueue:
+        return WriteBehindQueue(
+            apply_note_writes, session_factory, tmp_path, name="test_notes", flush_interval=3600, fsync=False
+        )
+
+    return make
+
+
+def crash(queue: WriteBehindQueue) -> None:
+    """Drop queue as a killed process would, its log stays behind unlocked."""
+    queue._task.cancel()
+    queue._log._file.close()
+    os.close(queue._log._lock_fd)
+
+
+def test_write_survives_log_round_trip() -> None:
+    write = PendingWrite(WriteKind.UPDATE, uuid.uuid4(), uuid.uuid4(), {"title": "title"}, version=3)
+
+    assert PendingWrite.load(write.dump()) == write
+    line = b'{"kind":"update","uuid":"%s","user_id":"%s","values":{}}' % (
+        str(write.uuid).encode(), str(write.user_id).encode()
+    )
+    assert PendingWrite.load(line).version is None
+
+
+def test_coalesced_write_keeps_first_kind_and_version() -> None:
+    pk, user_id = uuid.uuid4(), uuid.uuid4()
+    writes: dict[uuid.UUID, PendingWrite] = {}
+
+    assert not coalesce(writes, PendingWrite(WriteKind.CREATE, pk, user_id, {"title": "a", "description": "a"}, 1))
+    assert coalesce(writes, PendingWrite(WriteKind.UPDATE, pk, user_id, {"title": "b"}, 2))
+
+    assert writes[pk] == PendingWrite(WriteKind.CREATE, pk, user_id, {"title": "b", "description": "a"}, 1)
+
+
+async def test_burst_of_updates_is_one_row_write(session: AsyncSession, make_queue, user_uuid) -> None:
+    service = NoteService(NoteRepository(session))
+    note = await service.create_owned(CreateNoteSchema(title="title", description="description"), user_uuid)
+    pk = note.uuid
+    queue = make_queue()
+    await queue.start()
+
+    for title in ("a", "b", "c"):
+        await service.enqueue_update_owned(pk, UpdateNoteSchema(title=title), user_uuid, queue)
+
+    assert queue.size == 1
+    assert await queue.flush() == 1
+    await queue.stop()
+    session.expire_all()
+    note = await service.get_owned(pk, user_uuid)
+    assert (note.title, note.version) == ("c", 2)
+
+
+async def test_writes_of_crashed_process_are_recovered(session: AsyncSession, make_queue, user_uuid) -> None:
+    service = NoteService(NoteRepository(session))
+    crashed = make_queue()
+    await crashed.start()
+    created = await service.enqueue_create_owned(
+        CreateNoteSchema(title="title", description="description"), user_uuid, crashed
+    )
+    await service.enqueue_update_owned(created["uuid"], UpdateNoteSchema(title="new"), user_uuid, crashed)
+    crash(crashed)
+
+    queue = make_queue()
+    await queue.start()
+
+    assert queue.size == 1
+    assert await queue.flush() == 1
+    await queue.stop()
+    note = await service.get_owned(created["uuid"], user_uuid)
+    assert (note.title, note.description) == ("new", "description")
+
+
+async def test_replayed_create_keeps_later_update(session: AsyncSession, make_queue, user_uuid) -> None:
+    service = NoteService(NoteRepository(session))
+    queue = make_queue()
+    await queue.start()
+    created = await service.enqueue_create_owned(
+        CreateNoteSchema(title="title", description="description"), user_uuid, queue
+    )
+    pk = created["uuid"]
+    await queue.flush()
+    await service.update_owned(pk, UpdateNoteSchema(title="new"), user_uuid)
+
+    replayed = PendingWrite(WriteKind.CREATE, pk, user_uuid, {"title": "title", "description": "description"})
+    assert await service.apply_queued([replayed]) == 0
+    await queue.stop()
+    session.expire_all()
+    note = await service.get_owned(pk, user_uuid)
+    assert (note.title, note.version) == ("new", 2)
+
+
+async def test_queued_update_does_not_overwrite_later_update(session: AsyncSession, make_queue, user_uuid) -> None:
+    service = NoteService(NoteRepository(session))
+    note = await service.create_owned(CreateNoteSchema(title="title", description="description"), user_uuid)
+    pk = note.uuid
+    queue = make_queue()
+    await queue.start()
+    await service.enqueue_update_owned(pk, UpdateNoteSchema(title="queued"), user_uuid, queue)
+
+    await service.update_owned(pk, UpdateNoteSchema(title="current"), user_uuid, expected_version=1)
+
+    assert await queue.flush() == 1
+    await queue.stop()
+    session.expire_all()
+    note = await service.get_owned(pk, user_uuid)
+    assert (note.title, note.version) == ("current", 2)
+
+
+async def test_update_queued_over_flushing_write_expects_its_version(
+        session: AsyncSession, make_queue, user_uuid
+) -> None:
+    service = NoteService(NoteRepository(session))
+    note = await service.create_owned(CreateNoteSchema(title="title", description="description"), user_uuid)
+    pk = note.uuid
+    queue = make_queue()
+    await queue.start()
+    await service.enqueue_update_owned(pk, UpdateNoteSchema(title="first"), user_uuid, queue)
+    first = queue._in_flight[pk] = queue._pending.pop(pk)
+
+    await service.enqueue_update_owned(pk, UpdateNoteSchema(description="second"), user_uuid, queue)
+    await service.apply_queued([first])
+    queue._in_flight = {}
+
+    assert await queue.flush() == 1
+    await queue.stop()
+    session.expire_all()
+    note = await service.get_owned(pk, user_uuid)
+    assert (note.title, note.description, note.version) == ("first", "second", 3)